@@ -0,0 +1,53 @@
+"""Add audit log search indexes and details_amount generated column
+
+Revision ID: 1a4956447828
+Revises: d126f9c4cdd0
+Create Date: 2026-10-16 16:42:10.518204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1a4956447828'
+down_revision: Union[str, None] = 'd126f9c4cdd0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# 검색 조건 일치 후 (created_at, id) 최신순 정렬을 인덱스만으로 처리합니다.
+SEARCH_INDEXES = [
+    ('ix_audit_logs_user_id_created_at_id', ['user_id', 'created_at', 'id']),
+    ('ix_audit_logs_action_created_at_id', ['action', 'created_at', 'id']),
+    ('ix_audit_logs_ip_address_created_at_id', ['ip_address', 'created_at', 'id']),
+    ('ix_audit_logs_details_amount', ['details_amount']),
+]
+
+
+def _details_amount_expression() -> str:
+    if op.get_context().dialect.name == 'mysql':
+        return "JSON_VALUE(details, '$.amount' RETURNING DECIMAL(20, 2))"
+    return "json_extract(details, '$.amount')"
+
+
+def upgrade() -> None:
+    # 가상 생성 컬럼은 기존 행을 다시 쓰지 않고, 인덱스에만 값이 저장됩니다.
+    op.add_column('audit_logs', sa.Column(
+        'details_amount',
+        sa.Numeric(20, 2),
+        sa.Computed(_details_amount_expression(), persisted=False),
+        comment='details.amount (가상 생성 컬럼)',
+    ))
+    for name, columns in SEARCH_INDEXES:
+        op.create_index(name, 'audit_logs', columns, unique=False)
+    # (user_id, created_at, id) 가 user_id 단독 인덱스를 대신합니다.
+    op.drop_index('ix_audit_logs_user_id', table_name='audit_logs')
+
+
+def downgrade() -> None:
+    op.create_index('ix_audit_logs_user_id', 'audit_logs', ['user_id'], unique=False)
+    for name, columns in reversed(SEARCH_INDEXES):
+        op.drop_index(name, table_name='audit_logs')
+    op.drop_column('audit_logs', 'details_amount')
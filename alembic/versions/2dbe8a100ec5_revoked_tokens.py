@@ -0,0 +1,45 @@
+"""Add revoked_tokens table for access token revocation
+
+Revision ID: 2dbe8a100ec5
+Revises: 1a4956447828
+Create Date: 2026-10-16 18:05:31.227914
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.models.types import UUIDKey
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2dbe8a100ec5'
+down_revision: Union[str, None] = '1a4956447828'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('revoked_tokens',
+    sa.Column('jti', sa.String(length=64), nullable=True, comment='폐기한 토큰 ID (없으면 사용자 단위 폐기)'),
+    sa.Column('user_id', UUIDKey(), nullable=False, comment='사용자 ID'),
+    sa.Column('reason', sa.String(length=50), nullable=False, comment='폐기 사유 (logout, principal_changed)'),
+    sa.Column('revoked_at', sa.DateTime(), nullable=False, comment='폐기 시각 (UTC, 초 단위)'),
+    sa.Column('expires_at', sa.DateTime(), nullable=False, comment='폐기 대상 토큰이 모두 만료되는 시각 (UTC)'),
+    sa.Column('id', UUIDKey(), nullable=False, comment='UUID 형식의 고유 식별자'),
+    sa.Column('is_active', sa.Boolean(), nullable=True, comment='레코드 활성화 상태'),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True, comment='생성 일시'),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True, comment='수정 일시'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_revoked_tokens_jti', 'revoked_tokens', ['jti'], unique=False)
+    op.create_index('ix_revoked_tokens_expires_at', 'revoked_tokens', ['expires_at'], unique=False)
+    op.create_index('ix_revoked_tokens_user_id_revoked_at', 'revoked_tokens', ['user_id', 'revoked_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_revoked_tokens_user_id_revoked_at', table_name='revoked_tokens')
+    op.drop_index('ix_revoked_tokens_expires_at', table_name='revoked_tokens')
+    op.drop_index('ix_revoked_tokens_jti', table_name='revoked_tokens')
+    op.drop_table('revoked_tokens')
@@ -0,0 +1,117 @@
+"""UUIDv7 binary primary keys and drop redundant id indexes
+
+Revision ID: 45418282edd6
+Revises: 3e0d2c5e17af
+Create Date: 2026-10-16 10:12:41.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.settings import PrimaryKeyFormat, settings
+
+
+# revision identifiers, used by Alembic.
+revision: str = '45418282edd6'
+down_revision: Union[str, None] = '3e0d2c5e17af'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# 기본 키 인덱스와 중복되는 id 보조 인덱스
+REDUNDANT_ID_INDEXES = {
+    'stocks': 'ix_stocks_id',
+    'users': 'ix_users_id',
+    'advisory_requests': 'ix_advisory_requests_id',
+    'audit_logs': 'ix_audit_logs_id',
+    'deposit_withdrawals': 'ix_deposit_withdrawals_id',
+    'login_attempts': 'ix_login_attempts_id',
+    'user_stocks': 'ix_user_stocks_id',
+    'advisory_recommendations': 'ix_advisory_recommendations_id',
+}
+
+# 테이블별 UUID 컬럼 (기본 키 + 외래 키)
+UUID_COLUMNS = {
+    'users': ['id'],
+    'stocks': ['id'],
+    'advisory_requests': ['id', 'user_id'],
+    'audit_logs': ['id', 'user_id'],
+    'deposit_withdrawals': ['id', 'user_id'],
+    'login_attempts': ['id', 'user_id'],
+    'user_stocks': ['id', 'user_id', 'stock_id'],
+    'advisory_recommendations': ['id', 'advisory_request_id', 'stock_id'],
+}
+
+
+def _use_binary_keys() -> bool:
+    # BINARY(16) 변환은 MySQL 8 의 UUID_TO_BIN/BIN_TO_UUID 를 사용합니다.
+    return (
+        settings.PRIMARY_KEY_FORMAT == PrimaryKeyFormat.UUID7_BINARY
+        and op.get_context().dialect.name == 'mysql'
+    )
+
+
+def _drop_foreign_keys() -> list:
+    inspector = sa.inspect(op.get_bind())
+    dropped = []
+    for table in UUID_COLUMNS:
+        for fk in inspector.get_foreign_keys(table):
+            op.drop_constraint(fk['name'], table, type_='foreignkey')
+            dropped.append((table, fk))
+    return dropped
+
+
+def _create_foreign_keys(dropped: list) -> None:
+    for table, fk in dropped:
+        op.create_foreign_key(
+            fk['name'], table, fk['referred_table'],
+            fk['constrained_columns'], fk['referred_columns']
+        )
+
+
+def _convert_uuid_columns(new_type, convert_sql: str) -> None:
+    """
+    UUID 컬럼을 새 타입으로 변환합니다.
+    새 컬럼을 추가해 값을 옮긴 뒤 기존 컬럼을 지우고 이름을 바꿉니다.
+    기존 행의 UUIDv4 값은 그대로 보존되고, 이후 생성되는 행부터 UUIDv7 이 사용됩니다.
+    """
+    inspector = sa.inspect(op.get_bind())
+    for table, columns in UUID_COLUMNS.items():
+        existing = {c['name']: c for c in inspector.get_columns(table)}
+        for column in columns:
+            op.add_column(table, sa.Column(f'{column}_new', new_type, nullable=True))
+            op.execute(f'UPDATE {table} SET {column}_new = {convert_sql.format(column=column)}')
+
+        op.execute(f'ALTER TABLE {table} DROP PRIMARY KEY')
+        for column in columns:
+            op.drop_column(table, column)
+            op.alter_column(
+                table, f'{column}_new',
+                new_column_name=column,
+                existing_type=new_type,
+                nullable=existing[column]['nullable'],
+                comment=existing[column].get('comment'),
+            )
+        op.create_primary_key(f'pk_{table}', table, ['id'])
+
+
+def upgrade() -> None:
+    for table, index in REDUNDANT_ID_INDEXES.items():
+        op.drop_index(index, table_name=table)
+
+    if _use_binary_keys():
+        dropped = _drop_foreign_keys()
+        _convert_uuid_columns(sa.BINARY(16), 'UUID_TO_BIN({column})')
+        _create_foreign_keys(dropped)
+
+
+def downgrade() -> None:
+    if _use_binary_keys():
+        dropped = _drop_foreign_keys()
+        _convert_uuid_columns(sa.String(length=36), 'BIN_TO_UUID({column})')
+        _create_foreign_keys(dropped)
+
+    for table, index in REDUNDANT_ID_INDEXES.items():
+        op.create_index(index, table, ['id'], unique=False)
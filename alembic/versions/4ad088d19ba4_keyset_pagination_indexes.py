@@ -0,0 +1,43 @@
+"""Add id to created_at indexes for keyset pagination
+
+Revision ID: 4ad088d19ba4
+Revises: e0531643f1ac
+Create Date: 2026-10-16 13:41:05.228716
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4ad088d19ba4'
+down_revision: Union[str, None] = 'e0531643f1ac'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (기존 인덱스, 새 인덱스, 테이블, 새 인덱스 컬럼)
+# (created_at, id) 순 정렬을 인덱스만으로 처리하기 위해 id 를 명시합니다.
+# 외래 키 컬럼으로 시작하는 인덱스가 항상 하나는 남도록 새 인덱스를 먼저 만듭니다.
+KEYSET_INDEXES = [
+    ('ix_deposit_withdrawals_user_id_created_at', 'ix_deposit_withdrawals_user_id_created_at_id',
+     'deposit_withdrawals', ['user_id', 'created_at', 'id']),
+    ('ix_advisory_requests_user_id_created_at', 'ix_advisory_requests_user_id_created_at_id',
+     'advisory_requests', ['user_id', 'created_at', 'id']),
+    ('ix_audit_logs_created_at', 'ix_audit_logs_created_at_id',
+     'audit_logs', ['created_at', 'id']),
+]
+
+
+def upgrade() -> None:
+    for old, new, table, columns in KEYSET_INDEXES:
+        op.create_index(new, table, columns, unique=False)
+        op.drop_index(old, table_name=table)
+
+
+def downgrade() -> None:
+    for old, new, table, columns in KEYSET_INDEXES:
+        op.create_index(old, table, columns[:-1], unique=False)
+        op.drop_index(new, table_name=table)
@@ -0,0 +1,38 @@
+"""Add data_versions table for in-memory snapshot invalidation
+
+Revision ID: 7c31f0b9d2a4
+Revises: 2dbe8a100ec5
+Create Date: 2026-10-16 20:12:47.503118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.models.types import UUIDKey
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c31f0b9d2a4'
+down_revision: Union[str, None] = '2dbe8a100ec5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 버전 행은 처음 변경될 때 만들어지며, 행이 없으면 버전 0 으로 봅니다.
+    op.create_table('data_versions',
+    sa.Column('name', sa.String(length=50), nullable=False, comment='데이터 이름 (예: stocks)'),
+    sa.Column('version', sa.BigInteger(), nullable=False, comment='변경될 때마다 1 씩 증가하는 버전'),
+    sa.Column('id', UUIDKey(), nullable=False, comment='UUID 형식의 고유 식별자'),
+    sa.Column('is_active', sa.Boolean(), nullable=True, comment='레코드 활성화 상태'),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True, comment='생성 일시'),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True, comment='수정 일시'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('name')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('data_versions')
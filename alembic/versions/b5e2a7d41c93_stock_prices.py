@@ -0,0 +1,39 @@
+"""Add stock_prices table for portfolio optimizer price history
+
+Revision ID: b5e2a7d41c93
+Revises: 7c31f0b9d2a4
+Create Date: 2026-10-16 23:41:05.218734
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.models.types import UUIDKey
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5e2a7d41c93'
+down_revision: Union[str, None] = '7c31f0b9d2a4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('stock_prices',
+    sa.Column('stock_id', UUIDKey(), nullable=False, comment='증권 ID'),
+    sa.Column('trade_date', sa.Date(), nullable=False, comment='거래일'),
+    sa.Column('close_price', sa.Float(), nullable=False, comment='종가'),
+    sa.Column('id', UUIDKey(), nullable=False, comment='UUID 형식의 고유 식별자'),
+    sa.Column('is_active', sa.Boolean(), nullable=True, comment='레코드 활성화 상태'),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True, comment='생성 일시'),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True, comment='수정 일시'),
+    sa.ForeignKeyConstraint(['stock_id'], ['stocks.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('stock_id', 'trade_date', name='uq_stock_prices_stock_id_trade_date')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('stock_prices')
@@ -0,0 +1,92 @@
+"""Partition audit_logs by month
+
+Revision ID: d126f9c4cdd0
+Revises: 4ad088d19ba4
+Create Date: 2026-10-16 15:20:44.761390
+
+"""
+from datetime import date, datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.settings import settings
+from app.utils.audit_archive import add_months, month_start, partition_clause
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd126f9c4cdd0'
+down_revision: Union[str, None] = '4ad088d19ba4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# 오프라인(--sql) 모드에서 사용할 MySQL 기본 외래 키 이름
+DEFAULT_FK_NAME = 'audit_logs_ibfk_1'
+
+
+def _is_mysql() -> bool:
+    return op.get_context().dialect.name == 'mysql'
+
+
+def _is_offline() -> bool:
+    return op.get_context().as_sql
+
+
+def _foreign_key_names() -> list:
+    if _is_offline():
+        return [DEFAULT_FK_NAME]
+    return [fk['name'] for fk in sa.inspect(op.get_bind()).get_foreign_keys('audit_logs')]
+
+
+def _first_month() -> date:
+    # 가장 오래된 로그가 속한 달부터 파티션을 만듭니다.
+    if not _is_offline():
+        oldest = op.get_bind().execute(sa.text('SELECT MIN(created_at) FROM audit_logs')).scalar()
+        if oldest is not None:
+            return month_start(oldest)
+    return month_start(datetime.now())
+
+
+def upgrade() -> None:
+    # 외래 키 대신 사용자별 조회용 인덱스를 둡니다. (MySQL 은 이 인덱스가 생기면 외래 키 자동 인덱스를 제거합니다)
+    op.create_index('ix_audit_logs_user_id', 'audit_logs', ['user_id'], unique=False)
+
+    if not _is_mysql():
+        return
+
+    # MySQL 파티션 테이블은 외래 키를 지원하지 않고, 기본 키에 파티션 키가 포함되어야 합니다.
+    for name in _foreign_key_names():
+        op.drop_constraint(name, 'audit_logs', type_='foreignkey')
+
+    op.execute('UPDATE audit_logs SET created_at = NOW() WHERE created_at IS NULL')
+    op.alter_column(
+        'audit_logs', 'created_at',
+        existing_type=sa.DateTime(timezone=True),
+        existing_server_default=sa.text('now()'),
+        existing_comment='생성 일시',
+        nullable=False,
+    )
+    op.execute('ALTER TABLE audit_logs DROP PRIMARY KEY, ADD PRIMARY KEY (id, created_at)')
+
+    # 테이블을 다시 쓰므로 로그가 많으면 오래 걸립니다. 이후 파티션 추가/삭제는 메타데이터 작업입니다.
+    last_month = add_months(month_start(datetime.now()), settings.AUDIT_PARTITION_MONTHS_AHEAD)
+    op.execute(f'ALTER TABLE audit_logs {partition_clause(_first_month(), last_month)}')
+
+
+def downgrade() -> None:
+    if _is_mysql():
+        op.execute('ALTER TABLE audit_logs REMOVE PARTITIONING')
+        op.execute('ALTER TABLE audit_logs DROP PRIMARY KEY, ADD PRIMARY KEY (id)')
+        op.alter_column(
+            'audit_logs', 'created_at',
+            existing_type=sa.DateTime(timezone=True),
+            existing_server_default=sa.text('now()'),
+            existing_comment='생성 일시',
+            nullable=True,
+        )
+
+    op.drop_index('ix_audit_logs_user_id', table_name='audit_logs')
+
+    if _is_mysql():
+        op.create_foreign_key(DEFAULT_FK_NAME, 'audit_logs', 'users', ['user_id'], ['id'])
@@ -0,0 +1,67 @@
+"""Composite indexes for hot query paths
+
+Revision ID: e0531643f1ac
+Revises: 45418282edd6
+Create Date: 2026-10-16 11:02:17.540926
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e0531643f1ac'
+down_revision: Union[str, None] = '45418282edd6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (인덱스 이름, 테이블, 컬럼)
+HOT_PATH_INDEXES = [
+    ('ix_deposit_withdrawals_user_id_created_at', 'deposit_withdrawals', ['user_id', 'created_at']),
+    ('ix_advisory_requests_user_id_created_at', 'advisory_requests', ['user_id', 'created_at']),
+    ('ix_advisory_recommendations_advisory_request_id', 'advisory_recommendations', ['advisory_request_id']),
+    ('ix_audit_logs_created_at', 'audit_logs', ['created_at']),
+    ('ix_login_attempts_ip_success_last_attempt', 'login_attempts', ['ip_address', 'is_successful', 'last_attempt_at']),
+    ('ix_stocks_is_active', 'stocks', ['is_active']),
+]
+
+USER_STOCKS_UNIQUE = 'uq_user_stocks_user_id_stock_id'
+
+
+def upgrade() -> None:
+    for name, table, columns in HOT_PATH_INDEXES:
+        op.create_index(name, table, columns, unique=False)
+    op.create_unique_constraint(USER_STOCKS_UNIQUE, 'user_stocks', ['user_id', 'stock_id'])
+
+
+def _drop_backing_index(drop, table: str) -> None:
+    """
+    MySQL 은 외래 키 컬럼으로 시작하는 인덱스가 생기면 외래 키용 자동 인덱스를
+    제거하므로, 새 인덱스를 지우기 전에 외래 키를 잠시 내렸다가 다시 만듭니다.
+    다시 만든 외래 키에는 MySQL 이 자동 인덱스를 다시 생성합니다.
+    """
+    if op.get_context().dialect.name != 'mysql':
+        drop()
+        return
+
+    foreign_keys = sa.inspect(op.get_bind()).get_foreign_keys(table)
+    for fk in foreign_keys:
+        op.drop_constraint(fk['name'], table, type_='foreignkey')
+    drop()
+    for fk in foreign_keys:
+        op.create_foreign_key(
+            fk['name'], table, fk['referred_table'],
+            fk['constrained_columns'], fk['referred_columns']
+        )
+
+
+def downgrade() -> None:
+    _drop_backing_index(
+        lambda: op.drop_constraint(USER_STOCKS_UNIQUE, 'user_stocks', type_='unique'),
+        'user_stocks'
+    )
+    for name, table, columns in reversed(HOT_PATH_INDEXES):
+        _drop_backing_index(lambda: op.drop_index(name, table_name=table), table)
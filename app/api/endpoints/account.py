@@ -1,31 +1,31 @@
-import uuid
-from datetime import datetime
-from typing import Any, List
+from typing import Any, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status, Request
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
-from app.core.dependencies import get_current_user
-from app.models.stock import UserStock
+from app.core.dependencies import get_current_principal, get_current_user
+from app.core.principal_cache import Principal
+from app.models.stock import Stock, UserStock
 from app.models.user import User
-from app.models.deposit_withdrawal import DepositWithdrawal, DepositWithdrawalType, DepositWithdrawalStatus
+from app.models.deposit_withdrawal import DepositWithdrawal, DepositWithdrawalType
 from app.schemas.stock import TransactionCreate, Transaction as TransactionSchema
 from app.schemas.user import UserBalance
-from app.utils.audit import log_user_action
+from app.utils.ledger import post_transaction
+from app.utils.pagination import Keyset, paginate, set_next_cursor
+from app.utils.universe import stock_universe
 
 router = APIRouter()
 
-
-def get_kst_time():
-    """서버의 시스템 시간을 반환합니다."""
-    return datetime.now()
+# 거래 내역 정렬 키 (최신순)
+TRANSACTION_KEYSET = Keyset(DepositWithdrawal.created_at, DepositWithdrawal.id, descending=True)
 
 
 @router.post("/deposit", response_model=TransactionSchema)
-def deposit(
+async def deposit(
         *,
-        db: Session = Depends(get_db),
+        db: AsyncSession = Depends(get_db),
         transaction_in: TransactionCreate,
         current_user: User = Depends(get_current_user),
         request: Request
@@ -39,42 +39,16 @@ def deposit(
             detail="잘못된 거래 유형입니다."
         )
 
-    # 트랜잭션 생성
-    transaction = DepositWithdrawal(
-        id=str(uuid.uuid4()),
-        user_id=current_user.id,
-        type=DepositWithdrawalType.DEPOSIT,
-        amount=transaction_in.amount,
-        status=DepositWithdrawalStatus.COMPLETED,
-        ip_address=request.client.host,
-        created_at=get_kst_time()
-    )
-
-    # 사용자 잔고 업데이트
-    db_user = db.query(User).filter(User.id == current_user.id).first()
-    db_user.balance += transaction_in.amount
-
-    db.add(transaction)
-    db.commit()
-    db.refresh(transaction)
-    db.refresh(db_user)
-
-    # 감사 로그 기록
-    log_user_action(
-        db,
-        "deposit",
-        current_user.id,
-        {"amount": transaction_in.amount},
-        request
+    # 잔고 변경, 거래 내역, 감사 로그를 한 트랜잭션으로 처리
+    return await post_transaction(
+        db, current_user, DepositWithdrawalType.DEPOSIT, transaction_in.amount, request
     )
 
-    return transaction
-
 
 @router.post("/withdraw", response_model=TransactionSchema)
-def withdraw(
+async def withdraw(
         *,
-        db: Session = Depends(get_db),
+        db: AsyncSession = Depends(get_db),
         transaction_in: TransactionCreate,
         current_user: User = Depends(get_current_user),
         request: Request
@@ -88,65 +62,45 @@ def withdraw(
             detail="잘못된 거래 유형입니다."
         )
 
-    # 사용자 잔고 확인
-    db_user = db.query(User).filter(User.id == current_user.id).first()
-    if db_user.balance < transaction_in.amount:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="잔고가 부족합니다."
-        )
-
-    # 트랜잭션 생성
-    transaction = DepositWithdrawal(
-        id=str(uuid.uuid4()),
-        user_id=current_user.id,
-        type=DepositWithdrawalType.WITHDRAWAL,
-        amount=transaction_in.amount,
-        status=DepositWithdrawalStatus.COMPLETED,
-        ip_address=request.client.host,
-        created_at=get_kst_time()
-    )
-
-    # 잔고 업데이트
-    db_user.balance -= transaction_in.amount
-
-    db.add(transaction)
-    db.commit()
-    db.refresh(transaction)
-    db.refresh(db_user)
-
-    # 감사 로그 기록
-    log_user_action(
-        db,
-        "withdraw",
-        current_user.id,
-        {"amount": transaction_in.amount},
-        request
+    # 잔고 확인과 차감을 조건부 UPDATE 한 번으로 처리 (잔고 부족 시 400)
+    return await post_transaction(
+        db, current_user, DepositWithdrawalType.WITHDRAWAL, transaction_in.amount, request
     )
 
-    return transaction
-
 
 @router.get("/balance", response_model=UserBalance)
-def get_balance(
+async def get_balance(
         *,
-        db: Session = Depends(get_db),
+        db: AsyncSession = Depends(get_db),
         current_user: User = Depends(get_current_user)
 ) -> Any:
     """
     현재 잔고와 보유 증권 목록을 조회합니다.
     """
     # 보유 증권 목록 조회
-    user_stocks = db.query(UserStock).filter(UserStock.user_id == current_user.id).all()
+    result = await db.execute(select(UserStock).where(UserStock.user_id == current_user.id))
+    user_stocks = result.scalars().all()
+
+    # 현재가는 활성 증권 스냅샷에서 읽고, 스냅샷에 없는 (비활성) 증권만 한 번에 조회
+    snapshot = await stock_universe.get(db)
+    prices = {
+        user_stock.stock_id: snapshot.by_id[user_stock.stock_id].current_price
+        for user_stock in user_stocks if user_stock.stock_id in snapshot.by_id
+    }
+    missing = {user_stock.stock_id for user_stock in user_stocks} - prices.keys()
+    if missing:
+        result = await db.execute(select(Stock.id, Stock.current_price).where(Stock.id.in_(missing)))
+        prices.update(result.tuples().all())
 
     stocks = []
     for user_stock in user_stocks:
+        current_price = prices[user_stock.stock_id]
         stocks.append({
             "stock_id": user_stock.stock_id,
             "quantity": user_stock.quantity,
             "average_price": user_stock.average_price,
-            "current_price": user_stock.stock.current_price,
-            "total_value": user_stock.quantity * user_stock.stock.current_price
+            "current_price": current_price,
+            "total_value": user_stock.quantity * current_price
         })
 
     return {
@@ -156,23 +110,26 @@ def get_balance(
 
 
 @router.get("/transactions", response_model=List[TransactionSchema])
-def get_transactions(
+async def get_transactions(
         *,
-        db: Session = Depends(get_db),
-        current_user: User = Depends(get_current_user),
+        db: AsyncSession = Depends(get_db),
+        current_user: Principal = Depends(get_current_principal),
+        response: Response,
         skip: int = 0,
-        limit: int = 10
+        limit: int = 10,
+        cursor: Optional[str] = None
 ) -> Any:
     """
     거래 내역을 조회합니다.
+    다음 페이지가 있으면 X-Next-Cursor 헤더로 커서를 반환합니다.
     """
-    transactions = (
-        db.query(DepositWithdrawal)
-        .filter(DepositWithdrawal.user_id == current_user.id)
-        .order_by(DepositWithdrawal.created_at.desc())
-        .offset(skip)
-        .limit(limit)
-        .all()
+    result = await db.execute(
+        paginate(
+            select(DepositWithdrawal).where(DepositWithdrawal.user_id == current_user.id),
+            TRANSACTION_KEYSET, cursor, skip, limit
+        )
     )
+    transactions = result.scalars().all()
+    set_next_cursor(response, TRANSACTION_KEYSET, transactions, limit)
 
     return transactions
@@ -1,34 +1,57 @@
-import uuid
-from typing import Any, List
+import re
+from datetime import date, datetime
+from typing import Any, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status, Request
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, status, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
 
-from app.core.database import get_db
+from app.core.database import engine, get_db, replica_engines
 from app.core.dependencies import get_current_admin_user
+from app.core.pool import pool_stats
+from app.core.principal_cache import Principal, principal_cache
+from app.core.revocation import token_revocations
+from app.core.settings import settings
 from app.models.audit import AuditLog
 from app.models.stock import Stock
-from app.models.user import User
+from app.models.user import PortfolioType
 from app.schemas.stock import StockCreate, StockUpdate, Stock as StockSchema
-from app.schemas.audit import AuditLog as AuditLogSchema
+from app.schemas.audit import AuditLog as AuditLogSchema, AuditLogCount
+from app.utils.advisory_batch import run_advisory_batch
 from app.utils.audit import log_user_action
+from app.utils.audit_archive import archived_months, read_archive, retention_horizon
+from app.utils.audit_export import MEDIA_TYPES, ExportFormat, export_query, stream_export
+from app.utils.audit_search import AuditLogFilter, approximate_count
+from app.utils.ids import new_id
+from app.utils.pagination import Keyset, paginate, set_next_cursor
+from app.utils.optimizer import portfolio_optimizer
+from app.utils.recommendation_cache import recommendation_cache
+from app.utils.security import password_hasher
+from app.utils.universe import stock_universe
 
 router = APIRouter()
 
+# 목록 조회 정렬 키
+STOCK_KEYSET = Keyset(Stock.code)
+AUDIT_LOG_KEYSET = Keyset(AuditLog.created_at, AuditLog.id, descending=True)
+
 
 @router.post("/stocks", response_model=StockSchema, status_code=status.HTTP_201_CREATED)
-def create_stock(
+async def create_stock(
         *,
-        db: Session = Depends(get_db),
+        db: AsyncSession = Depends(get_db),
         stock_in: StockCreate,
-        current_user: User = Depends(get_current_admin_user),
+        current_user: Principal = Depends(get_current_admin_user),
         request: Request
 ) -> Any:
     """
     새로운 증권을 등록합니다.
     """
     # 증권 코드 중복 체크
-    stock = db.query(Stock).filter(Stock.code == stock_in.code).first()
+    result = await db.execute(select(Stock).where(Stock.code == stock_in.code))
+    stock = result.scalar_one_or_none()
     if stock:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -37,7 +60,7 @@ def create_stock(
 
     # 증권 생성
     stock = Stock(
-        id=str(uuid.uuid4()),
+        id=new_id(),
         code=stock_in.code,
         name=stock_in.name,
         current_price=stock_in.current_price,
@@ -53,11 +76,11 @@ def create_stock(
     )
 
     db.add(stock)
-    db.commit()
-    db.refresh(stock)
+    await db.commit()
+    await db.refresh(stock)
 
     # 감사 로그 기록
-    log_user_action(
+    await log_user_action(
         db,
         "create_stock",
         current_user.id,
@@ -74,18 +97,18 @@ def create_stock(
 
 
 @router.put("/stocks/{stock_id}", response_model=StockSchema)
-def update_stock(
+async def update_stock(
         *,
-        db: Session = Depends(get_db),
+        db: AsyncSession = Depends(get_db),
         stock_id: str,
         stock_in: StockUpdate,
-        current_user: User = Depends(get_current_admin_user),
+        current_user: Principal = Depends(get_current_admin_user),
         request: Request
 ) -> Any:
     """
     증권 정보를 업데이트합니다.
     """
-    stock = db.query(Stock).filter(Stock.id == stock_id).first()
+    stock = await db.get(Stock, stock_id)
     if not stock:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -97,11 +120,11 @@ def update_stock(
     for field, value in update_data.items():
         setattr(stock, field, value)
 
-    db.commit()
-    db.refresh(stock)
+    await db.commit()
+    await db.refresh(stock)
 
     # 감사 로그 기록
-    log_user_action(
+    await log_user_action(
         db,
         "update_stock",
         current_user.id,
@@ -116,17 +139,17 @@ def update_stock(
 
 
 @router.delete("/stocks/{stock_id}")
-def delete_stock(
+async def delete_stock(
         *,
-        db: Session = Depends(get_db),
+        db: AsyncSession = Depends(get_db),
         stock_id: str,
-        current_user: User = Depends(get_current_admin_user),
+        current_user: Principal = Depends(get_current_admin_user),
         request: Request
 ) -> Any:
     """
     증권을 삭제합니다.
     """
-    stock = db.query(Stock).filter(Stock.id == stock_id).first()
+    stock = await db.get(Stock, stock_id)
     if not stock:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -134,7 +157,7 @@ def delete_stock(
         )
 
     # 감사 로그 기록
-    log_user_action(
+    await log_user_action(
         db,
         "delete_stock",
         current_user.id,
@@ -146,51 +169,272 @@ def delete_stock(
         request
     )
 
-    db.delete(stock)
-    db.commit()
+    await db.delete(stock)
+    await db.commit()
 
     return {"message": "증권이 삭제되었습니다."}
 
 
 @router.get("/stocks", response_model=List[StockSchema])
-def get_stocks(
+async def get_stocks(
         *,
-        db: Session = Depends(get_db),
-        current_user: User = Depends(get_current_admin_user),
+        db: AsyncSession = Depends(get_db),
+        current_user: Principal = Depends(get_current_admin_user),
+        response: Response,
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        cursor: Optional[str] = None
 ) -> Any:
     """
     모든 증권 목록을 조회합니다.
+    다음 페이지가 있으면 X-Next-Cursor 헤더로 커서를 반환합니다.
     """
-    stocks = (
-        db.query(Stock)
-        .order_by(Stock.code)
-        .offset(skip)
-        .limit(limit)
-        .all()
-    )
+    result = await db.execute(paginate(select(Stock), STOCK_KEYSET, cursor, skip, limit))
+    stocks = result.scalars().all()
+    set_next_cursor(response, STOCK_KEYSET, stocks, limit)
 
     return stocks
 
 
+def _audit_log_query(filters: AuditLogFilter):
+    # 보관 기간 안의 로그만 조회합니다.
+    horizon = retention_horizon(datetime.now(), settings.AUDIT_RETENTION_MONTHS)
+    return select(AuditLog).where(AuditLog.created_at >= horizon, *filters.conditions())
+
+
 @router.get("/audit-logs", response_model=List[AuditLogSchema])
-def get_audit_logs(
+async def get_audit_logs(
         *,
-        db: Session = Depends(get_db),
-        current_user: User = Depends(get_current_admin_user),
+        db: AsyncSession = Depends(get_db),
+        current_user: Principal = Depends(get_current_admin_user),
+        response: Response,
+        filters: AuditLogFilter = Depends(),
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        cursor: Optional[str] = None
 ) -> Any:
     """
-    감사 로그를 조회합니다.
+    감사 로그를 검색합니다. (최신순)
+    사용자, 액션, IP, 기간, 금액(details.amount) 조건으로 검색할 수 있습니다.
+    다음 페이지가 있으면 X-Next-Cursor 헤더로 커서를 반환합니다.
+    보관 기간 안의 로그만 조회하므로 MySQL 에서는 최근 파티션만 읽습니다.
+    보관 기간이 지난 로그는 /audit-logs/archive/{month} 로 조회합니다.
     """
-    logs = (
-        db.query(AuditLog)
-        .order_by(AuditLog.created_at.desc())
-        .offset(skip)
-        .limit(limit)
-        .all()
-    )
+    result = await db.execute(paginate(_audit_log_query(filters), AUDIT_LOG_KEYSET, cursor, skip, limit))
+    logs = result.scalars().all()
+    set_next_cursor(response, AUDIT_LOG_KEYSET, logs, limit)
 
     return logs
+
+
+@router.get("/audit-logs/count", response_model=AuditLogCount)
+async def count_audit_logs(
+        *,
+        db: AsyncSession = Depends(get_db),
+        current_user: Principal = Depends(get_current_admin_user),
+        filters: AuditLogFilter = Depends()
+) -> Any:
+    """
+    검색 조건에 맞는 감사 로그 수를 빠르게 조회합니다.
+    AUDIT_COUNT_CAP 행까지만 정확히 세고, 조건이 없으면 테이블 통계의 추정치를 사용합니다.
+    """
+    unfiltered = not filters.conditions()
+    return await approximate_count(db, _audit_log_query(filters), unfiltered, settings.AUDIT_COUNT_CAP)
+
+
+@router.get("/audit-logs/export")
+async def export_audit_logs(
+        *,
+        db: AsyncSession = Depends(get_db),
+        current_user: Principal = Depends(get_current_admin_user),
+        request: Request,
+        format: ExportFormat = ExportFormat.NDJSON,
+        filters: AuditLogFilter = Depends()
+) -> Any:
+    """
+    감사 로그를 NDJSON 또는 CSV 로 내보냅니다. (오래된 순)
+    서버 측 커서로 읽어 스트리밍하므로 기간이 길어도 메모리 사용량이 일정합니다.
+    보관 기간이 지나 파일로 옮겨진 달은 포함되지 않습니다.
+
+    Args:
+        format: 내보내기 형식 (ndjson, csv)
+        filters: 감사 로그 검색 조건 (/audit-logs 와 동일)
+
+    Returns:
+        StreamingResponse: 감사 로그 파일
+    """
+    statement = export_query(filters)
+    # 요청 세션의 라우팅(복제본/primary)을 따르는 엔진으로 스트리밍합니다.
+    bind = AsyncEngine(db.sync_session.get_bind(clause=statement))
+
+    await log_user_action(
+        db,
+        "export_audit_logs",
+        current_user.id,
+        {
+            "format": format.value,
+            **{
+                name: value.isoformat() if isinstance(value, datetime) else value
+                for name, value in vars(filters).items()
+            }
+        },
+        request
+    )
+
+    filename = f"audit_logs-{datetime.now():%Y%m%d%H%M%S}.{format.value}"
+    return StreamingResponse(
+        stream_export(bind, statement, format, settings.AUDIT_EXPORT_CHUNK_SIZE),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+@router.get("/audit-logs/archive", response_model=List[str])
+async def get_archived_audit_months(
+        *,
+        current_user: Principal = Depends(get_current_admin_user)
+) -> Any:
+    """
+    파일로 보관된 감사 로그의 달 목록(YYYY-MM)을 조회합니다.
+    """
+    return await run_in_threadpool(archived_months, settings.AUDIT_ARCHIVE_DIR)
+
+
+@router.get("/audit-logs/archive/{month}", response_model=List[AuditLogSchema])
+async def get_archived_audit_logs(
+        *,
+        month: str,
+        current_user: Principal = Depends(get_current_admin_user),
+        action: Optional[str] = None,
+        user_id: Optional[str] = None,
+        limit: int = 100
+) -> Any:
+    """
+    파일로 보관된 한 달치 감사 로그를 조회합니다.
+
+    Args:
+        month: 조회할 달 (YYYY-MM)
+        action: 액션 필터 (선택사항)
+        user_id: 사용자 ID 필터 (선택사항)
+        limit: 반환할 최대 레코드 수
+
+    Returns:
+        감사 로그 목록 (오래된 순)
+    """
+    match = re.fullmatch(r"(\d{4})-(\d{2})", month)
+    if not match or not 1 <= int(match.group(2)) <= 12:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="조회할 달은 YYYY-MM 형식이어야 합니다."
+        )
+
+    def read() -> list:
+        month_date = date(int(match.group(1)), int(match.group(2)), 1)
+        return list(read_archive(settings.AUDIT_ARCHIVE_DIR, month_date, action, user_id, limit))
+
+    try:
+        return await run_in_threadpool(read)
+    except FileNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="보관된 감사 로그가 없습니다."
+        )
+
+
+@router.get("/db-pool")
+async def get_db_pool_stats(
+        *,
+        current_user: Principal = Depends(get_current_admin_user)
+) -> Any:
+    """
+    현재 워커의 커넥션 풀 상태와 체크아웃 대기 시간 통계를 조회합니다.
+    """
+    return pool_stats([engine, *replica_engines])
+
+
+@router.get("/password-hasher")
+async def get_password_hasher_stats(
+        *,
+        current_user: Principal = Depends(get_current_admin_user)
+) -> Any:
+    """
+    현재 워커의 비밀번호 해시 스레드 풀 상태(실행 중/대기 중 작업 수, 거절 수, 대기 시간)를 조회합니다.
+    """
+    return password_hasher.stats()
+
+
+@router.get("/principal-cache")
+async def get_principal_cache_stats(
+        *,
+        current_user: Principal = Depends(get_current_admin_user)
+) -> Any:
+    """
+    현재 워커의 인증 주체 캐시 상태(항목 수, 적중률, 무효화 수, DB 조회를 건너뛰어 절약한 시간)를 조회합니다.
+    """
+    return principal_cache.stats()
+
+
+@router.get("/token-revocations")
+async def get_token_revocation_stats(
+        *,
+        current_user: Principal = Depends(get_current_admin_user)
+) -> Any:
+    """
+    현재 워커의 토큰 폐기 필터 상태(항목 수, 확인 수, DB 를 조회한 필터 적중 수, 오탐 수, 마지막 동기화 시각)를 조회합니다.
+    """
+    return token_revocations.stats()
+
+
+@router.get("/stock-universe")
+async def get_stock_universe_stats(
+        *,
+        current_user: Principal = Depends(get_current_admin_user)
+) -> Any:
+    """
+    현재 워커의 활성 증권 스냅샷 상태(버전, 종목 수, 만든 시각, 버전 확인/재생성 횟수)를 조회합니다.
+    """
+    return stock_universe.stats()
+
+
+@router.get("/recommendation-cache")
+async def get_recommendation_cache_stats(
+        *,
+        current_user: Principal = Depends(get_current_admin_user)
+) -> Any:
+    """
+    현재 워커의 자문 추천 결과 캐시 상태(항목 수, 적중/미스/동시 요청 합류 수, 적중률)를 조회합니다.
+    """
+    return recommendation_cache.stats()
+
+
+@router.get("/portfolio-optimizer")
+async def get_portfolio_optimizer_stats(
+        *,
+        current_user: Principal = Depends(get_current_admin_user)
+) -> Any:
+    """
+    현재 워커의 포트폴리오 비중 계산 상태(유형별 방식, 이력 조회/계산/시간 초과/가격 비례 대체 횟수)를 조회합니다.
+    """
+    return portfolio_optimizer.stats()
+
+
+@router.post("/advisory-batch")
+async def create_advisory_batch(
+        *,
+        db: AsyncSession = Depends(get_db),
+        portfolio_type: Optional[List[PortfolioType]] = Query(None),
+        current_user: Principal = Depends(get_current_admin_user),
+        request: Request
+) -> Any:
+    """
+    포트폴리오 유형이 있는 활성 사용자 전체의 자문 요청과 추천을 일괄 생성합니다.
+    portfolio_type 을 지정하면 해당 유형의 사용자만 대상으로 합니다.
+    수량 계산은 스레드 풀에서 실행하므로 이벤트 루프를 막지 않지만, 워커의 CPU 를 함께 사용하므로
+    큰 규모의 정기 작업은 프로세스 풀을 사용할 수 있는 app.scripts.advisory_batch 를 사용합니다.
+    """
+    summary = await run_advisory_batch(db, portfolio_type)
+
+    # 감사 로그 기록
+    await log_user_action(db, "advisory_batch", current_user.id, summary, request)
+
+    return summary
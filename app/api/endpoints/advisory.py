@@ -1,28 +1,39 @@
-import uuid
 from datetime import datetime
-from typing import Any, List
+from typing import Any, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status, Request
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
 from app.core.database import get_db
-from app.core.dependencies import get_current_user
+from app.core.dependencies import get_current_principal, get_current_user
+from app.core.principal_cache import Principal
 from app.models.stock import AdvisoryRequest, AdvisoryRecommendation, Stock
 from app.models.user import User
 from app.schemas.stock import (
     AdvisoryRequestCreate,
     AdvisoryRequest as AdvisoryRequestSchema
 )
-from app.utils.audit import log_user_action
-from app.utils.portfolio import calculate_portfolio, validate_portfolio
+from app.utils.audit import is_sync_action, log_user_action
+from app.utils.portfolio import recommend_portfolio, validate_portfolio
+from app.utils.ids import new_id
+from app.utils.pagination import Keyset, paginate, set_next_cursor
+from app.utils.universe import stock_universe
 
 router = APIRouter()
 
+# 자문 요청 목록 정렬 키 (최신순)
+ADVISORY_REQUEST_KEYSET = Keyset(AdvisoryRequest.created_at, AdvisoryRequest.id, descending=True)
+
+# 자문 요청의 추천과 추천 증권을 함께 읽는 로딩 옵션 (요청 수와 관계없이 추천 1회 + 증권 1회 IN 쿼리)
+RECOMMENDATIONS_WITH_STOCK = selectinload(AdvisoryRequest.recommendations).selectinload(AdvisoryRecommendation.stock)
+
 
 @router.post("/request", response_model=AdvisoryRequestSchema)
-def create_advisory_request(
+async def create_advisory_request(
         *,
-        db: Session = Depends(get_db),
+        db: AsyncSession = Depends(get_db),
         request_in: AdvisoryRequestCreate,
         current_user: User = Depends(get_current_user),
         request: Request
@@ -38,8 +49,8 @@ def create_advisory_request(
     Returns:
         자문 요청 정보와 추천 포트폴리오
     """
-    # 포트폴리오 추천 계산
-    recommendations = calculate_portfolio(
+    # 포트폴리오 추천 계산 (같은 스냅샷 버전/유형/잔고의 결과는 캐시에서 반환)
+    recommendations = await recommend_portfolio(
         db,
         current_user.balance,
         request_in.portfolio_type
@@ -53,50 +64,53 @@ def create_advisory_request(
             detail=message
         )
 
-    # 자문 요청 생성
-    advisory_request = AdvisoryRequest(
-        id=str(uuid.uuid4()),
-        user_id=current_user.id,
-        portfolio_type=request_in.portfolio_type,
-        status="completed"
-    )
-
-    db.add(advisory_request)
-    db.commit()
-    db.refresh(advisory_request)
-
-    # 추천 결과 저장
-    for rec in recommendations:
-        recommendation = AdvisoryRecommendation(
-            id=str(uuid.uuid4()),
-            advisory_request_id=advisory_request.id,
-            stock_id=rec["stock_id"],
-            quantity=rec["quantity"],
-            price_at_time=rec["price_at_time"],
-            total_investment=rec["price_at_time"] * rec["quantity"],
-            market_cap=rec["market_cap"],
-            change_rate=rec["change_rate"],
-            volume=rec["volume"]
-        )
-        db.add(recommendation)
+    # 자문 요청, 추천, 감사 로그를 한 트랜잭션으로 기록합니다.
+    # (감사 로그는 AUDIT_SYNC_ACTIONS 에 advisory_request 가 있을 때(기본값) 같은 트랜잭션에 들어가고,
+    #  설정에서 빼면 커밋한 뒤 write-behind 버퍼로 기록합니다.)
+    # ID 와 생성 시각은 여기서 정하므로 INSERT 후 다시 읽지 않고, 추천은 한 번의 bulk INSERT 로 넣습니다.
+    created_at = datetime.now()
+    advisory_request = {
+        "id": new_id(),
+        "user_id": current_user.id,
+        "portfolio_type": request_in.portfolio_type,
+        "status": "completed",
+        "created_at": created_at,
+    }
+    recommendation_rows = [
+        {
+            "id": new_id(),
+            "advisory_request_id": advisory_request["id"],
+            "stock_id": rec["stock_id"],
+            "quantity": rec["quantity"],
+            "price_at_time": rec["price_at_time"],
+            "total_investment": rec["price_at_time"] * rec["quantity"],
+            "market_cap": rec["market_cap"],
+            "change_rate": rec["change_rate"],
+            "volume": rec["volume"],
+            "created_at": created_at,
+        }
+        for rec in recommendations
+    ]
+    total_investment = sum(rec["total_investment"] for rec in recommendations)
 
-    db.commit()
+    await db.execute(insert(AdvisoryRequest), [advisory_request])
+    await db.execute(insert(AdvisoryRecommendation), recommendation_rows)
 
     # 감사 로그 기록
-    log_user_action(
-        db,
-        "advisory_request",
-        current_user.id,
-        {
-            "portfolio_type": request_in.portfolio_type,
-            "recommendations_count": len(recommendations),
-            "total_investment": sum(rec["total_investment"] for rec in recommendations)
-        },
-        request
-    )
+    action = "advisory_request"
+    details = {
+        "portfolio_type": request_in.portfolio_type,
+        "recommendations_count": len(recommendations),
+        "total_investment": total_investment
+    }
+    in_transaction = is_sync_action(action)
+    if in_transaction:
+        await log_user_action(db, action, current_user.id, details, request, commit=False)
+    await db.commit()
+    if not in_transaction:
+        await log_user_action(db, action, current_user.id, details, request)
 
     # 응답 데이터 구성
-    total_investment = sum(rec["total_investment"] for rec in recommendations)
     portfolio_summary = {
         "total_investment": total_investment,
         "num_stocks": len(recommendations),
@@ -105,30 +119,21 @@ def create_advisory_request(
         "risk_level": "높음" if request_in.portfolio_type == "aggressive" else "중간" if request_in.portfolio_type == "balanced" else "낮음"
     }
 
-    # 추천 결과에 필요한 필드 추가
-    recommendations_with_details = []
-    for rec in recommendations:
-        stock = db.query(Stock).filter(Stock.id == rec["stock_id"]).first()
-        recommendations_with_details.append({
-            "id": str(uuid.uuid4()),
-            "advisory_request_id": advisory_request.id,
-            "stock_id": rec["stock_id"],
-            "stock": stock,
-            "quantity": rec["quantity"],
-            "price_at_time": rec["price_at_time"],
-            "total_investment": rec["total_investment"],
-            "market_cap": rec["market_cap"],
-            "change_rate": rec["change_rate"],
-            "volume": rec["volume"],
-            "created_at": datetime.now()
-        })
+    # 추천 결과에 증권 정보 추가 (증권 정보는 스냅샷에서 읽고, 그 사이 스냅샷에서 빠진 증권만 한 번에 조회)
+    snapshot = await stock_universe.get(db)
+    stocks = {rec["stock_id"]: snapshot.by_id.get(rec["stock_id"]) for rec in recommendations}
+    missing = [stock_id for stock_id, stock in stocks.items() if stock is None]
+    if missing:
+        result = await db.execute(select(Stock).where(Stock.id.in_(missing)))
+        stocks.update((stock.id, stock) for stock in result.scalars())
+
+    recommendations_with_details = [
+        {**row, "stock": stocks[row["stock_id"]]}
+        for row in recommendation_rows
+    ]
 
     return {
-        "id": advisory_request.id,
-        "user_id": advisory_request.user_id,
-        "portfolio_type": advisory_request.portfolio_type,
-        "status": advisory_request.status,
-        "created_at": advisory_request.created_at,
+        **advisory_request,
         "recommendations": recommendations_with_details,
         "total_investment": total_investment,
         "portfolio_summary": portfolio_summary
@@ -136,41 +141,44 @@ def create_advisory_request(
 
 
 @router.get("/requests", response_model=List[AdvisoryRequestSchema])
-def get_advisory_requests(
+async def get_advisory_requests(
         *,
-        db: Session = Depends(get_db),
-        current_user: User = Depends(get_current_user),
+        db: AsyncSession = Depends(get_db),
+        current_user: Principal = Depends(get_current_principal),
+        response: Response,
         skip: int = 0,
-        limit: int = 10
+        limit: int = 10,
+        cursor: Optional[str] = None
 ) -> Any:
     """
     자문 요청 내역을 조회합니다.
+    다음 페이지가 있으면 X-Next-Cursor 헤더로 커서를 반환합니다.
     
     Args:
         current_user: 현재 로그인한 사용자
-        skip: 건너뛸 레코드 수
+        skip: 건너뛸 레코드 수 (cursor 가 없을 때만 사용)
         limit: 반환할 최대 레코드 수
+        cursor: 이전 응답의 X-Next-Cursor 값
     
     Returns:
         자문 요청 목록
     """
-    requests = (
-        db.query(AdvisoryRequest)
-        .filter(AdvisoryRequest.user_id == current_user.id)
-        .order_by(AdvisoryRequest.created_at.desc())
-        .offset(skip)
-        .limit(limit)
-        .all()
+    # 페이지의 추천과 증권은 요청 수와 관계없이 각각 한 번의 IN 쿼리로 읽습니다.
+    result = await db.execute(
+        paginate(
+            select(AdvisoryRequest)
+            .options(RECOMMENDATIONS_WITH_STOCK)
+            .where(AdvisoryRequest.user_id == current_user.id),
+            ADVISORY_REQUEST_KEYSET, cursor, skip, limit
+        )
     )
+    requests = result.scalars().all()
+    set_next_cursor(response, ADVISORY_REQUEST_KEYSET, requests, limit)
 
     # 각 요청에 대한 상세 정보 추가
     result = []
     for request in requests:
-        recommendations = (
-            db.query(AdvisoryRecommendation)
-            .filter(AdvisoryRecommendation.advisory_request_id == request.id)
-            .all()
-        )
+        recommendations = request.recommendations
 
         total_investment = sum(rec.quantity * rec.price_at_time for rec in recommendations)
         portfolio_summary = {
@@ -192,11 +200,11 @@ def get_advisory_requests(
 
 
 @router.get("/requests/{request_id}", response_model=AdvisoryRequestSchema)
-def get_advisory_request(
+async def get_advisory_request(
         *,
-        db: Session = Depends(get_db),
+        db: AsyncSession = Depends(get_db),
         request_id: str,
-        current_user: User = Depends(get_current_user)
+        current_user: Principal = Depends(get_current_principal)
 ) -> Any:
     """
     특정 자문 요청의 상세 정보를 조회합니다.
@@ -208,14 +216,15 @@ def get_advisory_request(
     Returns:
         자문 요청 상세 정보
     """
-    advisory_request = (
-        db.query(AdvisoryRequest)
-        .filter(
+    result = await db.execute(
+        select(AdvisoryRequest)
+        .options(RECOMMENDATIONS_WITH_STOCK)
+        .where(
             AdvisoryRequest.id == request_id,
             AdvisoryRequest.user_id == current_user.id
         )
-        .first()
     )
+    advisory_request = result.scalar_one_or_none()
 
     if not advisory_request:
         raise HTTPException(
@@ -223,12 +232,8 @@ def get_advisory_request(
             detail="자문 요청을 찾을 수 없습니다."
         )
 
-    # 추천 정보 조회
-    recommendations = (
-        db.query(AdvisoryRecommendation)
-        .filter(AdvisoryRecommendation.advisory_request_id == request_id)
-        .all()
-    )
+    # 추천 정보 (요청과 함께 읽음)
+    recommendations = advisory_request.recommendations
 
     # 포트폴리오 요약 정보 계산
     total_investment = sum(rec.quantity * rec.price_at_time for rec in recommendations)
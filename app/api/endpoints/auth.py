@@ -1,114 +1,42 @@
-import uuid
 from datetime import timedelta
-from typing import Any, Optional
+from typing import Any
 
 from fastapi import APIRouter, Depends, HTTPException, status, Request
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy import func
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 
 from app.core.database import get_db
+from app.core.dependencies import get_current_principal
+from app.core.principal_cache import Principal
+from app.core.revocation import token_revocations
 from app.core.settings import settings
-from app.models.login_attempt import LoginAttempt
 from app.models.user import User
 from app.schemas.user import UserCreate, User as UserSchema, Token
 from app.utils.audit import log_user_action
+from app.utils.login_attempts import check_login_attempts, record_login_attempt
 from app.utils.security import (
-    verify_password,
-    get_password_hash,
+    password_hasher,
+    access_token_claims,
     create_access_token,
     create_refresh_token,
     verify_refresh_token
 )
+from app.utils.ids import new_id
 
 router = APIRouter()
 
-MAX_LOGIN_ATTEMPTS = 5  # 최대 로그인 시도 횟수
-LOGIN_TIMEOUT_MINUTES = 30  # 로그인 시도 제한 시간 (분)
-
 
 class LoginRequest(BaseModel):
     username: str
     password: str
 
 
-def check_login_attempts(db: Session, user: User, ip_address: str) -> bool:
-    """로그인 시도 횟수를 확인하고 제한을 적용합니다."""
-    # 최근 30분 동안의 실패한 로그인 시도 확인
-    recent_failed_attempt = db.query(LoginAttempt).filter(
-        LoginAttempt.user_id == user.id,
-        LoginAttempt.ip_address == ip_address,
-        LoginAttempt.is_successful == False,
-        LoginAttempt.last_attempt_at >= func.now() - timedelta(minutes=LOGIN_TIMEOUT_MINUTES)
-    ).first()
-
-    # 실패 시도가 5회 이상이면 로그인 제한
-    if recent_failed_attempt and recent_failed_attempt.attempt_count >= MAX_LOGIN_ATTEMPTS:
-        raise HTTPException(
-            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-            detail=f"로그인 시도 횟수가 너무 많습니다. {LOGIN_TIMEOUT_MINUTES}분 후에 다시 시도해주세요."
-        )
-
-    return True
-
-
-def record_login_attempt(
-        db: Session,
-        user: Optional[User],
-        ip_address: str,
-        user_agent: str,
-        is_successful: bool
-) -> None:
-    """로그인 시도 기록을 저장합니다.
-    TODO:
-    1. 계정이 없는 상태에서의 반복 로그인 방지 대책 구현 필요
-       - IP 주소 기반의 로그인 시도 제한
-       - 일정 시간 동안 로그인 시도 제한
-       - CAPTCHA 또는 reCAPTCHA 도입 검토
-       - IP 주소 블랙리스트 관리 기능
-    """
-
-    if is_successful and user:
-        # 성공한 경우 새로운 성공 기록 생성
-        new_attempt = LoginAttempt(
-            user_id=user.id,
-            ip_address=ip_address,
-            user_agent=user_agent,
-            is_successful=True,
-            attempt_count=1
-        )
-        db.add(new_attempt)
-    else:
-        # 최근 실패 기록 조회 (30분 이내)
-        recent_failed_attempt = db.query(LoginAttempt).filter(
-            LoginAttempt.ip_address == ip_address,
-            LoginAttempt.is_successful == False,
-            LoginAttempt.last_attempt_at >= func.now() - timedelta(minutes=LOGIN_TIMEOUT_MINUTES)
-        ).first()
-
-        if recent_failed_attempt:
-            # 기존 실패 기록이 있으면 시도 횟수 증가
-            recent_failed_attempt.attempt_count += 1
-            recent_failed_attempt.last_attempt_at = func.now()
-        else:
-            # 새로운 실패 기록 생성
-            new_attempt = LoginAttempt(
-                user_id=user.id if user else None,
-                ip_address=ip_address,
-                user_agent=user_agent,
-                is_successful=False,
-                attempt_count=1
-            )
-            db.add(new_attempt)
-
-    db.commit()
-
-
 @router.post("/register", response_model=UserSchema)
-def register(
+async def register(
         *,
-        db: Session = Depends(get_db),
+        db: AsyncSession = Depends(get_db),
         user_in: UserCreate,
         request: Request
 ) -> Any:
@@ -116,7 +44,8 @@ def register(
     새로운 사용자를 등록합니다.
     """
     # 이메일 중복 체크
-    user = db.query(User).filter(User.email == user_in.email).first()
+    result = await db.execute(select(User).where(User.email == user_in.email))
+    user = result.scalar_one_or_none()
     if user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -125,47 +54,67 @@ def register(
 
     # 사용자 생성
     user = User(
-        id=str(uuid.uuid4()),
+        id=new_id(),
         email=user_in.email,
-        hashed_password=get_password_hash(user_in.password),
+        hashed_password=await password_hasher.hash(user_in.password),
         first_name=user_in.first_name,
         last_name=user_in.last_name,
         portfolio_type=user_in.portfolio_type
     )
 
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
 
     # 감사 로그 기록
-    log_user_action(db, "register", user.id, request=request)
+    await log_user_action(db, "register", user.id, request=request)
 
     return user
 
 
 @router.post("/login", response_model=Token)
 async def login(
+    request: Request,
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    """사용자 로그인을 처리합니다."""
-    user = db.query(User).filter(User.email == form_data.username).first()
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    """
+    사용자 로그인을 처리합니다.
+    최근 로그인 실패가 많은 IP 와 계정은 DB 를 조회하기 전에 429 로 거절합니다.
+    비밀번호 검증은 전용 스레드 풀에서 실행하며, 대기열이 가득 차면 503 으로 거절합니다.
+    저장된 해시가 현재 rounds 정책을 벗어나면 로그인 성공 시 다시 해시합니다.
+    """
+    await check_login_attempts(request, form_data.username)
+
+    result = await db.execute(select(User).where(User.email == form_data.username))
+    user = result.scalar_one_or_none()
+    valid, new_hash = False, None
+    if user:
+        valid, new_hash = await password_hasher.verify_and_update(form_data.password, user.hashed_password)
+    if not valid:
+        await record_login_attempt(db, request, form_data.username, user, is_successful=False)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="이메일 또는 비밀번호가 올바르지 않습니다.",
             headers={"WWW-Authenticate": "Bearer"},
         )
+
+    # 저장된 해시의 rounds 가 현재 정책을 벗어나면 로그인한 비밀번호로 다시 해시해 둡니다.
+    if new_hash is not None:
+        user.hashed_password = new_hash
+        await db.commit()
+    await record_login_attempt(db, request, form_data.username, user, is_successful=True)
+
+    # 리프레시 토큰 생성 (로그아웃할 때 함께 폐기하도록 액세스 토큰에 리프레시 토큰 ID 를 담습니다)
+    refresh_token, session_id = create_refresh_token(
+        data={"sub": user.id}
+    )
+
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={"sub": user.id}, expires_delta=access_token_expires
-    )
-    
-    # 리프레시 토큰 생성
-    refresh_token = create_refresh_token(
-        data={"sub": user.id}
+        data={**access_token_claims(user), "sid": session_id}, expires_delta=access_token_expires
     )
-    
+
     return {
         "access_token": access_token,
         "refresh_token": refresh_token,
@@ -174,40 +123,66 @@ async def login(
 
 
 @router.post("/refresh")
-def refresh_token(
+async def refresh_token(
         *,
-        db: Session = Depends(get_db),
+        db: AsyncSession = Depends(get_db),
         refresh_token: str,
         request: Request
 ) -> Any:
     """
     리프레시 토큰을 사용하여 새로운 액세스 토큰을 발급합니다.
+    로그아웃으로 폐기된 리프레시 토큰과 폐기할 수 없는 이전 형식(jti 없음) 토큰은 401 로 거절합니다.
     """
     payload = verify_refresh_token(refresh_token)
-    if not payload:
+    session_id = payload.get("jti") if payload else None
+    if session_id is None or await token_revocations.is_jti_revoked(db, session_id):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="유효하지 않은 리프레시 토큰입니다."
         )
 
     user_id = payload.get("sub")
-    user = db.query(User).filter(User.id == user_id).first()
+    result = await db.execute(select(User).where(User.id == user_id))
+    user = result.scalar_one_or_none()
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="사용자를 찾을 수 없습니다."
         )
 
-    # 새로운 액세스 토큰 생성
+    # 새로운 액세스 토큰 생성 (현재 역할/활성 상태를 클레임으로 담습니다)
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={"sub": user.id}, expires_delta=access_token_expires
+        data={**access_token_claims(user), "sid": session_id}, expires_delta=access_token_expires
     )
 
     # 감사 로그 기록
-    log_user_action(db, "refresh_token", user.id, request=request)
+    await log_user_action(db, "refresh_token", user.id, request=request)
 
     return {
         "access_token": access_token,
         "token_type": "bearer"
     }
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(
+        *,
+        db: AsyncSession = Depends(get_db),
+        current_user: Principal = Depends(get_current_principal),
+        request: Request
+) -> None:
+    """
+    현재 액세스 토큰과, 그 토큰과 함께 발급된 리프레시 토큰을 폐기합니다.
+    폐기한 토큰은 이 워커에서는 바로, 다른 워커에서는 TOKEN_REVOCATION_SYNC_SECONDS 안에 거절됩니다.
+    """
+    if current_user.token_id is None or current_user.expires_at is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="폐기할 수 없는 형식의 토큰입니다. 다시 로그인해주세요."
+        )
+
+    await token_revocations.revoke_token(db, current_user, current_user.expires_at, "logout")
+
+    # 감사 로그 기록
+    await log_user_action(db, "logout", current_user.id, request=request)
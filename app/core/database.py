@@ -1,41 +1,291 @@
-from typing import Generator
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
-import os
-from dotenv import load_dotenv
+import math
+import random
+import threading
+import time
+from typing import AsyncGenerator, Dict, List, Optional
 
-# .env 파일 로드
-load_dotenv()
+from fastapi import Request
+from sqlalchemy import Select, create_engine, event
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
+
+from app.core.pool import InstrumentedAsyncAdaptedQueuePool, attach_metrics
+from app.core.settings import PoolPrePingStrategy, settings
 
 # 데이터베이스 URL 설정
-SQLALCHEMY_DATABASE_URL = os.getenv(
-    "DATABASE_URL",
-    "mysql+pymysql://user:password@db:3306/balance_one"
+SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
+
+# 백엔드별 동기/비동기 드라이버
+SYNC_DRIVERS = {"mysql": "pymysql", "sqlite": "pysqlite"}
+ASYNC_DRIVERS = {"mysql": "asyncmy", "sqlite": "aiosqlite"}
+
+
+def _with_driver(url: str, drivers: dict) -> URL:
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in drivers:
+        return parsed
+    return parsed.set(drivername=f"{backend}+{drivers[backend]}")
+
+
+def to_async_url(url: str) -> URL:
+    """
+    DATABASE_URL 을 비동기 드라이버(asyncmy, aiosqlite) URL 로 변환합니다.
+
+    Args:
+        url: 데이터베이스 URL (예: mysql+pymysql://...)
+
+    Returns:
+        URL: 비동기 드라이버 URL (예: mysql+asyncmy://...)
+    """
+    return _with_driver(url, ASYNC_DRIVERS)
+
+
+def to_sync_url(url: str) -> URL:
+    """
+    DATABASE_URL 을 동기 드라이버(pymysql, pysqlite) URL 로 변환합니다.
+
+    Args:
+        url: 데이터베이스 URL (예: mysql+asyncmy://...)
+
+    Returns:
+        URL: 동기 드라이버 URL (예: mysql+pymysql://...)
+    """
+    return _with_driver(url, SYNC_DRIVERS)
+
+
+def pool_options(url: URL) -> dict:
+    """
+    Settings 의 커넥션 풀 설정을 엔진 인자로 변환합니다.
+
+    Args:
+        url: 데이터베이스 URL
+
+    Returns:
+        dict: create_async_engine 에 넘길 풀 관련 인자
+    """
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        # 메모리 SQLite 는 커넥션 하나를 공유하는 전용 풀을 사용합니다.
+        return {}
+    return {
+        "poolclass": InstrumentedAsyncAdaptedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING == PoolPrePingStrategy.ALWAYS,
+    }
+
+
+# 비동기 엔진 생성 (API 요청 처리용)
+_async_url = to_async_url(SQLALCHEMY_DATABASE_URL)
+engine = create_async_engine(_async_url, **pool_options(_async_url))
+if isinstance(engine.pool, InstrumentedAsyncAdaptedQueuePool):
+    attach_metrics(engine, "primary")
+
+# 읽기 전용 복제본 엔진 생성
+replica_engines: List[AsyncEngine] = []
+for _index, _replica_url in enumerate(settings.DATABASE_REPLICA_URLS):
+    _replica_async_url = to_async_url(_replica_url)
+    _replica_engine = create_async_engine(_replica_async_url, **pool_options(_replica_async_url))
+    if isinstance(_replica_engine.pool, InstrumentedAsyncAdaptedQueuePool):
+        attach_metrics(_replica_engine, f"replica-{_index}")
+    replica_engines.append(_replica_engine)
+
+
+class ReadYourWritesTracker:
+    """
+    사용자별 마지막 쓰기 시각을 기억하는 추적기
+    쓰기 직후 일정 시간 동안은 복제 지연 때문에 자신이 쓴 데이터가 보이지 않는
+    일이 없도록 해당 사용자의 읽기를 primary 로 보냅니다.
+    워커 프로세스 단위로 유지되므로, 다른 워커로 간 요청은 클라이언트가 돌려보내는
+    마지막 쓰기 시각(LAST_WRITE_COOKIE / LAST_WRITE_HEADER)으로 판단합니다.
+    """
+
+    def __init__(self, window_seconds: float):
+        self.window_seconds = window_seconds
+        self._lock = threading.Lock()
+        self._written_at: Dict[str, float] = {}
+
+    def mark(self, user_id: str) -> None:
+        """사용자의 쓰기를 기록합니다."""
+        now = time.monotonic()
+        with self._lock:
+            self._written_at[user_id] = now
+            if len(self._written_at) > 10000:
+                self._prune(now)
+
+    def wrote_recently(self, user_id: str) -> bool:
+        """사용자가 최근 window_seconds 안에 쓰기를 했는지 확인합니다."""
+        written_at = self._written_at.get(user_id)
+        return written_at is not None and time.monotonic() - written_at < self.window_seconds
+
+    def _prune(self, now: float) -> None:
+        expired = [uid for uid, at in self._written_at.items() if now - at >= self.window_seconds]
+        for uid in expired:
+            del self._written_at[uid]
+
+
+recent_writes = ReadYourWritesTracker(settings.READ_YOUR_WRITES_SECONDS)
+
+# 쓰기를 커밋한 응답에 담아 보내는 마지막 쓰기 시각 (UNIX 초)
+# 브라우저는 쿠키로, 쿠키를 쓰지 않는 API 클라이언트는 받은 헤더 값을 다음 요청에 그대로 보내면 됩니다.
+LAST_WRITE_COOKIE = "last_write_at"
+LAST_WRITE_HEADER = "X-Last-Write-At"
+
+
+def client_wrote_recently(request: Request, window_seconds: float = settings.READ_YOUR_WRITES_SECONDS) -> bool:
+    """
+    요청에 담긴 마지막 쓰기 시각이 window_seconds 안인지 확인합니다. (어느 워커에서 쓴 것이든)
+
+    Args:
+        request: HTTP 요청 객체
+        window_seconds: 쓰기 후 primary 에서 읽는 시간 (초)
+
+    Returns:
+        bool: 최근에 쓰기를 한 클라이언트이면 True (값이 없거나 올바르지 않으면 False)
+    """
+    value = request.headers.get(LAST_WRITE_HEADER) or request.cookies.get(LAST_WRITE_COOKIE)
+    try:
+        written_at = float(value) if value else None
+    except ValueError:
+        return False
+    # 서버 간 시계 차이를 감안해 조금 앞선 시각도 허용합니다.
+    return written_at is not None and -window_seconds < time.time() - written_at < window_seconds
+
+
+async def read_your_writes_middleware(request: Request, call_next):
+    """쓰기를 커밋한 요청의 응답에 마지막 쓰기 시각을 쿠키와 헤더로 담습니다."""
+    response = await call_next(request)
+    written_at = getattr(request.state, "last_write_at", None)
+    if written_at is not None:
+        value = f"{written_at:.3f}"
+        response.headers[LAST_WRITE_HEADER] = value
+        response.set_cookie(
+            LAST_WRITE_COOKIE, value, max_age=math.ceil(settings.READ_YOUR_WRITES_SECONDS), httponly=True, samesite="lax"
+        )
+    return response
+
+
+class RoutingSession(Session):
+    """
+    primary/replica 라우팅 세션
+    읽기 전용으로 표시된 세션(info["read_only"])의 SELECT 는 복제본으로,
+    그 밖의 모든 쿼리와 flush 는 primary 로 보냅니다.
+    한 세션은 처음 고른 복제본을 계속 사용합니다.
+    """
+
+    def __init__(
+            self,
+            *args,
+            primary: Optional[AsyncEngine] = None,
+            replicas: Optional[List[AsyncEngine]] = None,
+            **kwargs
+    ):
+        super().__init__(*args, **kwargs)
+        self.primary = primary
+        self.replicas = replicas or []
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self.primary is None:
+            return super().get_bind(mapper=mapper, clause=clause, **kwargs)
+        if self.use_replica and not self._flushing and isinstance(clause, Select):
+            replica = self.info.get("replica")
+            if replica is None:
+                replica = self.info["replica"] = random.choice(self.replicas)
+            return replica.sync_engine
+        return self.primary.sync_engine
+
+    @property
+    def use_replica(self) -> bool:
+        return bool(self.replicas) and self.info.get("read_only", False) and not self.info.get("wrote", False)
+
+
+def _mark_write(session: Session) -> None:
+    # wrote: 이 세션의 이후 읽기를 primary 로 고정, pending_write: 커밋 시 사용자 쓰기로 기록
+    session.info["wrote"] = True
+    session.info["pending_write"] = True
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _track_flush(session, flush_context):
+    _mark_write(session)
+
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _track_bulk_write(orm_execute_state):
+    if not orm_execute_state.is_select:
+        _mark_write(orm_execute_state.session)
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _remember_writer(session):
+    if not session.info.pop("pending_write", False):
+        return
+    if session.info.get("user_id"):
+        recent_writes.mark(session.info["user_id"])
+    request_state = session.info.get("request_state")
+    if request_state is not None:
+        # read_your_writes_middleware 가 응답에 담아 클라이언트에 돌려줍니다.
+        request_state.last_write_at = time.time()
+
+
+# 비동기 세션 생성
+# 커밋 후 속성 접근 시 이벤트 루프 밖에서 지연 로딩이 일어나지 않도록 만료하지 않습니다.
+AsyncSessionLocal = async_sessionmaker(
+    bind=engine,
+    class_=AsyncSession,
+    sync_session_class=RoutingSession,
+    primary=engine,
+    replicas=replica_engines,
+    autoflush=False,
+    expire_on_commit=False,
 )
 
-# 엔진 생성
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL,
-    pool_pre_ping=True,  # 연결 상태 확인
-    pool_recycle=3600,  # 1시간마다 연결 재생성
+# 복제본 라우팅 대상 HTTP 메서드
+READ_ONLY_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+# 동기 엔진 생성 (스크립트, 관리자 도구, 테스트 픽스처용)
+sync_engine = create_engine(
+    to_sync_url(SQLALCHEMY_DATABASE_URL),
+    pool_pre_ping=True,
+    pool_recycle=settings.DB_POOL_RECYCLE,
 )
 
-# 세션 생성
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# 동기 세션 생성
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=sync_engine)
 
 # Base 클래스 생성
 Base = declarative_base()
 
 
-def get_db() -> Generator:
+async def get_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
     """
-    데이터베이스 세션을 생성하고 관리하는 함수
+    요청 단위(unit of work) 데이터베이스 세션을 생성하고 관리하는 함수
+
+    FastAPI 는 한 요청 안에서 같은 의존성을 한 번만 실행하므로, 인증 의존성
+    (get_current_user)과 엔드포인트가 모두 이 함수를 사용하면 같은 세션과
+    같은 커넥션을 공유합니다. 인증 단계에서 읽은 User 객체도 이 세션의
+    identity map 에 올라가 있으므로 엔드포인트에서 다시 조회할 필요가 없습니다.
+    처리 중 예외가 발생하면 커밋되지 않은 변경 사항을 롤백합니다.
+
+    GET 요청의 세션은 읽기 전용으로 표시되어 복제본이 설정된 경우 복제본에서
+    조회합니다. 요청에 최근 쓰기 시각이 담겨 있거나(다른 워커에서 쓴 경우 포함),
+    인증 의존성이 이 워커에서 사용자가 최근에 쓰기를 한 것을 확인하면 이를 해제합니다.
+
+    Args:
+        request: HTTP 요청 객체
 
     Yields:
-        Generator: 데이터베이스 세션
+        AsyncSession: 데이터베이스 세션
     """
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+    async with AsyncSessionLocal() as db:
+        db.info["read_only"] = request.method in READ_ONLY_METHODS and not client_wrote_recently(request)
+        db.info["request_state"] = request.state
+        try:
+            yield db
+        except Exception:
+            await db.rollback()
+            raise
+
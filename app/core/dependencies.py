@@ -1,29 +1,139 @@
+import time
+from typing import Tuple
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import SessionLocal
+from app.core.database import get_db, recent_writes
+from app.core.principal_cache import Principal, principal_cache
+from app.core.revocation import token_revocations
 from app.core.settings import settings
 from app.models.user import User
 from app.utils.constant.globals import UserRole
 
 
-# db connection
-def get_db():
-    db = SessionLocal()
+# authorization
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/login")
+
+credentials_exception = HTTPException(
+    status_code=status.HTTP_401_UNAUTHORIZED,
+    detail="Could not validate credentials",
+    headers={"WWW-Authenticate": "Bearer"},
+)
+
+
+def _decode_token(token: str) -> Tuple[str, dict]:
+    """
+    액세스 토큰을 검증하고 사용자 ID 와 payload 를 반환합니다.
+
+    Raises:
+        HTTPException: 토큰이 올바르지 않은 경우 (401)
+    """
     try:
-        yield db
-    finally:
-        db.close()
+        payload = jwt.decode(
+            token,
+            settings.SECRET_KEY,
+            algorithms=[settings.ALGORITHM]
+        )
+    except JWTError:
+        raise credentials_exception
+    user_id: str = payload.get("sub")
+    if user_id is None:
+        raise credentials_exception
+    return user_id, payload
 
 
-# authorization
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/login")
+def _route_reads(db: AsyncSession, user_id: str) -> None:
+    # 쓰기 직후의 읽기는 복제 지연을 피하기 위해 primary 에서 처리합니다.
+    db.info["user_id"] = user_id
+    if recent_writes.wrote_recently(user_id):
+        db.info["read_only"] = False
+
+
+def _check_active(is_active: bool) -> None:
+    if not is_active:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Inactive user"
+        )
+
+
+async def _load_principal(db: AsyncSession, user_id: str, payload: dict) -> Principal:
+    # 클레임이 없는 이전 형식 토큰이나 클레임이 폐기된 토큰은 DB 의 역할/활성 상태를 사용합니다.
+    result = await db.execute(select(User.id, User.role, User.is_active).where(User.id == user_id))
+    row = result.one_or_none()
+    if row is None:
+        raise credentials_exception
+    return Principal(
+        id=row.id,
+        role=row.role,
+        is_active=row.is_active,
+        token_id=payload.get("jti"),
+        issued_at=payload.get("iat"),
+        expires_at=payload.get("exp"),
+        session_id=payload.get("sid"),
+    )
+
+
+async def get_current_principal(
+        db: AsyncSession = Depends(get_db),
+        token: str = Depends(oauth2_scheme)
+) -> Principal:
+    """
+    현재 인증된 사용자의 Principal(id, role, is_active)을 가져오는 의존성 함수
+    역할/활성 상태는 토큰 클레임에서 읽고, 폐기 여부는 token_revocations 의 Bloom filter 로 확인하므로
+    대부분의 요청은 DB 를 조회하지 않습니다. DB 는 다음 경우에만 조회합니다.
+    - 필터에 걸린 토큰 (로그아웃했거나, 발급 후 역할/활성 상태가 바뀐 사용자의 토큰)
+    - 역할/활성 상태 클레임이 없는 이전 형식 토큰
+    검증한 토큰은 principal_cache 에 두어 다음 요청에서 JWT 검증도 건너뜁니다.
+    User 의 다른 속성(잔고 등)이 필요 없는 엔드포인트에서 사용합니다.
+
+    Args:
+        db: 데이터베이스 세션
+        token: JWT 토큰
+
+    Returns:
+        Principal: 현재 인증된 사용자의 스냅샷
+
+    Raises:
+        HTTPException: 인증 실패 또는 폐기된 토큰인 경우 (401), 비활성 사용자인 경우 (400)
+    """
+    principal = principal_cache.get(token)
+    if principal is None:
+        user_id, payload = _decode_token(token)
+        _route_reads(db, user_id)
+        epoch = principal_cache.epoch
+        started = time.perf_counter()
+        principal = Principal.from_claims(payload) or await _load_principal(db, user_id, payload)
+        principal_cache.put(token, principal, principal.expires_at, epoch, time.perf_counter() - started)
+    else:
+        _route_reads(db, principal.id)
+
+    if await token_revocations.is_token_revoked(db, principal):
+        raise credentials_exception
+    if principal.from_token and await token_revocations.are_claims_revoked(db, principal):
+        # 발급 후 역할/활성 상태가 바뀐 토큰은 만료될 때까지 DB 값을 사용합니다.
+        epoch = principal_cache.epoch
+        started = time.perf_counter()
+        principal = await _load_principal(
+            db,
+            principal.id,
+            {
+                "jti": principal.token_id, "iat": principal.issued_at, "exp": principal.expires_at,
+                "sid": principal.session_id,
+            },
+        )
+        principal_cache.put(token, principal, principal.expires_at, epoch, time.perf_counter() - started)
+
+    _check_active(principal.is_active)
+    return principal
 
 
 async def get_current_user(
-        db: Session = Depends(get_db),
+        db: AsyncSession = Depends(get_db),
         token: str = Depends(oauth2_scheme)
 ) -> User:
     """
@@ -39,48 +149,36 @@ async def get_current_user(
     Raises:
         HTTPException: 인증 실패 시 발생
     """
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-
-    try:
-        payload = jwt.decode(
-            token,
-            settings.SECRET_KEY,
-            algorithms=[settings.ALGORITHM]
-        )
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            raise credentials_exception
-    except JWTError:
-        raise credentials_exception
+    user_id, payload = _decode_token(token)
+    _route_reads(db, user_id)
 
-    user = db.query(User).filter(User.id == user_id).first()
+    epoch = principal_cache.epoch
+    started = time.perf_counter()
+    result = await db.execute(select(User).where(User.id == user_id))
+    user = result.scalar_one_or_none()
     if user is None:
         raise credentials_exception
+    # 같은 토큰으로 이어지는 Principal 만 필요한 요청은 DB 를 조회하지 않도록 캐시를 채웁니다.
+    principal = Principal.from_user(user, payload)
+    principal_cache.put(token, principal, principal.expires_at, epoch, time.perf_counter() - started)
+    if await token_revocations.is_token_revoked(db, principal):
+        raise credentials_exception
 
-    if not user.is_active:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Inactive user"
-        )
-
+    _check_active(user.is_active)
     return user
 
 
 async def get_current_active_superuser(
-        current_user: User = Depends(get_current_user),
-) -> User:
+        current_user: Principal = Depends(get_current_principal),
+) -> Principal:
     """
     현재 인증된 슈퍼유저를 가져오는 의존성 함수
     
     Args:
-        current_user: 현재 인증된 사용자
+        current_user: 현재 인증된 사용자의 Principal
         
     Returns:
-        User: 현재 인증된 슈퍼유저
+        Principal: 현재 인증된 슈퍼유저
         
     Raises:
         HTTPException: 슈퍼유저가 아닐 경우 발생
@@ -94,16 +192,16 @@ async def get_current_active_superuser(
 
 
 async def get_current_admin_user(
-        current_user: User = Depends(get_current_user),
-) -> User:
+        current_user: Principal = Depends(get_current_principal),
+) -> Principal:
     """
     현재 인증된 관리자 사용자를 가져오는 의존성 함수
     
     Args:
-        current_user: 현재 인증된 사용자
+        current_user: 현재 인증된 사용자의 Principal
         
     Returns:
-        User: 현재 인증된 관리자 사용자
+        Principal: 현재 인증된 관리자 사용자
         
     Raises:
         HTTPException: 관리자 권한이 없는 경우 발생
@@ -0,0 +1,180 @@
+import asyncio
+import bisect
+import logging
+import threading
+import time
+from typing import Dict, List
+
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+logger = logging.getLogger(__name__)
+
+# 체크아웃 대기 시간 히스토그램 구간 (ms)
+WAIT_BUCKETS_MS = [1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000]
+
+
+class PoolMetrics:
+    """
+    커넥션 풀 계측 정보
+    체크아웃 대기 시간, 사용 중 커넥션 수, overflow 수를 누적합니다.
+    워커 프로세스별 풀 크기를 실측 데이터로 정하기 위해 사용합니다.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.checkouts = 0
+            self.timeouts = 0
+            self.wait_total = 0.0
+            self.wait_max = 0.0
+            self.wait_buckets = [0] * (len(WAIT_BUCKETS_MS) + 1)
+            self.peak_checked_out = 0
+            self.peak_overflow = 0
+            self.liveness_checks = 0
+            self.liveness_failures = 0
+
+    def record_checkout(self, pool: QueuePool, wait: float) -> None:
+        """커넥션 체크아웃 1건을 기록합니다."""
+        wait_ms = wait * 1000
+        with self._lock:
+            self.checkouts += 1
+            self.wait_total += wait
+            self.wait_max = max(self.wait_max, wait)
+            self.wait_buckets[bisect.bisect_left(WAIT_BUCKETS_MS, wait_ms)] += 1
+            self.peak_checked_out = max(self.peak_checked_out, pool.checkedout())
+            self.peak_overflow = max(self.peak_overflow, pool.overflow())
+
+    def record_timeout(self) -> None:
+        """체크아웃 대기 한도 초과 1건을 기록합니다."""
+        with self._lock:
+            self.timeouts += 1
+
+    def record_liveness(self, checked: int, failed: int) -> None:
+        """백그라운드 점검 결과를 기록합니다."""
+        with self._lock:
+            self.liveness_checks += checked
+            self.liveness_failures += failed
+
+    def snapshot(self, pool: QueuePool) -> Dict:
+        """현재 풀 상태와 누적 계측 값을 반환합니다."""
+        with self._lock:
+            histogram = {
+                f"le_{bound}ms": count
+                for bound, count in zip(WAIT_BUCKETS_MS, self.wait_buckets)
+            }
+            histogram["gt_5000ms"] = self.wait_buckets[-1]
+            return {
+                "name": self.name,
+                "pool_size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                "overflow": max(pool.overflow(), 0),
+                "peak_checked_out": self.peak_checked_out,
+                "peak_overflow": max(self.peak_overflow, 0),
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_avg_ms": (self.wait_total / self.checkouts * 1000) if self.checkouts else 0.0,
+                "wait_max_ms": self.wait_max * 1000,
+                "wait_histogram": histogram,
+                "liveness_checks": self.liveness_checks,
+                "liveness_failures": self.liveness_failures,
+            }
+
+
+class _InstrumentedPoolMixin:
+    """QueuePool 체크아웃 경로에 대기 시간 계측을 추가합니다."""
+
+    metrics: PoolMetrics
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.record_timeout()
+            raise
+        self.metrics.record_checkout(self, time.perf_counter() - started)
+        return connection
+
+    def recreate(self):
+        # engine.dispose() 후에도 같은 계측 객체를 유지합니다.
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncAdaptedQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def attach_metrics(engine, name: str) -> PoolMetrics:
+    """
+    엔진의 풀에 계측 객체를 연결합니다.
+
+    Args:
+        engine: 동기 또는 비동기 엔진
+        name: 계측 이름 (예: 'primary')
+
+    Returns:
+        PoolMetrics: 연결된 계측 객체
+    """
+    metrics = PoolMetrics(name)
+    engine.pool.metrics = metrics
+    return metrics
+
+
+def pool_stats(engines: List) -> List[Dict]:
+    """계측이 연결된 엔진들의 풀 상태를 반환합니다."""
+    return [
+        engine.pool.metrics.snapshot(engine.pool)
+        for engine in engines
+        if isinstance(engine.pool, _InstrumentedPoolMixin)
+    ]
+
+
+async def check_idle_connections(engine: AsyncEngine) -> int:
+    """
+    유휴 커넥션을 하나씩 체크아웃해 ping 합니다.
+
+    QueuePool 은 FIFO 로 커넥션을 돌려주므로 유휴 커넥션 수만큼 순차적으로
+    체크아웃하면 각 커넥션을 한 번씩 점검하게 됩니다. 끊어진 커넥션은
+    SQLAlchemy 가 disconnect 오류를 감지해 무효화하고 다음 체크아웃 때 새로 연결합니다.
+    요청을 굶기지 않도록 한 번에 하나의 커넥션만 점유합니다.
+
+    Returns:
+        int: 실패한 점검 수
+    """
+    pool = engine.pool
+    idle = pool.checkedin()
+    failed = 0
+    for _ in range(idle):
+        try:
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+        except exc.DBAPIError as e:
+            failed += 1
+            logger.warning("DB liveness check failed: %s", e)
+    if isinstance(pool, _InstrumentedPoolMixin):
+        pool.metrics.record_liveness(idle, failed)
+    return failed
+
+
+async def run_liveness_checks(engines: List[AsyncEngine], interval: float) -> None:
+    """pool_pre_ping 대신 주기적으로 유휴 커넥션을 점검하는 백그라운드 작업"""
+    while True:
+        await asyncio.sleep(interval)
+        for engine in engines:
+            try:
+                await check_idle_connections(engine)
+            except Exception:
+                logger.exception("DB liveness check crashed")
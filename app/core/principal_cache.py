@@ -0,0 +1,335 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Optional, Set, Tuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app.core.settings import settings
+from app.models.user import User
+from app.utils.constant.globals import UserRole
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Principal:
+    """
+    인증된 사용자의 가벼운 스냅샷
+
+    권한 확인에 필요한 값만 담습니다. 잔고처럼 요청마다 바뀌는 값은 담지 않으며,
+    이런 값이 필요한 엔드포인트는 get_current_user 로 User 행을 읽습니다.
+    token_id/issued_at/expires_at 은 토큰의 jti/iat/exp 클레임으로, 토큰 폐기 확인에 사용합니다.
+    session_id 는 토큰과 함께 발급된 리프레시 토큰의 jti(sid 클레임)로, 로그아웃할 때 함께 폐기합니다.
+    """
+    id: str
+    role: UserRole
+    is_active: bool
+    token_id: Optional[str] = None
+    issued_at: Optional[float] = None
+    expires_at: Optional[float] = None
+    session_id: Optional[str] = None
+    from_token: bool = False  # role/is_active 를 DB 가 아닌 토큰 클레임에서 읽었는지 여부
+
+    @classmethod
+    def from_user(cls, user: User, payload: Optional[dict] = None) -> "Principal":
+        payload = payload or {}
+        return cls(
+            id=user.id,
+            role=user.role,
+            is_active=user.is_active,
+            token_id=payload.get("jti"),
+            issued_at=payload.get("iat"),
+            expires_at=payload.get("exp"),
+            session_id=payload.get("sid"),
+        )
+
+    @classmethod
+    def from_claims(cls, payload: dict) -> Optional["Principal"]:
+        """토큰 클레임(sub, role, active)으로 만듭니다. 클레임이 없는 이전 형식 토큰이면 None 을 반환합니다."""
+        if "role" not in payload or "active" not in payload:
+            return None
+        return cls(
+            id=payload["sub"],
+            role=UserRole(payload["role"]),
+            is_active=bool(payload["active"]),
+            token_id=payload.get("jti"),
+            issued_at=payload.get("iat"),
+            expires_at=payload.get("exp"),
+            session_id=payload.get("sid"),
+            from_token=True,
+        )
+
+
+class PrincipalCache:
+    """
+    검증된 토큰 -> Principal LRU + TTL 캐시 (워커 프로세스 단위)
+
+    항목은 PRINCIPAL_CACHE_TTL_SECONDS 와 토큰 만료 시각(exp) 중 빠른 시각에 만료되므로,
+    적중한 토큰은 JWT 를 다시 검증하지 않아도 만료된 토큰을 받아들이지 않습니다.
+    사용자의 role/is_active 가 바뀌면 그 사용자의 모든 항목을 지우고(invalidate_user),
+    PrincipalInvalidationSync 가 이를 다른 워커에도 전달합니다.
+    조회 중에 무효화가 일어나면 이전 값을 저장하지 않도록 epoch 로 확인합니다.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float, clock: Callable[[], float] = time.time):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self._lock = threading.Lock()
+        # 토큰 -> (Principal, 만료 시각)
+        self._entries: "OrderedDict[str, Tuple[Principal, float]]" = OrderedDict()
+        self._tokens_by_user: Dict[str, Set[str]] = {}
+        self._unpublished: Set[str] = set()
+        self.epoch = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.lookup_count = 0
+        self.lookup_seconds_total = 0.0
+        self.saved_seconds_total = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def _remove(self, token: str) -> None:
+        principal, _ = self._entries.pop(token)
+        tokens = self._tokens_by_user.get(principal.id)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._tokens_by_user[principal.id]
+
+    def get(self, token: str) -> Optional[Principal]:
+        """
+        캐시된 Principal 을 반환합니다. 없거나 만료되었으면 None 을 반환합니다.
+        적중하면 DB 조회 평균 시간만큼을 절약한 시간으로 기록합니다.
+        """
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is not None and entry[1] <= self.clock():
+                self._remove(token)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(token)
+            self.hits += 1
+            if self.lookup_count:
+                self.saved_seconds_total += self.lookup_seconds_total / self.lookup_count
+            return entry[0]
+
+    def put(
+            self,
+            token: str,
+            principal: Principal,
+            expires_at: Optional[float],
+            epoch: int,
+            lookup_seconds: float
+    ) -> None:
+        """
+        토큰 클레임이나 DB 에서 읽은 Principal 을 저장합니다.
+
+        Args:
+            token: 검증된 액세스 토큰
+            principal: 저장할 스냅샷
+            expires_at: 토큰 만료 시각 (epoch 초, JWT exp)
+            epoch: 조회를 시작하기 전에 읽은 self.epoch (그 사이 무효화가 있었으면 저장하지 않음)
+            lookup_seconds: 토큰 검증과 조회에 걸린 시간 (절약한 시간 계산용)
+        """
+        if not self.enabled:
+            return
+        now = self.clock()
+        deadline = now + self.ttl_seconds
+        if expires_at is not None:
+            deadline = min(deadline, expires_at)
+        with self._lock:
+            self.lookup_count += 1
+            self.lookup_seconds_total += lookup_seconds
+            if epoch != self.epoch or deadline <= now:
+                return
+            if token in self._entries:
+                self._remove(token)
+            self._entries[token] = (principal, deadline)
+            self._tokens_by_user.setdefault(principal.id, set()).add(token)
+            # 가장 오래 사용하지 않은 토큰부터 버립니다.
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate_user(self, user_id: str, publish: bool = True) -> None:
+        """
+        사용자의 모든 토큰 항목을 지웁니다.
+
+        Args:
+            user_id: 사용자 ID
+            publish: True 이면 다른 워커에도 전달합니다. (PrincipalInvalidationSync 사용 시)
+        """
+        with self._lock:
+            self.epoch += 1
+            self.invalidations += 1
+            for token in list(self._tokens_by_user.get(user_id, ())):
+                self._remove(token)
+            if publish:
+                self._unpublished.add(user_id)
+
+    def take_unpublished(self) -> Set[str]:
+        """아직 다른 워커에 전달하지 않은 무효화 대상 사용자 ID 를 꺼냅니다."""
+        with self._lock:
+            user_ids, self._unpublished = self._unpublished, set()
+            return user_ids
+
+    def clear(self) -> None:
+        with self._lock:
+            self.epoch += 1
+            self._entries.clear()
+            self._tokens_by_user.clear()
+
+    def stats(self) -> Dict:
+        """항목 수, 적중률, 무효화 수와 DB 조회를 건너뛰어 절약한 시간을 반환합니다."""
+        with self._lock:
+            requests = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / requests if requests else 0.0,
+                "invalidations": self.invalidations,
+                "lookup_ms_avg": self.lookup_seconds_total / self.lookup_count * 1000 if self.lookup_count else 0.0,
+                "saved_ms_total": self.saved_seconds_total * 1000,
+            }
+
+
+class PrincipalInvalidationSync:
+    """
+    워커 간 Principal 무효화 공유
+
+    공유 저장소(redis 또는 LocalSortedSetStore)의 sorted set 에 무효화된 사용자 ID 를
+    시각을 점수로 기록하고, interval 초마다 다른 워커가 기록한 항목을 읽어 로컬 캐시에서 지웁니다.
+    저장소에 연결할 수 없는 동안에는 TTL 이 지나야 변경이 반영됩니다.
+    retention 초보다 오래된 기록은 지웁니다.
+    """
+
+    def __init__(
+            self,
+            cache: PrincipalCache,
+            client,
+            key: str = "principal-invalidations",
+            interval: float = 1.0,
+            retention: float = 300,
+            clock: Callable[[], float] = time.time
+    ):
+        self.cache = cache
+        self.client = client
+        self.key = key
+        self.interval = interval
+        self.retention = retention
+        self.clock = clock
+        self._seen_until = clock()
+        self._task: Optional[asyncio.Task] = None
+
+    async def publish(self) -> int:
+        """
+        로컬에서 무효화한 사용자 ID 를 저장소에 기록합니다.
+
+        Returns:
+            int: 기록한 사용자 수
+        """
+        user_ids = self.cache.take_unpublished()
+        if not user_ids:
+            return 0
+        now = self.clock()
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.zadd(self.key, {user_id: now for user_id in user_ids})
+            pipe.zremrangebyscore(self.key, 0, now - self.retention)
+            pipe.expire(self.key, max(1, int(self.retention)))
+            await pipe.execute()
+        return len(user_ids)
+
+    async def pull(self) -> int:
+        """
+        마지막으로 읽은 뒤 기록된 무효화를 로컬 캐시에 반영합니다.
+        (자신이 기록한 항목도 다시 읽지만 지우기만 하므로 결과는 같습니다.)
+
+        Returns:
+            int: 반영한 사용자 수
+        """
+        now = self.clock()
+        # 같은 시각에 기록된 항목을 놓치지 않도록 경계를 포함해서 읽습니다.
+        entries = await self.client.zrangebyscore(self.key, self._seen_until, now, withscores=True)
+        self._seen_until = now
+        for member, _ in entries:
+            user_id = member.decode() if isinstance(member, bytes) else member
+            self.cache.invalidate_user(user_id, publish=False)
+        return len(entries)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.publish()
+                await self.pull()
+            except Exception:
+                logger.exception("principal cache invalidation sync failed")
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        # 종료 전에 남은 무효화를 전달합니다.
+        await self.publish()
+
+
+# 워커 프로세스 전역 Principal 캐시
+principal_cache = PrincipalCache(settings.PRINCIPAL_CACHE_SIZE, settings.PRINCIPAL_CACHE_TTL_SECONDS)
+
+# 값이 바뀌면 캐시를 무효화하는 User 속성
+PRINCIPAL_ATTRIBUTES = ("role", "is_active")
+
+
+def changed_principals(session: Session) -> Iterable[str]:
+    """세션에서 role/is_active 가 바뀌었거나 삭제될 User 의 ID 를 반환합니다. (flush 전후 모두 사용 가능)"""
+    for obj in session.dirty:
+        if isinstance(obj, User):
+            attrs = inspect(obj).attrs
+            if any(attrs[name].history.has_changes() for name in PRINCIPAL_ATTRIBUTES):
+                yield obj.id
+    for obj in session.deleted:
+        if isinstance(obj, User):
+            yield obj.id
+
+
+# 관리자 도구/스크립트를 포함한 모든 세션의 ORM 변경을 감시합니다.
+# (update(User) 같은 bulk UPDATE 로 role/is_active 를 바꾸면 principal_cache.invalidate_user 를 직접 호출해야 합니다.)
+@event.listens_for(Session, "after_flush")
+def _collect_principal_changes(session, flush_context):
+    changed = set(changed_principals(session))
+    if changed:
+        session.info.setdefault("principal_changes", set()).update(changed)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_principals(session):
+    for user_id in session.info.pop("principal_changes", ()):
+        principal_cache.invalidate_user(user_id)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_principal_changes(session, previous_transaction):
+    session.info.pop("principal_changes", None)
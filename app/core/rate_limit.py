@@ -0,0 +1,252 @@
+import asyncio
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+from typing import Callable, Dict, List, Optional, Tuple
+
+from app.core.settings import RateLimitBackendType, settings
+
+
+class RateLimitBackend(ABC):
+    """
+    슬라이딩 윈도우 요청 제한 카운터 저장소
+
+    키마다 이벤트 시각을 기록하고, 최근 window 초 안의 이벤트 수를 셉니다.
+    고정 윈도우와 달리 윈도우 경계 직전/직후에 몰아서 시도해도 한도가 두 배가 되지 않습니다.
+    """
+
+    @abstractmethod
+    async def hit(self, key: str, window: float) -> int:
+        """
+        이벤트를 하나 기록합니다.
+
+        Args:
+            key: 카운터 키
+            window: 윈도우 길이 (초)
+
+        Returns:
+            int: 이번 이벤트를 포함한 최근 window 초 동안의 이벤트 수
+        """
+
+    @abstractmethod
+    async def count(self, key: str, window: float) -> int:
+        """최근 window 초 동안의 이벤트 수를 반환합니다."""
+
+    @abstractmethod
+    async def reset(self, key: str) -> None:
+        """키의 이벤트를 모두 지웁니다."""
+
+
+class InMemoryRateLimitBackend(RateLimitBackend):
+    """
+    워커 프로세스 메모리에 카운터를 두는 저장소
+
+    DB 나 네트워크 왕복 없이 처리하지만 워커마다 따로 세므로, 실제 한도는 워커 수만큼 늘어납니다.
+    키 수(max_keys)와 키마다 기억하는 이벤트 수(max_events)를 제한해 메모리 사용량을 묶어 둡니다.
+    max_events 보다 많은 이벤트는 max_events 로 세어지므로, 한도는 max_events 이하로 설정해야 합니다.
+    """
+
+    def __init__(
+            self,
+            max_keys: int = 100000,
+            max_events: int = 1000,
+            clock: Callable[[], float] = time.monotonic
+    ):
+        self.max_keys = max_keys
+        self.max_events = max_events
+        self.clock = clock
+        self._events: "OrderedDict[str, deque]" = OrderedDict()
+
+    def _prune(self, key: str, window: float) -> Optional[deque]:
+        events = self._events.get(key)
+        if events is None:
+            return None
+        horizon = self.clock() - window
+        while events and events[0] <= horizon:
+            events.popleft()
+        if not events:
+            del self._events[key]
+            return None
+        return events
+
+    async def hit(self, key: str, window: float) -> int:
+        events = self._prune(key, window)
+        if events is None:
+            events = self._events[key] = deque(maxlen=self.max_events)
+            # 가장 오래 사용하지 않은 키부터 버립니다.
+            while len(self._events) > self.max_keys:
+                self._events.popitem(last=False)
+        self._events.move_to_end(key)
+        events.append(self.clock())
+        return len(events)
+
+    async def count(self, key: str, window: float) -> int:
+        events = self._prune(key, window)
+        return len(events) if events is not None else 0
+
+    async def reset(self, key: str) -> None:
+        self._events.pop(key, None)
+
+
+class StoreRateLimitBackend(RateLimitBackend):
+    """
+    공유 저장소에 카운터를 두는 저장소 (모든 워커가 같은 카운터 사용)
+
+    키마다 이벤트 시각을 점수로 하는 sorted set 을 두고, 오래된 이벤트 삭제/추가/개수 조회/만료 설정을
+    한 번의 트랜잭션 파이프라인(MULTI/EXEC)으로 처리합니다.
+    client 는 redis.asyncio.Redis 또는 같은 명령을 제공하는 LocalSortedSetStore 입니다.
+    """
+
+    def __init__(self, client, prefix: str = "rate-limit:", clock: Callable[[], float] = time.time):
+        self.client = client
+        self.prefix = prefix
+        self.clock = clock
+
+    async def hit(self, key: str, window: float) -> int:
+        now = self.clock()
+        name = self.prefix + key
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.zremrangebyscore(name, 0, now - window)
+            pipe.zadd(name, {f"{now}:{uuid.uuid4().hex}": now})
+            pipe.zcard(name)
+            pipe.expire(name, max(1, int(window) + 1))
+            _, _, count, _ = await pipe.execute()
+        return count
+
+    async def count(self, key: str, window: float) -> int:
+        name = self.prefix + key
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.zremrangebyscore(name, 0, self.clock() - window)
+            pipe.zcard(name)
+            _, count = await pipe.execute()
+        return count
+
+    async def reset(self, key: str) -> None:
+        await self.client.delete(self.prefix + key)
+
+
+class LocalSortedSetStore:
+    """
+    공유 저장소의 프로세스 내 대체 구현 (개발/테스트용)
+
+    StoreRateLimitBackend 가 사용하는 sorted set 명령과 트랜잭션 파이프라인만 구현합니다.
+    이벤트 루프 하나에서만 사용하며, 키 만료는 접근할 때 확인합니다.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.time):
+        self.clock = clock
+        self._sets: Dict[str, Dict[str, float]] = {}
+        self._expires: Dict[str, float] = {}
+        self._lock = asyncio.Lock()
+
+    def _get(self, name: str) -> Dict[str, float]:
+        expires_at = self._expires.get(name)
+        if expires_at is not None and expires_at <= self.clock():
+            self._sets.pop(name, None)
+            self._expires.pop(name, None)
+        return self._sets.setdefault(name, {})
+
+    def _apply(self, command: str, name: str, *args):
+        members = self._get(name)
+        if command == "zremrangebyscore":
+            low, high = args
+            removed = [member for member, score in members.items() if low <= score <= high]
+            for member in removed:
+                del members[member]
+            return len(removed)
+        if command == "zadd":
+            mapping, = args
+            added = len(set(mapping) - set(members))
+            members.update(mapping)
+            return added
+        if command == "zcard":
+            return len(members)
+        if command == "zrangebyscore":
+            low, high = args
+            return sorted(
+                ((member, score) for member, score in members.items() if low <= score <= high),
+                key=lambda item: item[1],
+            )
+        if command == "expire":
+            seconds, = args
+            self._expires[name] = self.clock() + seconds
+            return True
+        raise ValueError(f"unsupported command: {command}")
+
+    def pipeline(self, transaction: bool = True) -> "_LocalPipeline":
+        return _LocalPipeline(self)
+
+    async def zrangebyscore(self, name: str, low: float, high: float, withscores: bool = True) -> list:
+        # withscores=True 형식((member, score) 목록)만 지원합니다.
+        async with self._lock:
+            return self._apply("zrangebyscore", name, low, high)
+
+    async def delete(self, name: str) -> int:
+        async with self._lock:
+            self._expires.pop(name, None)
+            return 1 if self._sets.pop(name, None) is not None else 0
+
+
+class _LocalPipeline:
+    """LocalSortedSetStore 의 트랜잭션 파이프라인 (명령을 모았다가 execute 에서 한 번에 실행)"""
+
+    def __init__(self, store: LocalSortedSetStore):
+        self.store = store
+        self._commands: List[Tuple] = []
+
+    async def __aenter__(self) -> "_LocalPipeline":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self._commands = []
+
+    def zremrangebyscore(self, name: str, low: float, high: float) -> "_LocalPipeline":
+        self._commands.append(("zremrangebyscore", name, low, high))
+        return self
+
+    def zadd(self, name: str, mapping: Dict[str, float]) -> "_LocalPipeline":
+        self._commands.append(("zadd", name, mapping))
+        return self
+
+    def zcard(self, name: str) -> "_LocalPipeline":
+        self._commands.append(("zcard", name))
+        return self
+
+    def expire(self, name: str, seconds: int) -> "_LocalPipeline":
+        self._commands.append(("expire", name, seconds))
+        return self
+
+    async def execute(self) -> list:
+        async with self.store._lock:
+            results = [self.store._apply(*command) for command in self._commands]
+        self._commands = []
+        return results
+
+
+def create_store_client(url: str):
+    """
+    공유 저장소 URL 로 클라이언트를 생성합니다.
+    redis:// 저장소는 redis 패키지가 설치되어 있어야 합니다.
+
+    Args:
+        url: local:// (프로세스 내 대체 저장소) 또는 redis://host:6379/0
+    """
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        try:
+            import redis.asyncio as redis
+        except ImportError as e:
+            raise RuntimeError("공유 저장소로 redis 를 사용하려면 redis 패키지를 설치해야 합니다.") from e
+        return redis.from_url(url)
+    if url.startswith("local://"):
+        return LocalSortedSetStore()
+    raise ValueError(f"지원하지 않는 공유 저장소 URL 입니다: {url}")
+
+
+def create_rate_limit_backend() -> RateLimitBackend:
+    """
+    설정(RATE_LIMIT_BACKEND, RATE_LIMIT_STORE_URL)에 맞는 요청 제한 저장소를 생성합니다.
+    """
+    if settings.RATE_LIMIT_BACKEND == RateLimitBackendType.MEMORY:
+        return InMemoryRateLimitBackend()
+    return StoreRateLimitBackend(create_store_client(settings.RATE_LIMIT_STORE_URL))
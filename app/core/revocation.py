@@ -0,0 +1,266 @@
+import asyncio
+import hashlib
+import logging
+import math
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterable, Optional
+
+from sqlalchemy import delete, event, exists, select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.principal_cache import Principal, changed_principals
+from app.core.settings import settings
+from app.models.revoked_token import RevokedToken
+from app.utils.ids import new_id
+
+logger = logging.getLogger(__name__)
+
+
+class BloomFilter:
+    """
+    문자열 집합의 Bloom filter
+
+    포함 여부를 메모리 비트 배열만으로 확인합니다. 추가한 항목은 항상 포함된다고 답하고,
+    추가하지 않은 항목은 fp_rate 정도의 확률로 잘못 포함된다고 답합니다.
+    항목을 지울 수 없으므로 만료된 항목은 필터를 새로 만들어 정리합니다.
+    """
+
+    def __init__(self, capacity: int, fp_rate: float):
+        capacity = max(1, capacity)
+        self.capacity = capacity
+        self.fp_rate = fp_rate
+        self.size = max(8, math.ceil(-capacity * math.log(fp_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key: str) -> Iterable[int]:
+        # 128 비트 해시 하나를 둘로 나눠 hash_count 개의 위치를 만듭니다. (double hashing)
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hash_count))
+
+    def add(self, key: str) -> None:
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+
+def _utc(timestamp: float) -> datetime:
+    # revoked_tokens 의 시각은 초 단위 UTC naive datetime 으로 저장합니다.
+    return datetime.fromtimestamp(int(timestamp), timezone.utc).replace(tzinfo=None)
+
+
+class TokenRevocationList:
+    """
+    폐기된 액세스/리프레시 토큰 목록 (워커 프로세스 단위)
+
+    revoked_tokens 테이블의 만료되지 않은 항목을 Bloom filter 에 올려 두고,
+    대부분의 요청은 필터만 확인해 DB 를 조회하지 않습니다. 필터에 걸린 토큰만 DB 에서 다시 확인합니다.
+    - 토큰 폐기 (jti): 로그아웃한 액세스 토큰과 그 토큰과 함께 발급된 리프레시 토큰 -> 401
+    - 사용자 단위 폐기: 역할/활성 상태가 바뀐 사용자가 그 전에 발급받은 토큰 -> 클레임 대신 DB 값을 사용
+    이 워커에서 폐기한 항목은 커밋 즉시, 다른 워커의 항목은 sync_seconds 안에 필터에 반영됩니다.
+    """
+
+    def __init__(
+            self,
+            capacity: int,
+            fp_rate: float,
+            sync_seconds: float,
+            clock: Callable[[], float] = time.time
+    ):
+        self.capacity = capacity
+        self.fp_rate = fp_rate
+        self.sync_seconds = sync_seconds
+        self.clock = clock
+        self._filter = BloomFilter(capacity, fp_rate)
+        self._recent: list = []  # 마지막 새로 고침을 시작한 뒤 추가한 키
+        self._task: Optional[asyncio.Task] = None
+        self.synced_at: Optional[float] = None
+        self.checks = 0
+        self.filter_hits = 0
+        self.revoked = 0
+
+    @staticmethod
+    def token_key(token_id: str) -> str:
+        return f"jti:{token_id}"
+
+    @staticmethod
+    def user_key(user_id: str) -> str:
+        return f"user:{user_id}"
+
+    def add(self, key: str) -> None:
+        """필터에 키를 추가합니다. (DB 에 커밋한 뒤 호출)"""
+        self._filter.add(key)
+        self._recent.append(key)
+
+    def revocation_for_user(self, user_id: str, reason: str) -> RevokedToken:
+        """지금까지(같은 초 포함) 발급된 사용자의 모든 토큰을 폐기하는 행을 만듭니다."""
+        now = self.clock()
+        return RevokedToken(
+            id=new_id(),
+            jti=None,
+            user_id=user_id,
+            reason=reason,
+            revoked_at=_utc(now),
+            expires_at=_utc(now + settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60 + 1),
+        )
+
+    async def revoke_token(self, db: AsyncSession, principal: Principal, expires_at: float, reason: str) -> None:
+        """
+        토큰 하나를 폐기하고 커밋합니다.
+        토큰에 리프레시 토큰 ID(session_id)가 있으면 그 리프레시 토큰도 함께 폐기합니다.
+
+        Args:
+            db: 데이터베이스 세션
+            principal: 폐기할 토큰의 Principal (token_id 필요)
+            expires_at: 토큰 만료 시각 (epoch 초, JWT exp)
+            reason: 폐기 사유
+        """
+        now = self.clock()
+        revoked = {principal.token_id: expires_at}
+        if principal.session_id is not None:
+            # 리프레시 토큰의 만료 시각은 액세스 토큰에 없으므로 발급될 수 있는 가장 늦은 만료 시각까지 둡니다.
+            revoked[principal.session_id] = now + settings.REFRESH_TOKEN_EXPIRE_DAYS * 86400
+        db.add_all(
+            RevokedToken(
+                id=new_id(),
+                jti=token_id,
+                user_id=principal.id,
+                reason=reason,
+                revoked_at=_utc(now),
+                expires_at=_utc(token_expires_at + 1),
+            )
+            for token_id, token_expires_at in revoked.items()
+        )
+        await db.commit()
+        for token_id in revoked:
+            self.add(self.token_key(token_id))
+
+    async def is_token_revoked(self, db: AsyncSession, principal: Principal) -> bool:
+        """토큰(jti)이 폐기되었는지 확인합니다. 필터에 걸린 경우에만 DB 를 조회합니다."""
+        if principal.token_id is None:
+            return False
+        return await self.is_jti_revoked(db, principal.token_id)
+
+    async def is_jti_revoked(self, db: AsyncSession, token_id: str) -> bool:
+        """jti 로 액세스/리프레시 토큰이 폐기되었는지 확인합니다. 필터에 걸린 경우에만 DB 를 조회합니다."""
+        self.checks += 1
+        if self.token_key(token_id) not in self._filter:
+            return False
+        self.filter_hits += 1
+        revoked = await db.scalar(select(exists().where(RevokedToken.jti == token_id)))
+        self.revoked += bool(revoked)
+        return bool(revoked)
+
+    async def are_claims_revoked(self, db: AsyncSession, principal: Principal) -> bool:
+        """토큰 발급 이후 사용자의 역할/활성 상태가 바뀌었는지 확인합니다. 필터에 걸린 경우에만 DB 를 조회합니다."""
+        if principal.issued_at is None:
+            return True
+        self.checks += 1
+        if self.user_key(principal.id) not in self._filter:
+            return False
+        self.filter_hits += 1
+        revoked = await db.scalar(select(exists().where(
+            RevokedToken.jti.is_(None),
+            RevokedToken.user_id == principal.id,
+            RevokedToken.revoked_at >= _utc(principal.issued_at),
+        )))
+        self.revoked += bool(revoked)
+        return bool(revoked)
+
+    async def refresh(self, bind: AsyncEngine) -> int:
+        """
+        만료된 행을 지우고, 남은 행으로 필터를 새로 만듭니다.
+
+        Returns:
+            int: 필터에 올린 항목 수
+        """
+        now = _utc(self.clock())
+        recent = self._recent = []
+        async with bind.begin() as conn:
+            await conn.execute(delete(RevokedToken).where(RevokedToken.expires_at <= now))
+            rows = (await conn.execute(
+                select(RevokedToken.jti, RevokedToken.user_id).where(RevokedToken.expires_at > now)
+            )).all()
+
+        # 항목이 예상보다 많아도 오탐률이 유지되도록 크기를 늘립니다.
+        bloom = BloomFilter(max(self.capacity, len(rows) * 2), self.fp_rate)
+        for jti, user_id in rows:
+            bloom.add(self.token_key(jti) if jti is not None else self.user_key(user_id))
+        # 조회하는 동안 이 워커에서 폐기한 항목도 빠뜨리지 않습니다.
+        for key in recent:
+            bloom.add(key)
+        self._filter = bloom
+        self.synced_at = self.clock()
+        return len(rows)
+
+    async def _run(self, bind: AsyncEngine) -> None:
+        while True:
+            try:
+                await self.refresh(bind)
+            except Exception:
+                logger.exception("token revocation sync failed")
+            await asyncio.sleep(self.sync_seconds)
+
+    def start(self, bind: AsyncEngine) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(bind))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> Dict:
+        """필터 크기, 확인 수, 필터 적중 수(DB 조회 수), 실제 폐기 수와 오탐 수를 반환합니다."""
+        return {
+            "entries": self._filter.count,
+            "capacity": self._filter.capacity,
+            "bits": self._filter.size,
+            "hash_count": self._filter.hash_count,
+            "target_fp_rate": self.fp_rate,
+            "checks": self.checks,
+            "filter_hits": self.filter_hits,
+            "revoked": self.revoked,
+            "false_positives": self.filter_hits - self.revoked,
+            "db_check_ratio": self.filter_hits / self.checks if self.checks else 0.0,
+            "synced_seconds_ago": self.clock() - self.synced_at if self.synced_at is not None else None,
+        }
+
+
+# 워커 프로세스 전역 토큰 폐기 목록
+token_revocations = TokenRevocationList(
+    settings.TOKEN_REVOCATION_CAPACITY, settings.TOKEN_REVOCATION_FP_RATE, settings.TOKEN_REVOCATION_SYNC_SECONDS
+)
+
+
+# 역할/활성 상태가 바뀐 사용자의 기존 토큰 클레임은 더 이상 믿을 수 없으므로 같은 트랜잭션에서 폐기 행을 남깁니다.
+@event.listens_for(Session, "before_flush")
+def _revoke_changed_principals(session, flush_context, instances):
+    for user_id in set(changed_principals(session)):
+        if user_id in session.info.setdefault("revoked_users", set()):
+            continue
+        session.add(token_revocations.revocation_for_user(user_id, "principal_changed"))
+        session.info["revoked_users"].add(user_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _add_revoked_users(session):
+    for user_id in session.info.pop("revoked_users", ()):
+        token_revocations.add(token_revocations.user_key(user_id))
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_revoked_users(session, previous_transaction):
+    session.info.pop("revoked_users", None)
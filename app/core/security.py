@@ -4,27 +4,18 @@ from typing import Any, Union
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt
-from passlib.context import CryptContext
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
 from app.core.settings import settings
 from app.models.user import User
+# 비밀번호 해시 정책은 app.utils.security 한 곳에서만 관리합니다.
+from app.utils.security import get_password_hash, pwd_context, verify_password
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/login")
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """비밀번호 검증"""
-    return pwd_context.verify(plain_password, hashed_password)
-
-
-def get_password_hash(password: str) -> str:
-    """비밀번호 해시화"""
-    return pwd_context.hash(password)
-
-
 def create_access_token(data: dict, expires_delta: Union[timedelta, None] = None) -> str:
     """액세스 토큰 생성"""
     to_encode = data.copy()
@@ -56,7 +47,7 @@ def verify_refresh_token(token: str) -> Union[dict, None]:
 
 
 async def get_current_user(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     token: str = Depends(oauth2_scheme)
 ) -> User:
     """현재 인증된 사용자 조회"""
@@ -72,7 +63,8 @@ async def get_current_user(
             raise credentials_exception
     except jwt.JWTError:
         raise credentials_exception
-    user = db.query(User).filter(User.id == user_id).first()
+    result = await db.execute(select(User).where(User.id == user_id))
+    user = result.scalar_one_or_none()
     if user is None:
         raise credentials_exception
     return user 
\ No newline at end of file
@@ -1,6 +1,6 @@
 import os
 from enum import Enum
-from typing import List
+from typing import Dict, List, Optional
 
 from dotenv import load_dotenv
 from pydantic import ConfigDict
@@ -16,6 +16,33 @@ class EnvironmentType(str, Enum):
     TEST = "test"
 
 
+class PoolPrePingStrategy(str, Enum):
+    ALWAYS = "always"  # 커넥션 체크아웃마다 ping (요청마다 추가 왕복)
+    BACKGROUND = "background"  # 유휴 커넥션을 주기적으로 백그라운드에서 점검
+    NONE = "none"  # 점검하지 않음 (pool_recycle 에만 의존)
+
+
+class PrimaryKeyFormat(str, Enum):
+    UUID4_STRING = "uuid4_string"  # 무작위 UUIDv4, CHAR(36) 문자열 저장
+    UUID7_BINARY = "uuid7_binary"  # 시간 순서 UUIDv7, BINARY(16) 저장
+
+
+class WriteBehindOverflow(str, Enum):
+    BLOCK = "block"  # 큐에 자리가 날 때까지 요청이 대기
+    DROP = "drop"  # 새 레코드를 버리고 경고 로그와 카운터만 남김
+
+
+class RateLimitBackendType(str, Enum):
+    MEMORY = "memory"  # 워커 프로세스 메모리 (워커마다 따로 셈)
+    STORE = "store"  # 공유 저장소 (RATE_LIMIT_STORE_URL), 모든 워커가 함께 셈
+
+
+class PortfolioOptimizer(str, Enum):
+    PRICE = "price"  # 선택한 증권의 가격에 비례 (기존 방식, 가격 이력 불필요)
+    MEAN_VARIANCE = "mean_variance"  # 기대수익률 - 위험회피계수 x 분산 최대화 (공매도 없음)
+    RISK_PARITY = "risk_parity"  # 종목별 위험 기여도를 같게
+
+
 class Settings(BaseSettings):
     """
     TODO: 운영 단계에서는 환경 변수 항목들
@@ -33,12 +60,62 @@ class Settings(BaseSettings):
         "mysql+pymysql://user:password@db:3306/balance_one"
     )
 
+    # 커넥션 풀 설정 (uvicorn 워커 프로세스마다 별도의 풀이 생성됩니다)
+    DB_POOL_SIZE: int = 5  # 유지하는 커넥션 수
+    DB_MAX_OVERFLOW: int = 10  # pool_size 를 초과해 임시로 여는 커넥션 수
+    DB_POOL_TIMEOUT: float = 30  # 커넥션 체크아웃 대기 한도 (초)
+    DB_POOL_RECYCLE: int = 3600  # 커넥션 재생성 주기 (초)
+    DB_POOL_PRE_PING: PoolPrePingStrategy = PoolPrePingStrategy.BACKGROUND
+    DB_POOL_LIVENESS_INTERVAL: int = 30  # 백그라운드 점검 주기 (초)
+
+    # 읽기 전용 복제본 설정 (비어 있으면 모든 쿼리가 primary 로 갑니다)
+    DATABASE_REPLICA_URLS: List[str] = []
+    READ_YOUR_WRITES_SECONDS: float = 5.0  # 쓰기 후 해당 사용자의 읽기를 primary 로 보내는 시간 (초)
+
+    # 기본 키 형식 (변경 시 alembic 마이그레이션으로 기존 테이블을 변환해야 합니다)
+    PRIMARY_KEY_FORMAT: PrimaryKeyFormat = PrimaryKeyFormat.UUID4_STRING
+
+    # 감사 로그 write-behind 설정 (워커 프로세스마다 별도의 큐가 생성됩니다)
+    AUDIT_WRITE_BEHIND: bool = True  # False 이면 요청 처리 중에 바로 INSERT
+    AUDIT_BATCH_SIZE: int = 200  # 한 번에 INSERT 하는 최대 레코드 수
+    AUDIT_FLUSH_INTERVAL_MS: int = 100  # 배치가 차지 않아도 INSERT 하는 주기 (ms)
+    AUDIT_QUEUE_SIZE: int = 10000  # 메모리 큐 최대 크기
+    AUDIT_OVERFLOW_POLICY: WriteBehindOverflow = WriteBehindOverflow.BLOCK
+    # 요청 트랜잭션 안에서 바로 기록할 액션 (예: ["advisory_request", "withdraw"])
+    # 자문 요청은 요청/추천과 감사 로그를 한 트랜잭션으로 기록하므로 기본으로 포함합니다.
+    AUDIT_SYNC_ACTIONS: List[str] = ["advisory_request"]
+
+    # 감사 로그 보관 설정 (MySQL 에서는 audit_logs 를 월 단위 파티션으로 관리합니다)
+    AUDIT_RETENTION_MONTHS: int = 12  # DB 에 보관하는 개월 수 (이번 달 포함), 이전 달은 파일로 옮김
+    AUDIT_ARCHIVE_DIR: str = "archive/audit_logs"  # 압축 NDJSON 보관 디렉토리
+    AUDIT_ARCHIVE_CHUNK_SIZE: int = 10000  # 보관 시 한 번에 읽는 행 수
+    AUDIT_PARTITION_MONTHS_AHEAD: int = 3  # 미리 만들어 두는 미래 파티션 개월 수
+    AUDIT_EXPORT_CHUNK_SIZE: int = 1000  # 내보내기 시 서버 측 커서에서 한 번에 읽는 행 수
+    AUDIT_COUNT_CAP: int = 10000  # 감사 로그 건수 조회 시 정확히 세는 최대 행 수
+
+    # 활성 증권 스냅샷 (워커 메모리, data_versions 의 stocks 버전이 바뀌면 다시 읽음)
+    STOCK_UNIVERSE_CHECK_SECONDS: float = 1.0  # DB 버전을 확인하는 최소 간격 (초), 다른 워커의 변경이 늦게 반영되는 최대 시간
+
+    # 자문 추천 결과 캐시 (워커 메모리, 키: 스냅샷 버전 + 포트폴리오 유형 + 원 단위 잔고)
+    RECOMMENDATION_CACHE_SIZE: int = 4096  # 워커마다 기억하는 결과 수, 0 이면 사용하지 않음
+    RECOMMENDATION_CACHE_TTL_SECONDS: float = 300  # 항목 유효 시간 (초)
+
+    # 자문 일괄 생성 (관리자 API / app.scripts.advisory_batch)
+    ADVISORY_BATCH_CHUNK_SIZE: int = 1000  # 한 번에 계산하고 INSERT 하는 사용자 수
+    ADVISORY_BATCH_WORKERS: int = 0  # 스크립트에서 수량 계산에 사용하는 프로세스 수, 0 이면 현재 프로세스의 스레드 풀
+
+    # 포트폴리오 비중 계산 (증권 선택은 그대로, 선택한 증권에 나눠 담는 비중만 정함)
+    PORTFOLIO_OPTIMIZERS: Dict[str, PortfolioOptimizer] = {}  # 유형별 방식 (예: {"conservative": "risk_parity"}), 없으면 price
+    OPTIMIZER_LOOKBACK_DAYS: int = 365  # 수익률/공분산 계산에 사용하는 일별 종가 기간 (일)
+    OPTIMIZER_MIN_OBSERVATIONS: int = 60  # 필요한 최소 일별 수익률 수, 모자라면 price 방식으로 계산
+    OPTIMIZER_BUDGET_MS: float = 20  # 비중 계산 시간 한도 (ms), 넘으면 그때까지의 비중 사용
+
     # JWT 설정
     SECRET_KEY: str = os.getenv("SECRET_KEY", "your-secret-key-here")
     REFRESH_SECRET_KEY: str = os.getenv("REFRESH_SECRET_KEY", "your-refresh-secret-key-here")
 
     ALGORITHM: str = "HS256"
-    ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    ACCESS_TOKEN_EXPIRE_MINUTES: int = 15  # 역할/활성 상태 클레임이 늦게 반영될 수 있는 최대 시간이므로 짧게 유지
     ACCESS_TOKEN_EXPIRE_DAYS: int = 1  # 기존 ACCESS_TOKEN_EXPIRE_DAYS 대체
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
 
@@ -47,8 +124,34 @@ class Settings(BaseSettings):
 
     # 보안 설정
     PASSWORD_MIN_LENGTH: int = 8
-    MAX_LOGIN_ATTEMPTS: int = 5
-    LOGIN_TIMEOUT_MINUTES: int = 30
+    MAX_LOGIN_ATTEMPTS: int = 5  # 같은 IP 에서 한 계정에 허용하는 로그인 실패 횟수
+    LOGIN_IP_MAX_ATTEMPTS: int = 20  # 한 IP 에 허용하는 로그인 실패 횟수 (계정 무관)
+    LOGIN_TIMEOUT_MINUTES: int = 30  # 로그인 실패를 세는 슬라이딩 윈도우 (분)
+
+    # 비밀번호 해시/검증 스레드 풀 (bcrypt 가 이벤트 루프를 막지 않도록 분리)
+    PASSWORD_HASH_WORKERS: int = 4  # 동시에 실행하는 해시/검증 수, 0 이면 이벤트 루프에서 바로 실행
+    PASSWORD_HASH_QUEUE_SIZE: int = 64  # 대기열 한도, 넘으면 503 으로 바로 거절
+
+    # bcrypt 작업량(rounds) 정책 (지정하지 않으면 시작 시 목표 검증 시간에 맞춰 보정)
+    PASSWORD_HASH_ROUNDS: Optional[int] = None  # 고정 rounds (예: 12), 지정하면 보정 생략
+    PASSWORD_HASH_TARGET_MS: float = 250  # 보정 시 목표 검증 시간 (ms)
+    PASSWORD_HASH_MIN_ROUNDS: int = 10  # 보정 결과와 관계없는 최소 rounds
+    PASSWORD_HASH_MAX_ROUNDS: int = 16  # 보정 결과와 관계없는 최대 rounds
+
+    # 요청 제한 카운터 저장소
+    RATE_LIMIT_BACKEND: RateLimitBackendType = RateLimitBackendType.MEMORY
+    RATE_LIMIT_STORE_URL: str = "local://"  # local:// (프로세스 내 대체 저장소) 또는 redis://host:6379/0
+
+    # 인증 주체(principal) 캐시 (토큰 -> id/role/is_active, 적중 시 인증 단계에서 DB 를 조회하지 않음)
+    PRINCIPAL_CACHE_SIZE: int = 10000  # 워커마다 기억하는 토큰 수, 0 이면 사용하지 않음
+    PRINCIPAL_CACHE_TTL_SECONDS: float = 30  # 항목 유효 시간 (초), 다른 워커의 변경이 늦게 반영되는 최대 시간
+    PRINCIPAL_CACHE_SYNC: bool = False  # True 이면 RATE_LIMIT_STORE_URL 저장소로 워커 간 무효화를 공유
+    PRINCIPAL_CACHE_SYNC_INTERVAL: float = 1.0  # 무효화 공유 주기 (초)
+
+    # 액세스 토큰 폐기 목록 (워커 메모리의 Bloom filter, 필터에 걸린 토큰만 DB 에서 확인)
+    TOKEN_REVOCATION_CAPACITY: int = 100000  # 필터 크기를 정하는 예상 폐기 항목 수
+    TOKEN_REVOCATION_FP_RATE: float = 0.001  # 목표 오탐률 (오탐이면 DB 를 한 번 더 조회)
+    TOKEN_REVOCATION_SYNC_SECONDS: float = 5.0  # revoked_tokens 테이블에서 필터를 다시 만드는 주기 (초)
 
     model_config = ConfigDict(
         case_sensitive=True,
@@ -0,0 +1,171 @@
+import asyncio
+import logging
+import threading
+from typing import Dict, List, Optional
+
+from sqlalchemy import Table, insert
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.settings import WriteBehindOverflow
+
+logger = logging.getLogger(__name__)
+
+# 종료 시 큐에 넣는 표식
+_STOP = object()
+
+
+class WriteBehindBuffer:
+    """
+    write-behind 배치 INSERT 버퍼
+
+    요청 처리 경로에서는 레코드를 메모리 큐에 넣기만 하고, 백그라운드 작업이
+    batch_size 건이 모이거나 flush_interval_ms 가 지나면 executemany 로 한 번에 INSERT 합니다.
+    큐가 가득 차면 overflow 정책에 따라 자리가 날 때까지 기다리거나(BLOCK)
+    새 레코드를 버립니다(DROP). 큐는 워커 프로세스 메모리에 있으므로
+    프로세스가 비정상 종료되면 아직 기록하지 못한 레코드는 유실됩니다.
+    """
+
+    def __init__(
+            self,
+            name: str,
+            table: Table,
+            engine: AsyncEngine,
+            batch_size: int = 200,
+            flush_interval_ms: int = 100,
+            max_queue: int = 10000,
+            overflow: WriteBehindOverflow = WriteBehindOverflow.BLOCK,
+            max_retries: int = 3
+    ):
+        self.name = name
+        self.table = table
+        self.engine = engine
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000
+        self.max_queue = max_queue
+        self.overflow = overflow
+        self.max_retries = max_retries
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._lock = threading.Lock()
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self.batches = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self) -> None:
+        """백그라운드 INSERT 작업을 시작합니다. (애플리케이션 시작 시)"""
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._task = asyncio.create_task(self._run(), name=f"write-behind-{self.name}")
+
+    async def stop(self) -> None:
+        """큐에 남은 레코드를 모두 기록한 뒤 작업을 종료합니다. (애플리케이션 종료 시)"""
+        if not self.running:
+            return
+        await self._queue.put(_STOP)
+        await self._task
+        self._task = None
+
+    async def put(self, record: Dict) -> bool:
+        """
+        레코드를 큐에 넣습니다.
+
+        Args:
+            record: 테이블 컬럼 이름을 키로 하는 값. 한 배치의 레코드는 모두 같은 키를 가져야 합니다.
+
+        Returns:
+            bool: 큐에 넣었으면 True, DROP 정책으로 버렸으면 False
+        """
+        if self.overflow == WriteBehindOverflow.DROP:
+            try:
+                self._queue.put_nowait(record)
+            except asyncio.QueueFull:
+                with self._lock:
+                    self.dropped += 1
+                logger.warning("%s write-behind queue is full, dropping record", self.name)
+                return False
+        else:
+            await self._queue.put(record)
+        with self._lock:
+            self.enqueued += 1
+        return True
+
+    async def flush(self) -> None:
+        """지금까지 큐에 넣은 레코드가 모두 기록될 때까지 기다립니다."""
+        if self.running:
+            await self._queue.join()
+
+    def stats(self) -> Dict:
+        """큐 상태와 누적 처리 수를 반환합니다."""
+        with self._lock:
+            return {
+                "name": self.name,
+                "running": self.running,
+                "queued": self._queue.qsize() if self._queue is not None else 0,
+                "max_queue": self.max_queue,
+                "enqueued": self.enqueued,
+                "written": self.written,
+                "dropped": self.dropped,
+                "failed": self.failed,
+                "batches": self.batches,
+            }
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            item = await self._queue.get()
+            if item is _STOP:
+                self._queue.task_done()
+                break
+
+            batch = [item]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(self._queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+                if item is _STOP:
+                    self._queue.task_done()
+                    stopping = True
+                    break
+                batch.append(item)
+
+            await self._write(batch)
+            for _ in batch:
+                self._queue.task_done()
+
+    async def _write(self, batch: List[Dict]) -> None:
+        for attempt in range(1, self.max_retries + 1):
+            try:
+                async with self.engine.begin() as conn:
+                    await conn.execute(insert(self.table), batch)
+            except Exception:
+                logger.exception(
+                    "%s write-behind insert failed (attempt %d/%d, %d records)",
+                    self.name, attempt, self.max_retries, len(batch)
+                )
+                await asyncio.sleep(0.1 * attempt)
+                continue
+            with self._lock:
+                self.written += len(batch)
+                self.batches += 1
+            return
+
+        # 재시도해도 실패한 레코드는 로그로 남겨 수동으로 복구할 수 있게 합니다.
+        with self._lock:
+            self.failed += len(batch)
+        logger.error("%s write-behind dropped %d records after retries: %r", self.name, len(batch), batch)
@@ -1,10 +1,73 @@
 # fastapi 
+import asyncio
+import contextlib
+import logging
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.core.settings import settings
+from app.core.database import LAST_WRITE_HEADER, engine, read_your_writes_middleware, replica_engines
+from app.core.pool import run_liveness_checks
+from app.core.principal_cache import PrincipalInvalidationSync, principal_cache
+from app.core.rate_limit import create_store_client
+from app.core.revocation import token_revocations
+from app.core.settings import PoolPrePingStrategy, settings
 from app.models import *  # 모든 모델 import
 from app.api.endpoints import auth, account, advisory, admin
+from app.utils.audit import audit_sink
+from app.utils.login_attempts import login_attempt_sink
+from app.utils.pagination import NEXT_CURSOR_HEADER
+from app.utils.security import configure_password_policy_from_settings, password_hasher
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app_: FastAPI):
+    """애플리케이션 시작/종료 시 백그라운드 작업과 커넥션 풀을 관리합니다."""
+    # 이 서버에서 목표 검증 시간에 맞는 bcrypt rounds 를 정합니다. (PASSWORD_HASH_ROUNDS 지정 시 그 값)
+    rounds = await asyncio.to_thread(configure_password_policy_from_settings)
+    logger.info("password hash policy: bcrypt rounds=%d", rounds)
+
+    if settings.AUDIT_WRITE_BEHIND:
+        await audit_sink.start()
+        await login_attempt_sink.start()
+
+    # revoked_tokens 테이블을 주기적으로 읽어 토큰 폐기 필터를 새로 만듭니다.
+    token_revocations.start(engine)
+
+    # 다른 워커에서 바뀐 사용자 권한/활성 상태를 인증 주체 캐시에 반영합니다.
+    principal_sync = None
+    if settings.PRINCIPAL_CACHE_SYNC and principal_cache.enabled:
+        principal_sync = PrincipalInvalidationSync(
+            principal_cache,
+            create_store_client(settings.RATE_LIMIT_STORE_URL),
+            interval=settings.PRINCIPAL_CACHE_SYNC_INTERVAL,
+        )
+        principal_sync.start()
+
+    liveness_task = None
+    if settings.DB_POOL_PRE_PING == PoolPrePingStrategy.BACKGROUND:
+        liveness_task = asyncio.create_task(
+            run_liveness_checks([engine, *replica_engines], settings.DB_POOL_LIVENESS_INTERVAL)
+        )
+
+    yield
+
+    if liveness_task is not None:
+        liveness_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await liveness_task
+    if principal_sync is not None:
+        await principal_sync.stop()
+    await token_revocations.stop()
+    # 큐에 남은 감사 로그와 로그인 시도 기록을 모두 기록한 뒤 커넥션 풀을 닫습니다.
+    await audit_sink.stop()
+    await login_attempt_sink.stop()
+    password_hasher.shutdown()
+    for engine_ in (engine, *replica_engines):
+        await engine_.dispose()
 
 
 def create_app() -> FastAPI:
@@ -14,9 +77,13 @@ def create_app() -> FastAPI:
         version=settings.VERSION,
         docs_url=None if settings.ENVIRONMENT == "production" else "/docs",
         redoc_url=None if settings.ENVIRONMENT == "production" else "/redoc",
-        openapi_url=f"{settings.API_V1_STR}/openapi.json"
+        openapi_url=f"{settings.API_V1_STR}/openapi.json",
+        lifespan=lifespan
     )
 
+    # 쓰기 응답에 마지막 쓰기 시각을 담아 다른 워커로 간 다음 읽기도 primary 에서 처리하도록 합니다.
+    app_.middleware("http")(read_your_writes_middleware)
+
     # CORS 설정
     app_.add_middleware(
         CORSMiddleware,
@@ -24,6 +91,7 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=[NEXT_CURSOR_HEADER, LAST_WRITE_HEADER],
     )
 
     # 라우터 등록
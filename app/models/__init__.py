@@ -3,9 +3,11 @@ from app.core.database import Base
 from app.models.common import CommonModel
 from app.models.deposit_withdrawal import DepositWithdrawal, DepositWithdrawalType, DepositWithdrawalStatus
 from app.models.user import User
-from app.models.stock import Stock, UserStock, AdvisoryRequest, AdvisoryRecommendation
+from app.models.stock import Stock, UserStock, StockPrice, AdvisoryRequest, AdvisoryRecommendation
 from app.models.audit import AuditLog
 from app.models.login_attempt import LoginAttempt
+from app.models.revoked_token import RevokedToken
+from app.models.data_version import DataVersion
 
 __all__ = [
     "Base",
@@ -16,8 +18,11 @@ __all__ = [
     "User",
     "Stock",
     "UserStock",
+    "StockPrice",
     "AdvisoryRequest",
     "AdvisoryRecommendation",
     "AuditLog",
     "LoginAttempt",
+    "RevokedToken",
+    "DataVersion",
 ]
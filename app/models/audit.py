@@ -1,9 +1,11 @@
-from sqlalchemy import Column, String, DateTime, JSON, ForeignKey
+from sqlalchemy import Column, Computed, Numeric, String, DateTime, JSON, Index
 from sqlalchemy.orm import relationship, declarative_base
 from sqlalchemy.sql import func
 
 from app.core.database import Base
 from .common import CommonModel
+from .types import UUIDKey, json_number
+from app.utils.ids import new_id
 
 
 class AuditLog(Base):
@@ -13,14 +15,31 @@ class AuditLog(Base):
 
     """
     __tablename__ = "audit_logs"
+    __table_args__ = (
+        # 관리자 감사 로그 목록 (최신순, id 는 커서 페이지네이션의 동순위 정렬 키)
+        Index("ix_audit_logs_created_at_id", "created_at", "id"),
+        # 관리자 감사 로그 검색 (조건 일치 후 최신순)
+        Index("ix_audit_logs_user_id_created_at_id", "user_id", "created_at", "id"),
+        Index("ix_audit_logs_action_created_at_id", "action", "created_at", "id"),
+        Index("ix_audit_logs_ip_address_created_at_id", "ip_address", "created_at", "id"),
+        Index("ix_audit_logs_details_amount", "details_amount"),
+    )
 
-    id = Column(String(36), primary_key=True, index=True, comment="UUID 형식의 고유 식별자")
-    user_id = Column(String(36), ForeignKey("users.id"), nullable=True, comment="행위를 수행한 사용자 ID (시스템 로그의 경우 Null)")
+    id = Column(UUIDKey(), primary_key=True, default=new_id, comment="UUID 형식의 고유 식별자")
+    # MySQL 파티션 테이블은 외래 키를 지원하지 않으므로 관계만 ORM 에서 정의합니다.
+    user_id = Column(UUIDKey(), nullable=True, comment="행위를 수행한 사용자 ID (시스템 로그의 경우 Null)")
     action = Column(String(50), nullable=False, comment="수행된 행위 유형 (예: 로그인, 입금, 자문 요청)")
     details = Column(JSON, comment="행위에 대한 상세 정보")
+    # 자주 검색하는 details 키는 인덱스를 둘 수 있도록 가상 생성 컬럼으로 꺼내 둡니다.
+    details_amount = Column(
+        Numeric(20, 2, asdecimal=False),
+        Computed(json_number(details, "$.amount"), persisted=False),
+        comment="details.amount (가상 생성 컬럼)"
+    )
     ip_address = Column(String(45), comment="행위 발생 IP 주소.")
     user_agent = Column(String(255), comment="사용자 브라우저/클라이언트 정보")
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), comment="생성 일시")
+    # 월 단위 파티션 키 (MySQL 기본 키는 (id, created_at))
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, comment="생성 일시")
 
-    user = relationship("User", back_populates="audit_logs")
+    user = relationship("User", primaryjoin="foreign(AuditLog.user_id) == User.id", back_populates="audit_logs")
 
@@ -1,9 +1,10 @@
 from sqlalchemy import Column, Boolean, Integer, String , DateTime, func
-import uuid
 
 from sqlalchemy.orm import declarative_base
 
 from app.core.database import Base
+from app.models.types import UUIDKey
+from app.utils.ids import new_id
 
 
 class CommonModel(Base):
@@ -13,7 +14,7 @@ class CommonModel(Base):
     """
     __abstract__ = True
 
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()), index=True, comment="UUID 형식의 고유 식별자")
+    id = Column(UUIDKey(), primary_key=True, default=new_id, comment="UUID 형식의 고유 식별자")
     # id = Column(Integer, primary_key=True, index=True)
     is_active = Column(Boolean, default=True, comment="레코드 활성화 상태")
     created_at = Column(DateTime(timezone=True), server_default=func.now(), comment="생성 일시")
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, String, BigInteger
+
+from .common import CommonModel
+
+
+class DataVersion(CommonModel):
+    """
+    데이터 묶음의 버전 카운터를 저장하는 테이블
+    워커가 메모리에 올려 둔 스냅샷(예: 활성 증권 목록)이 최신인지 이 값만 읽어 확인합니다.
+    해당 데이터를 바꾸는 트랜잭션에서 version 을 1 올립니다.
+    """
+    __tablename__ = "data_versions"
+
+    name = Column(String(50), unique=True, nullable=False, comment="데이터 이름 (예: stocks)")
+    version = Column(BigInteger, nullable=False, default=0, comment="변경될 때마다 1 씩 증가하는 버전")
@@ -1,11 +1,12 @@
 import enum
 
-from sqlalchemy import Column, String, Float, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, String, Float, DateTime, ForeignKey, Enum, Index
 from sqlalchemy.orm import relationship, validates, declarative_base
 from sqlalchemy.sql import func
 
 from app.core.database import Base
 from app.models.common import CommonModel
+from app.models.types import UUIDKey
 
 
 class DepositWithdrawalType(str, enum.Enum):
@@ -28,8 +29,12 @@ class DepositWithdrawal(CommonModel):
     사용자의 입금/출금 내역을 관리합니다.
     """
     __tablename__ = "deposit_withdrawals"
+    __table_args__ = (
+        # 사용자별 거래 내역 (최신순, id 는 커서 페이지네이션의 동순위 정렬 키)
+        Index("ix_deposit_withdrawals_user_id_created_at_id", "user_id", "created_at", "id"),
+    )
 
-    user_id = Column(String(36), ForeignKey("users.id"), nullable=False, comment="사용자 ID")
+    user_id = Column(UUIDKey(), ForeignKey("users.id"), nullable=False, comment="사용자 ID")
     type = Column(Enum(DepositWithdrawalType), nullable=False, comment="입출금 유형 (입금/출금)")
     amount = Column(Float, nullable=False, comment="금액 (원화)")
     status = Column(Enum(DepositWithdrawalStatus), nullable=False, default=DepositWithdrawalStatus.PENDING,
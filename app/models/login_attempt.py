@@ -1,9 +1,10 @@
-from sqlalchemy import Column, String, DateTime, Integer, ForeignKey, Boolean
+from sqlalchemy import Column, String, DateTime, Integer, ForeignKey, Boolean, Index
 from sqlalchemy.orm import relationship, declarative_base
 from sqlalchemy.sql import func
 
 from app.core.database import Base
 from .common import CommonModel
+from .types import UUIDKey
 
 
 class LoginAttempt(CommonModel):
@@ -12,8 +13,12 @@ class LoginAttempt(CommonModel):
     사용자의 로그인 시도 기록과 디바이스 정보를 관리합니다.
     """
     __tablename__ = "login_attempts"
+    __table_args__ = (
+        # IP 별 최근 로그인 실패 기록 조회
+        Index("ix_login_attempts_ip_success_last_attempt", "ip_address", "is_successful", "last_attempt_at"),
+    )
 
-    user_id = Column(String(36), ForeignKey("users.id"), nullable=True, comment="사용자 ID")
+    user_id = Column(UUIDKey(), ForeignKey("users.id"), nullable=True, comment="사용자 ID")
     ip_address = Column(String(45), nullable=False, comment="로그인 시도 IP 주소")
     user_agent = Column(String(255), nullable=False, comment="사용자 브라우저/클라이언트 정보")
     is_successful = Column(Boolean, nullable=False, comment="로그인 성공 여부")
@@ -0,0 +1,24 @@
+from sqlalchemy import Column, String, DateTime, Index
+
+from .common import CommonModel
+from .types import UUIDKey
+
+
+class RevokedToken(CommonModel):
+    """
+    폐기된 액세스/리프레시 토큰을 저장하는 테이블
+    jti 가 있으면 해당 토큰 하나를, 없으면 revoked_at 이전(같은 초 포함)에 발급된 사용자의 모든 토큰을 폐기합니다.
+    expires_at 이 지난 행은 해당 토큰이 모두 만료되었으므로 지워도 됩니다.
+    """
+    __tablename__ = "revoked_tokens"
+    __table_args__ = (
+        # 사용자 단위 폐기 확인 (jti IS NULL AND user_id = ? AND revoked_at >= ?)
+        Index("ix_revoked_tokens_user_id_revoked_at", "user_id", "revoked_at"),
+    )
+
+    jti = Column(String(64), nullable=True, index=True, comment="폐기한 토큰 ID (없으면 사용자 단위 폐기)")
+    # 삭제된 사용자의 토큰도 폐기할 수 있도록 외래 키를 두지 않습니다.
+    user_id = Column(UUIDKey(), nullable=False, comment="사용자 ID")
+    reason = Column(String(50), nullable=False, comment="폐기 사유 (logout, principal_changed)")
+    revoked_at = Column(DateTime, nullable=False, comment="폐기 시각 (UTC, 초 단위)")
+    expires_at = Column(DateTime, nullable=False, index=True, comment="폐기 대상 토큰이 모두 만료되는 시각 (UTC)")
@@ -1,10 +1,11 @@
-from sqlalchemy import Column, String, Float, DateTime, ForeignKey, Integer, Enum, func
+from sqlalchemy import Column, String, Float, Date, DateTime, ForeignKey, Integer, Enum, Index, UniqueConstraint, func
 from sqlalchemy.orm import relationship, Session, declarative_base
 from sqlalchemy.sql import func as sql_func
 
 from app.core.database import Base
 from app.utils.constant.globals import TransactionType, AdvisoryStatus, PortfolioType
 from app.models.common import CommonModel
+from app.models.types import UUIDKey
 
 
 class Stock(CommonModel):
@@ -13,6 +14,10 @@ class Stock(CommonModel):
     거래소에 상장된 모든 증권의 기본 정보를 관리합니다.
     """
     __tablename__ = "stocks"
+    __table_args__ = (
+        # 자문 계산 시 활성 증권 목록 조회
+        Index("ix_stocks_is_active", "is_active"),
+    )
 
     code = Column(String(20), unique=True, index=True, nullable=False, comment="증권 거래소 코드 (예: 005930)")
     name = Column(String(255), nullable=False, comment="증권명 (예: 삼성전자)")
@@ -242,9 +247,13 @@ class UserStock(CommonModel):
     각 사용자가 보유한 증권의 수량과 평균 매수가를 관리합니다.
     """
     __tablename__ = "user_stocks"
+    __table_args__ = (
+        # 사용자별 보유 증권 조회 (user_id 로 시작하므로 단독 조회에도 사용됩니다)
+        UniqueConstraint("user_id", "stock_id", name="uq_user_stocks_user_id_stock_id"),
+    )
 
-    user_id = Column(String(36), ForeignKey("users.id"), nullable=False, comment="사용자 ID")
-    stock_id = Column(String(36), ForeignKey("stocks.id"), nullable=False, comment="증권 ID")
+    user_id = Column(UUIDKey(), ForeignKey("users.id"), nullable=False, comment="사용자 ID")
+    stock_id = Column(UUIDKey(), ForeignKey("stocks.id"), nullable=False, comment="증권 ID")
     quantity = Column(Integer, nullable=False, comment="보유 수량")
     average_price = Column(Float, nullable=False, comment="평균 매수가")
 
@@ -252,14 +261,35 @@ class UserStock(CommonModel):
     stock = relationship("Stock", back_populates="users")
 
 
+class StockPrice(CommonModel):
+    """
+    증권의 일별 종가 이력을 저장하는 테이블
+    포트폴리오 비중 계산(평균-분산, 위험 균형)의 수익률과 공분산을 이 이력으로 계산합니다.
+    행을 바꾸면 활성 증권 스냅샷 버전이 올라가 계산 결과 캐시가 함께 갱신됩니다.
+    """
+    __tablename__ = "stock_prices"
+    __table_args__ = (
+        # 종목별 기간 조회 (stock_id IN (...) AND trade_date >= ?)
+        UniqueConstraint("stock_id", "trade_date", name="uq_stock_prices_stock_id_trade_date"),
+    )
+
+    stock_id = Column(UUIDKey(), ForeignKey("stocks.id"), nullable=False, comment="증권 ID")
+    trade_date = Column(Date, nullable=False, comment="거래일")
+    close_price = Column(Float, nullable=False, comment="종가")
+
+
 class AdvisoryRequest(CommonModel):
     """
     사용자의 자문 요청 정보를 저장하는 테이블
     포트폴리오 자문 요청의 상태와 결과를 관리합니다.
     """
     __tablename__ = "advisory_requests"
+    __table_args__ = (
+        # 사용자별 자문 요청 목록 (최신순, id 는 커서 페이지네이션의 동순위 정렬 키)
+        Index("ix_advisory_requests_user_id_created_at_id", "user_id", "created_at", "id"),
+    )
 
-    user_id = Column(String(36), ForeignKey("users.id"), nullable=False, comment="사용자 ID")
+    user_id = Column(UUIDKey(), ForeignKey("users.id"), nullable=False, comment="사용자 ID")
     portfolio_type = Column(Enum(PortfolioType), nullable=False, comment="포트폴리오 유형")
     status = Column(String(20), nullable=False, comment="자문 상태 (대기/완료/실패)")
 
@@ -273,9 +303,13 @@ class AdvisoryRecommendation(CommonModel):
     각 자문 요청에 대한 구체적인 증권 추천 내용을 관리합니다.
     """
     __tablename__ = "advisory_recommendations"
+    __table_args__ = (
+        # 자문 요청별 추천 목록
+        Index("ix_advisory_recommendations_advisory_request_id", "advisory_request_id"),
+    )
 
-    advisory_request_id = Column(String(36), ForeignKey("advisory_requests.id"), nullable=False, comment="자문 요청 ID")
-    stock_id = Column(String(36), ForeignKey("stocks.id"), nullable=False, comment="추천 증권 ID")
+    advisory_request_id = Column(UUIDKey(), ForeignKey("advisory_requests.id"), nullable=False, comment="자문 요청 ID")
+    stock_id = Column(UUIDKey(), ForeignKey("stocks.id"), nullable=False, comment="추천 증권 ID")
     quantity = Column(Integer, nullable=False, comment="추천 수량")
     price_at_time = Column(Float, nullable=False, comment="추천 시점의 주가")
     total_investment = Column(Float, nullable=False, comment="총 투자금액")
@@ -0,0 +1,68 @@
+import uuid
+
+from sqlalchemy import BINARY, Numeric, String
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+from sqlalchemy.types import TypeDecorator
+
+from app.core.settings import PrimaryKeyFormat, settings
+
+
+class UUIDKey(TypeDecorator):
+    """
+    기본 키/외래 키용 UUID 컬럼 타입
+
+    애플리케이션에서는 항상 36자 UUID 문자열로 다루고, 저장 형식은
+    PRIMARY_KEY_FORMAT 설정에 따라 CHAR(36) 문자열 또는 BINARY(16) 입니다.
+    BINARY(16) 은 InnoDB 클러스터드 인덱스와 이를 참조하는 모든 외래 키/보조
+    인덱스의 크기를 절반 이하로 줄입니다.
+    """
+    impl = String(36)
+    cache_ok = True
+
+    def __init__(self, binary: bool = None):
+        super().__init__()
+        if binary is None:
+            binary = settings.PRIMARY_KEY_FORMAT == PrimaryKeyFormat.UUID7_BINARY
+        self.binary = binary
+
+    def load_dialect_impl(self, dialect):
+        if self.binary:
+            return dialect.type_descriptor(BINARY(16))
+        return dialect.type_descriptor(String(36))
+
+    def process_bind_param(self, value, dialect):
+        if value is None or not self.binary:
+            return value
+        if isinstance(value, uuid.UUID):
+            return value.bytes
+        return uuid.UUID(value).bytes
+
+    def process_result_value(self, value, dialect):
+        if value is None or not self.binary:
+            return value
+        return str(uuid.UUID(bytes=bytes(value)))
+
+
+class json_number(FunctionElement):
+    """
+    JSON 컬럼에서 숫자 값을 꺼내는 식 (생성 컬럼용)
+
+    json_number(details, "$.amount") 처럼 사용하며, 키가 없거나 숫자가 아니면 NULL 입니다.
+    MySQL 은 JSON_VALUE ... RETURNING DECIMAL, 그 밖의 데이터베이스는 json_extract 로 컴파일됩니다.
+    """
+    type = Numeric(20, 2, asdecimal=False)
+    name = "json_number"
+    inherit_cache = True
+
+
+@compiles(json_number)
+def _compile_json_number(element, compiler, **kw):
+    column, path = element.clauses
+    return f"json_extract({compiler.process(column, **kw)}, {compiler.process(path, **kw)})"
+
+
+@compiles(json_number, "mysql")
+def _compile_json_number_mysql(element, compiler, **kw):
+    column, path = element.clauses
+    return f"JSON_VALUE({compiler.process(column, **kw)}, {compiler.process(path, **kw)} RETURNING DECIMAL(20, 2))"
@@ -45,7 +45,7 @@ class User(CommonModel):
     stocks = relationship("UserStock", back_populates="user")
     deposit_withdrawals = relationship("DepositWithdrawal", back_populates="user")
     advisory_requests = relationship("AdvisoryRequest", back_populates="user")
-    audit_logs = relationship("AuditLog", back_populates="user")
+    audit_logs = relationship("AuditLog", primaryjoin="User.id == foreign(AuditLog.user_id)", back_populates="user")
     login_attempts = relationship("LoginAttempt", back_populates="user", cascade="all, delete-orphan")
 
     def __repr__(self):
@@ -4,6 +4,7 @@ from sqlalchemy.sql import func
 
 from app.core.database import Base
 from app.models.common import CommonModel
+from app.models.types import UUIDKey
 
 
 class UserStock(CommonModel):
@@ -13,8 +14,8 @@ class UserStock(CommonModel):
     """
     __tablename__ = "user_stocks"
 
-    user_id = Column(String(36), ForeignKey("users.id"), nullable=False, comment="사용자 ID")
-    stock_id = Column(String(36), ForeignKey("stocks.id"), nullable=False, comment="주식 ID")
+    user_id = Column(UUIDKey(), ForeignKey("users.id"), nullable=False, comment="사용자 ID")
+    stock_id = Column(UUIDKey(), ForeignKey("stocks.id"), nullable=False, comment="주식 ID")
     quantity = Column(Integer, nullable=False, default=0, comment="보유 수량")
     average_price = Column(Float, nullable=False, default=0.0, comment="평균 매수가")
     created_at = Column(DateTime(timezone=True), server_default=func.now(), comment="생성 일시")
@@ -24,3 +24,8 @@ class AuditLogInDB(AuditLogBase):
 
 class AuditLog(AuditLogInDB):
     pass
+
+
+class AuditLogCount(BaseModel):
+    count: int
+    exact: bool  # False 이면 추정치이거나 상한(AUDIT_COUNT_CAP)에서 멈춘 값
@@ -0,0 +1,61 @@
+"""
+자문 일괄 생성 작업
+
+포트폴리오 유형이 있는 활성 사용자 전체의 자문 요청과 추천을 한 번에 생성합니다.
+증권 스냅샷은 한 번만 읽고, 수량은 --chunk-size 명씩 한 번에 계산해 bulk INSERT 합니다.
+--workers 를 지정하면 수량 계산을 프로세스 풀에 나눠 실행합니다. cron 등으로 매일 실행하는 것을 전제로 합니다.
+
+    python -m app.scripts.advisory_batch
+    python -m app.scripts.advisory_batch --portfolio-type aggressive balanced --chunk-size 5000 --workers 4
+"""
+import argparse
+import asyncio
+import logging
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+project_root = str(Path(__file__).parent.parent.parent)
+sys.path.append(project_root)
+
+from app.core.database import AsyncSessionLocal, engine
+from app.core.settings import settings
+from app.models.user import PortfolioType
+from app.utils.advisory_batch import run_advisory_batch
+from app.utils.audit import log_system_action
+
+
+async def run(portfolio_types, chunk_size: int, workers: int) -> dict:
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 0 else None
+    try:
+        async with AsyncSessionLocal() as db:
+            summary = await run_advisory_batch(db, portfolio_types, chunk_size=chunk_size, executor=executor)
+            await log_system_action(db, "advisory_batch", summary)
+        return summary
+    finally:
+        if executor is not None:
+            executor.shutdown()
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "--portfolio-type", nargs="+", choices=[t.value for t in PortfolioType], help="대상 포트폴리오 유형 (기본: 전체)"
+    )
+    parser.add_argument("--chunk-size", type=int, default=settings.ADVISORY_BATCH_CHUNK_SIZE, help="한 번에 계산하고 INSERT 하는 사용자 수")
+    parser.add_argument("--workers", type=int, default=settings.ADVISORY_BATCH_WORKERS, help="수량 계산 프로세스 수 (0 이면 현재 프로세스의 스레드 풀)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    portfolio_types = [PortfolioType(value) for value in args.portfolio_type] if args.portfolio_type else None
+    summary = asyncio.run(run(portfolio_types, args.chunk_size, args.workers))
+    print(
+        f"users={summary['users']} requests={summary['requests']} recommendations={summary['recommendations']} "
+        f"skipped={summary['skipped']} elapsed={summary['elapsed_ms']}ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+감사 로그 보관 작업
+
+보관 기간(AUDIT_RETENTION_MONTHS)이 지난 달의 감사 로그를 gzip 압축 NDJSON 파일로 내보낸 뒤
+DB 에서 지웁니다. MySQL 파티션 테이블이면 해당 월 파티션을 DROP 하고, 미래 파티션을 미리 만듭니다.
+cron 등으로 매일 실행하는 것을 전제로 하며, 여러 번 실행해도 안전합니다.
+
+    python -m app.scripts.archive_audit_logs
+    python -m app.scripts.archive_audit_logs --retention-months 6 --archive-dir /var/lib/balance-one/audit
+"""
+import argparse
+import logging
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+project_root = str(Path(__file__).parent.parent.parent)
+sys.path.append(project_root)
+
+from app.core.database import sync_engine
+from app.core.settings import settings
+from app.utils.audit_archive import run_retention
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--retention-months", type=int, default=settings.AUDIT_RETENTION_MONTHS, help="DB 에 보관하는 개월 수")
+    parser.add_argument("--archive-dir", default=settings.AUDIT_ARCHIVE_DIR, help="보관 파일 디렉토리")
+    parser.add_argument("--chunk-size", type=int, default=settings.AUDIT_ARCHIVE_CHUNK_SIZE, help="한 번에 읽는 행 수")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    archived = run_retention(
+        sync_engine,
+        datetime.now(),
+        args.retention_months,
+        args.archive_dir,
+        chunk_size=args.chunk_size,
+        months_ahead=settings.AUDIT_PARTITION_MONTHS_AHEAD,
+    )
+    for entry in archived:
+        print(f"{entry['month']}: {entry['rows']} rows -> {entry['path']}")
+    if not archived:
+        print("보관할 감사 로그가 없습니다.")
+
+
+if __name__ == "__main__":
+    main()
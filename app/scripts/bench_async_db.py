@@ -0,0 +1,125 @@
+"""
+동기 세션 vs 비동기 세션 동시 처리량 벤치마크
+
+`async def` 핸들러 안에서 동기 Session 으로 쿼리하던 기존 방식(이벤트 루프 블로킹)과
+AsyncSession 으로 쿼리하는 방식을 같은 동시성 조건에서 비교합니다.
+
+기본값은 임시 SQLite 파일이며, 느린 쿼리를 흉내 내기 위해 `sleep_ms()` 함수를 등록합니다.
+MySQL 로 측정하려면 `--url mysql+pymysql://...` 을 넘기면 `SLEEP()` 을 사용합니다.
+
+    python -m app.scripts.bench_async_db --requests 200 --concurrency 50 --query-ms 10
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+project_root = str(Path(__file__).parent.parent.parent)
+sys.path.append(project_root)
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import to_async_url, to_sync_url
+
+
+def _register_sleep(dbapi_connection, connection_record) -> None:
+    """SQLite 연결에 밀리초 단위 sleep 함수를 등록합니다."""
+    dbapi_connection.create_function("sleep_ms", 1, lambda ms: time.sleep(ms / 1000) or 0)
+
+
+def _slow_query(url: str, query_ms: int):
+    if url.startswith("sqlite"):
+        return text("SELECT sleep_ms(:ms)").bindparams(ms=query_ms)
+    return text("SELECT SLEEP(:s)").bindparams(s=query_ms / 1000)
+
+
+async def _run(handler, total: int, concurrency: int) -> dict:
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            started = time.perf_counter()
+            await handler()
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "throughput": total / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+    }
+
+
+async def bench(url: str, total: int, concurrency: int, query_ms: int, pool_size: int) -> None:
+    query = _slow_query(url, query_ms)
+
+    # 기존 방식: async def 안에서 동기 세션 사용
+    sync_engine = create_engine(to_sync_url(url), pool_size=pool_size)
+    if url.startswith("sqlite"):
+        event.listen(sync_engine, "connect", _register_sleep)
+    SessionLocal = sessionmaker(bind=sync_engine)
+
+    async def blocking_handler():
+        db = SessionLocal()
+        try:
+            db.execute(query)
+        finally:
+            db.close()
+
+    # 변경 방식: AsyncSession 사용
+    async_engine = create_async_engine(to_async_url(url), pool_size=pool_size)
+    if url.startswith("sqlite"):
+        event.listen(async_engine.sync_engine, "connect", _register_sleep)
+    AsyncSessionLocal = async_sessionmaker(bind=async_engine)
+
+    async def async_handler():
+        async with AsyncSessionLocal() as db:
+            await db.execute(query)
+
+    # 워밍업 (연결 풀 채우기)
+    await _run(blocking_handler, pool_size, pool_size)
+    await _run(async_handler, pool_size, pool_size)
+
+    before = await _run(blocking_handler, total, concurrency)
+    after = await _run(async_handler, total, concurrency)
+
+    print(f"requests={total} concurrency={concurrency} query={query_ms}ms pool_size={pool_size}")
+    for name, result in (("sync Session (before)", before), ("AsyncSession (after)", after)):
+        print(
+            f"{name:<24} {result['throughput']:8.1f} req/s  "
+            f"p50={result['p50_ms']:7.1f}ms  p95={result['p95_ms']:7.1f}ms"
+        )
+    print(f"speedup: {after['throughput'] / before['throughput']:.2f}x")
+
+    sync_engine.dispose()
+    await async_engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default=None, help="데이터베이스 URL (기본값: 임시 SQLite 파일)")
+    parser.add_argument("--requests", type=int, default=200, help="총 요청 수")
+    parser.add_argument("--concurrency", type=int, default=50, help="동시 요청 수")
+    parser.add_argument("--query-ms", type=int, default=10, help="쿼리 1건의 지연 시간 (ms)")
+    parser.add_argument("--pool-size", type=int, default=5, help="연결 풀 크기")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = args.url or f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        asyncio.run(bench(url, args.requests, args.concurrency, args.query_ms, args.pool_size))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+로그인 + 조회 혼합 트래픽 벤치마크 (bcrypt 이벤트 루프 실행 vs 전용 스레드 풀)
+
+API 앱을 그대로 띄워 로그인 요청과 /balance 조회를 동시에 보내고,
+비밀번호 검증을 이벤트 루프에서 바로 실행할 때와 PasswordHasher 스레드 풀에서 실행할 때의
+/balance 지연 시간(p50/p99)과 로그인 처리량을 비교합니다.
+데이터베이스 URL 은 앱 엔진 생성 전에 정해져야 하므로 앱 모듈은 함수 안에서 import 합니다.
+
+    python -m app.scripts.bench_login_mix --seconds 10 --logins 8 --readers 8
+    python -m app.scripts.bench_login_mix --workers 2 --queue 4  # 대기열 포화 시 503 확인
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+project_root = str(Path(__file__).parent.parent.parent)
+sys.path.append(project_root)
+
+PASSWORD = "bench-password"
+
+
+async def _run(client, emails: list, headers: list, seconds: float, logins: int, readers: int) -> dict:
+    read_latencies = []
+    login_statuses = Counter()
+    deadline = time.perf_counter() + seconds
+
+    async def login_loop(i: int):
+        while time.perf_counter() < deadline:
+            response = await client.post(
+                "/api/v1/login", data={"username": emails[i % len(emails)], "password": PASSWORD}
+            )
+            login_statuses[response.status_code] += 1
+
+    async def read_loop(i: int):
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            response = await client.get("/api/v1/balance", headers=headers[i % len(headers)])
+            read_latencies.append(time.perf_counter() - started)
+            assert response.status_code == 200, response.text
+
+    await asyncio.gather(*(login_loop(i) for i in range(logins)), *(read_loop(i) for i in range(readers)))
+
+    read_latencies.sort()
+    return {
+        "logins_per_s": login_statuses[200] / seconds,
+        "login_statuses": dict(login_statuses),
+        "reads_per_s": len(read_latencies) / seconds,
+        "p50_ms": statistics.median(read_latencies) * 1000,
+        "p99_ms": read_latencies[int(len(read_latencies) * 0.99) - 1] * 1000,
+    }
+
+
+async def bench(seconds: float, logins: int, readers: int, workers: int, queue: int) -> None:
+    import httpx
+
+    from app.core.database import AsyncSessionLocal, Base, engine
+    from app.main import app
+    from app.models.user import User
+    from app.utils.audit import audit_sink
+    from app.utils.ids import new_id
+    from app.utils.login_attempts import login_attempt_sink
+    from app.utils.security import PasswordHasher, create_access_token, get_password_hash
+    from app.utils import security
+    import app.api.endpoints.auth as auth_endpoints
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    hashed = get_password_hash(PASSWORD)
+    users = [User(id=new_id(), email=f"bench-{i}@example.com", hashed_password=hashed, balance=0.0) for i in range(20)]
+    async with AsyncSessionLocal() as db:
+        db.add_all(users)
+        await db.commit()
+    emails = [user.email for user in users]
+    headers = [{"Authorization": f"Bearer {create_access_token(data={'sub': user.id})}"} for user in users]
+
+    await audit_sink.start()
+    await login_attempt_sink.start()
+    print(f"seconds={seconds} logins={logins} readers={readers} workers={workers} queue={queue} "
+          f"dialect={engine.dialect.name}")
+    results = {}
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        for name, hasher in (
+            ("event loop (before)", PasswordHasher(0, 0)),
+            ("thread pool (after)", PasswordHasher(workers, queue)),
+        ):
+            auth_endpoints.password_hasher = security.password_hasher = hasher
+            results[name] = await _run(client, emails, headers, seconds, logins, readers)
+            results[name]["hasher"] = hasher.stats()
+            hasher.shutdown()
+    await login_attempt_sink.stop()
+    await audit_sink.stop()
+
+    for name, result in results.items():
+        print(
+            f"{name:<20} /balance {result['reads_per_s']:7.1f} req/s  "
+            f"p50={result['p50_ms']:7.1f}ms  p99={result['p99_ms']:7.1f}ms  |  "
+            f"login {result['logins_per_s']:6.1f}/s  statuses={result['login_statuses']}"
+        )
+    print(f"hasher: {results['thread pool (after)']['hasher']}")
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default=None, help="데이터베이스 URL (기본값: 임시 SQLite 파일)")
+    parser.add_argument("--seconds", type=float, default=10, help="모드별 측정 시간 (초)")
+    parser.add_argument("--logins", type=int, default=8, help="동시 로그인 요청 수")
+    parser.add_argument("--readers", type=int, default=8, help="동시 /balance 조회 수")
+    parser.add_argument("--workers", type=int, default=4, help="해시 스레드 수")
+    parser.add_argument("--queue", type=int, default=64, help="해시 대기열 한도")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = args.url or f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        os.environ["DB_POOL_PRE_PING"] = "none"
+        asyncio.run(bench(args.seconds, args.logins, args.readers, args.workers, args.queue))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+자문 증권 선택 마이크로벤치마크 (리스트 반복 선택 vs 가격대별 순위 색인)
+
+무작위 증권 유니버스(10 ~ 100,000 종목)에서 포트폴리오 유형별 가격대 선택을
+기존 방식(후보 리스트를 매번 만들고 max/index/pop 반복)과 RankingIndex(가격대별 정렬 목록의 앞부분 읽기)로
+각각 실행해 시간을 비교하고, 두 방식이 같은 증권을 같은 순서로 고르는지 확인합니다.
+순위 색인은 만드는 시간과 종목 하나를 바꿔 넣는 시간, 종목 하나가 바뀐 새 스냅샷을 만드는 시간
+(UniverseSnapshot.with_changes 를 연달아 실행한 평균, 이전 스냅샷과 공유하는 부분의 정리 비용 포함)도 측정합니다.
+가중치가 같은 증권이 섞이도록 일부 가중치를 반올림합니다.
+
+    python -m app.scripts.bench_portfolio
+    python -m app.scripts.bench_portfolio --sizes 3000 100000 --repeat 20
+"""
+import argparse
+import random
+import sys
+import time
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Callable, Dict, List, Sequence
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+project_root = str(Path(__file__).parent.parent.parent)
+sys.path.append(project_root)
+
+from app.models.user import PortfolioType
+from app.utils.portfolio import PRICE_TIERS
+from app.utils.universe import RankingIndex, UniverseSnapshot
+
+
+@dataclass(eq=False)
+class BenchStock:
+    """ 벤치마크용 증권 (ORM 객체처럼 동일성으로 비교) """
+    id: str
+    current_price: float
+    market_cap: float
+    volume: int
+    change_rate: float
+    is_active: bool = True
+
+
+def random_stocks(n: int, seed: int = 0) -> List[BenchStock]:
+    rng = random.Random(seed)
+    stocks = []
+    for i in range(n):
+        price = round(10 ** rng.uniform(3, 6.3), -1)  # 1천원 ~ 200만원
+        volume = rng.randint(1_000, 50_000_000)
+        market_cap = float(round(10 ** rng.uniform(10, 14.7), -8))
+        if i % 7 == 0:  # 가중치가 같은 증권
+            volume, market_cap = 1_000_000, 1e12
+        stocks.append(BenchStock(f"{i:06d}", price, market_cap, volume, rng.uniform(-5, 5)))
+    return stocks
+
+
+def legacy_select(stocks: Sequence, tiers: Sequence[Dict]) -> list:
+    """ 기존 calculate_portfolio 의 가격대별 선택 방식 """
+    selected_stocks = []
+    for price_range in tiers:
+        max_price = price_range["max_price"]
+        count = price_range["count"]
+
+        candidate_stocks = [
+            stock for stock in stocks
+            if stock.current_price <= max_price and stock not in selected_stocks
+        ]
+
+        if candidate_stocks:
+            weights = [
+                (stock.market_cap * stock.volume)
+                for stock in candidate_stocks
+            ]
+
+            for _ in range(min(count, len(candidate_stocks))):
+                if not weights:
+                    break
+                selected_idx = weights.index(max(weights))
+                selected_stocks.append(candidate_stocks[selected_idx])
+                weights.pop(selected_idx)
+                candidate_stocks.pop(selected_idx)
+    return selected_stocks
+
+
+def _best_ms(fn: Callable, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 3000, 10000, 100000], help="종목 수")
+    parser.add_argument("--repeat", type=int, default=5, help="측정 반복 횟수 (가장 짧은 시간 사용)")
+    args = parser.parse_args()
+
+    print(
+        f"{'stocks':>7}  {'type':<12}  {'legacy ms':>10}  {'index ms':>9}  {'build ms':>9}  {'update us':>9}  "
+        f"{'snapshot us':>11}"
+    )
+    for n in args.sizes:
+        stocks = random_stocks(n)
+        # 가격대별 목록은 처음 조회할 때 만들어지므로 선택까지 포함해 측정합니다.
+        build_ms = _best_ms(lambda: RankingIndex(stocks).select(PRICE_TIERS[PortfolioType.AGGRESSIVE]), args.repeat)
+        index = RankingIndex(stocks)
+        for portfolio_type in PortfolioType:
+            tiers = PRICE_TIERS[portfolio_type]
+            expected = [stock.id for stock in legacy_select(stocks, tiers)]
+            assert index.select(tiers) == expected, f"index mismatch: n={n} {portfolio_type.value}"
+
+        # 가격/거래량이 바뀐 종목을 색인에 다시 넣는 시간 (모든 가격대 목록을 만든 뒤, 종목당)
+        changed = [
+            replace(stock, current_price=stock.current_price * 1.01, volume=stock.volume + 1) for stock in stocks[:100]
+        ]
+        update_us = _best_ms(lambda: [index.upsert(stock) for stock in changed], args.repeat) * 1000 / max(1, len(changed))
+
+        # 종목 하나씩 바뀐 새 스냅샷을 연달아 만드는 시간 (모든 가격대 목록을 만든 뒤, 스냅샷당)
+        snapshot = UniverseSnapshot(0, stocks)
+        for portfolio_type in PortfolioType:
+            snapshot.ranking.select(PRICE_TIERS[portfolio_type])
+
+        def apply_changes() -> None:
+            latest = snapshot
+            for stock in changed:
+                latest = latest.with_changes(latest.version + 1, {stock.id: stock})
+
+        snapshot_us = _best_ms(apply_changes, args.repeat) * 1000 / max(1, len(changed))
+
+        for portfolio_type in PortfolioType:
+            tiers = PRICE_TIERS[portfolio_type]
+            legacy_ms = _best_ms(lambda: legacy_select(stocks, tiers), args.repeat)
+            # 색인은 매번 만들지 않으므로 선택 시간만 비교합니다.
+            index_ms = _best_ms(lambda: index.select(tiers), args.repeat)
+            print(
+                f"{n:>7}  {portfolio_type.value:<12}  {legacy_ms:>10.3f}  {index_ms:>9.3f}  "
+                f"{build_ms:>9.2f}  {update_us:>9.1f}  {snapshot_us:>11.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
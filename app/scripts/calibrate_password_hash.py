@@ -0,0 +1,43 @@
+"""
+bcrypt rounds 보정 도구
+
+이 서버에서 rounds 별 해시 시간을 측정하고, 목표 검증 시간을 넘지 않는 가장 큰 rounds 를 추천합니다.
+애플리케이션은 시작할 때 같은 방식으로 보정하며, 워커마다 결과가 달라지지 않게 하려면
+추천 값을 PASSWORD_HASH_ROUNDS 환경 변수로 고정합니다.
+
+    python -m app.scripts.calibrate_password_hash
+    python -m app.scripts.calibrate_password_hash --target-ms 100 --max-rounds 14
+"""
+import argparse
+import sys
+from pathlib import Path
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+project_root = str(Path(__file__).parent.parent.parent)
+sys.path.append(project_root)
+
+from app.core.settings import settings
+from app.utils.security import calibrate_bcrypt_rounds, measure_bcrypt_seconds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target-ms", type=float, default=settings.PASSWORD_HASH_TARGET_MS, help="목표 검증 시간 (ms)")
+    parser.add_argument("--min-rounds", type=int, default=settings.PASSWORD_HASH_MIN_ROUNDS, help="최소 rounds")
+    parser.add_argument("--max-rounds", type=int, default=settings.PASSWORD_HASH_MAX_ROUNDS, help="최대 rounds")
+    args = parser.parse_args()
+
+    print(f"{'rounds':>6}  {'hash ms':>9}")
+    for rounds in range(args.min_rounds, args.max_rounds + 1):
+        seconds = measure_bcrypt_seconds(rounds)
+        print(f"{rounds:>6}  {seconds * 1000:>9.1f}")
+        # 목표의 두 배를 넘으면 더 큰 rounds 는 측정하지 않습니다.
+        if seconds * 1000 > args.target_ms * 2:
+            break
+
+    rounds = calibrate_bcrypt_rounds(args.target_ms, args.min_rounds, args.max_rounds)
+    print(f"\n추천: PASSWORD_HASH_ROUNDS={rounds} (목표 {args.target_ms:.0f}ms)")
+
+
+if __name__ == "__main__":
+    main()
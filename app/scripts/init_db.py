@@ -5,14 +5,14 @@ from pathlib import Path
 project_root = str(Path(__file__).parent.parent.parent)
 sys.path.append(project_root)
 
-from app.core.database import SessionLocal, engine, Base
+from app.core.database import SessionLocal, sync_engine, Base
 from app.models import Stock
 
 
 def init_db() -> None:
     """데이터베이스를 초기화하고 시드 데이터를 생성합니다."""
     # 테이블 생성
-    Base.metadata.create_all(bind=engine)
+    Base.metadata.create_all(bind=sync_engine)
 
     db = SessionLocal()
     try:
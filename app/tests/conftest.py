@@ -0,0 +1,74 @@
+import uuid
+
+import httpx
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.database import Base, get_db
+from app.main import app
+from app.models.user import User
+from app.utils.optimizer import portfolio_optimizer
+from app.utils.recommendation_cache import recommendation_cache
+from app.utils.security import create_access_token
+from app.utils.universe import stock_universe
+
+
+@pytest.fixture
+def anyio_backend():
+    """ 비동기 테스트는 asyncio 백엔드에서 실행합니다. """
+    return "asyncio"
+
+
+@pytest.fixture
+async def engine(tmp_path):
+    """ 테스트마다 새 SQLite 파일 데이터베이스를 생성하는 픽스처 """
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    # 워커 전역 증권 스냅샷과 추천 결과/비중은 이전 테스트의 데이터베이스에서 만든 것이므로 버립니다.
+    stock_universe.invalidate()
+    recommendation_cache.clear()
+    portfolio_optimizer.clear()
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+def session_factory(engine):
+    """ 테스트 데이터베이스에 바인딩된 세션 팩토리 """
+    return async_sessionmaker(bind=engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+
+@pytest.fixture
+async def client(session_factory):
+    """ 테스트 데이터베이스를 사용하는 API 클라이언트 픽스처 """
+    async def override_get_db():
+        async with session_factory() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = override_get_db
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as c:
+        yield c
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture
+async def user(session_factory):
+    """ 잔고가 있는 테스트 사용자를 생성하는 픽스처 """
+    async with session_factory() as db:
+        user = User(
+            id=str(uuid.uuid4()),
+            email=f"user-{uuid.uuid4().hex[:8]}@example.com",
+            hashed_password="not-used",
+            is_active=True,
+            balance=10_000_000.0,
+        )
+        db.add(user)
+        await db.commit()
+    return user
+
+
+def auth_headers(user: User) -> dict:
+    """ 사용자의 액세스 토큰을 헤더 형식으로 변환하는 헬퍼 함수 """
+    token = create_access_token(data={"sub": user.id})
+    return {"Authorization": f"Bearer {token}"}
@@ -0,0 +1,117 @@
+import random
+import threading
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pytest
+from sqlalchemy import select
+
+from app.models.stock import AdvisoryRecommendation, AdvisoryRequest, Stock
+from app.models.user import PortfolioType, User
+from app.utils import advisory_batch
+from app.utils.advisory_batch import allocate, run_advisory_batch
+from app.utils.ids import new_id
+from app.utils.portfolio import BALANCE_RATIOS, portfolio_from_snapshot, select_stocks, validate_portfolio
+from app.utils.universe import stock_universe
+
+pytestmark = pytest.mark.anyio
+
+
+async def seed_stocks(db) -> None:
+    seed = Stock.get_seed_data()
+    for stock in seed:
+        stock.id = new_id()
+    db.add_all(seed)
+    await db.commit()
+
+
+def expected_portfolio(snapshot, balance, portfolio_type):
+    """ 사용자 한 명씩 계산한 기존 결과 (유효하지 않으면 빈 목록) """
+    recommendations = portfolio_from_snapshot(snapshot, balance, portfolio_type)
+    is_valid, _ = validate_portfolio(recommendations, balance)
+    return [(rec["stock_id"], rec["quantity"]) for rec in recommendations] if is_valid else []
+
+
+async def test_allocate_matches_per_user_calculation(session_factory):
+    """ 한 번에 계산한 수량이 사용자별 calculate 와 검증 결과와 같은지 확인합니다. (유효하지 않은 잔고 포함) """
+    rng = random.Random(0)
+    balances = [0.0, 50_000.0, 399_999.0, 1_000_000.5] + [round(10 ** rng.uniform(5, 9), 2) for _ in range(500)]
+    async with session_factory() as db:
+        await seed_stocks(db)
+        snapshot = await stock_universe.get(db)
+
+    for portfolio_type in PortfolioType:
+        stocks = select_stocks(snapshot, portfolio_type)
+        prices = np.array([stock.current_price for stock in stocks])
+        quantities = allocate(prices, np.array(balances), BALANCE_RATIOS[portfolio_type])
+
+        for balance, row in zip(balances, quantities.tolist()):
+            actual = [(stock.id, quantity) for stock, quantity in zip(stocks, row) if quantity > 0]
+            assert actual == expected_portfolio(snapshot, balance, portfolio_type)
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+async def test_batch_inserts_requests_for_cohort(session_factory, workers):
+    """ 포트폴리오 유형이 있는 활성 사용자만 대상으로 하고, 묶음마다 사용자별 결과와 같은 행을 넣는지 확인합니다. """
+    balances = {PortfolioType.AGGRESSIVE: 20_000_000, PortfolioType.BALANCED: 7_500_000, PortfolioType.CONSERVATIVE: 1_000}
+    async with session_factory() as db:
+        await seed_stocks(db)
+        users = [
+            User(id=str(uuid.uuid4()), email=f"{i}@example.com", hashed_password="not-used",
+                 balance=balances[portfolio_type] + i, portfolio_type=portfolio_type)
+            for i, portfolio_type in enumerate(list(PortfolioType) * 3)
+        ]
+        users.append(User(id=str(uuid.uuid4()), email="none@example.com", hashed_password="not-used", balance=1e7))
+        users.append(User(id=str(uuid.uuid4()), email="off@example.com", hashed_password="not-used", balance=1e7,
+                          portfolio_type=PortfolioType.AGGRESSIVE, is_active=False))
+        db.add_all(users)
+        await db.commit()
+
+        executor = ProcessPoolExecutor(max_workers=workers) if workers else None
+        try:
+            summary = await run_advisory_batch(db, chunk_size=2, executor=executor)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        snapshot = await stock_universe.get(db)
+        requests = (await db.execute(select(AdvisoryRequest))).scalars().all()
+        rows = (await db.execute(select(AdvisoryRecommendation))).scalars().all()
+
+    assert (summary["users"], summary["requests"], summary["skipped"]) == (9, 6, 3)
+    assert summary["recommendations"] == len(rows)
+    by_request = {}
+    for row in rows:
+        by_request.setdefault(row.advisory_request_id, []).append(row)
+    for request in requests:
+        user = next(user for user in users if user.id == request.user_id)
+        actual = sorted((row.stock_id, row.quantity) for row in by_request[request.id])
+        assert actual == sorted(expected_portfolio(snapshot, user.balance, user.portfolio_type))
+        assert request.status == "completed"
+
+
+async def test_batch_allocates_off_the_event_loop_in_user_id_order(session_factory, monkeypatch):
+    """ executor 가 없어도 수량 계산은 이벤트 루프 밖에서 실행하고, 사용자는 ID 순으로 묶는지 확인합니다. """
+    calls = []
+
+    def recording_allocate(prices, balances, balance_ratio, weights=None):
+        calls.append((threading.get_ident(), balances.tolist()))
+        return allocate(prices, balances, balance_ratio, weights)
+
+    monkeypatch.setattr(advisory_batch, "allocate", recording_allocate)
+    async with session_factory() as db:
+        await seed_stocks(db)
+        users = [
+            User(id=str(uuid.uuid4()), email=f"{i}@example.com", hashed_password="not-used",
+                 balance=20_000_000 + i, portfolio_type=PortfolioType.AGGRESSIVE)
+            for i in range(5)
+        ]
+        db.add_all(users)
+        await db.commit()
+
+        await run_advisory_batch(db, [PortfolioType.AGGRESSIVE], chunk_size=2)
+
+    assert all(thread != threading.get_ident() for thread, _ in calls)
+    ordered = [user.balance for user in sorted(users, key=lambda user: user.id)]
+    assert [balances for _, balances in calls] == [ordered[:2], ordered[2:4], ordered[4:]]
@@ -0,0 +1,125 @@
+import pytest
+from sqlalchemy import event, select
+
+from app.core.write_behind import WriteBehindBuffer
+from app.models.audit import AuditLog
+from app.models.stock import Stock
+from app.utils import audit
+from app.utils.ids import new_id
+from app.utils.security import access_token_claims, create_access_token
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def queries(engine):
+    """ 실행한 SQL 문 """
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    yield statements
+    event.remove(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+
+@pytest.fixture
+async def stocks(session_factory):
+    async with session_factory() as db:
+        seed = Stock.get_seed_data()
+        for stock in seed:
+            stock.id = new_id()
+        db.add_all(seed)
+        await db.commit()
+    return seed
+
+
+def headers_for(user) -> dict:
+    return {"Authorization": f"Bearer {create_access_token(data=access_token_claims(user))}"}
+
+
+async def create_requests(client, user, count: int) -> None:
+    for portfolio_type in (["aggressive", "balanced", "conservative"] * count)[:count]:
+        response = await client.post("/api/v1/request", json={"portfolio_type": portfolio_type}, headers=headers_for(user))
+        assert response.status_code == 200, response.text
+
+
+async def test_create_request_reads_stocks_from_snapshot(client, user, stocks, queries):
+    """ 자문 요청 생성 응답의 증권 정보는 추천마다 stocks 를 조회하지 않는지 확인합니다. """
+    await create_requests(client, user, 1)
+    queries.clear()
+
+    response = await client.post("/api/v1/request", json={"portfolio_type": "aggressive"}, headers=headers_for(user))
+
+    assert response.status_code == 200
+    recommendations = response.json()["recommendations"]
+    assert len(recommendations) > 1
+    assert all(rec["stock"]["id"] == rec["stock_id"] for rec in recommendations)
+    assert not [statement for statement in queries if "FROM stocks" in statement]
+
+
+@pytest.mark.parametrize("path", ["/api/v1/requests", "/api/v1/requests/{id}"])
+async def test_advisory_reads_use_constant_queries(client, user, stocks, queries, path):
+    """ 자문 요청 조회의 쿼리 수가 요청/추천 수와 관계없이 같은지 확인합니다. """
+    counts = []
+    for count in (1, 6):
+        await create_requests(client, user, count)
+        listed = await client.get("/api/v1/requests", params={"limit": 10}, headers=headers_for(user))
+        queries.clear()
+
+        response = await client.get(path.format(id=listed.json()[0]["id"]), params={"limit": 10}, headers=headers_for(user))
+
+        assert response.status_code == 200
+        body = response.json()
+        for request in body if isinstance(body, list) else [body]:
+            assert request["recommendations"]
+            assert all(rec["stock"]["id"] == rec["stock_id"] for rec in request["recommendations"])
+        counts.append(len(queries))
+
+    assert counts[0] == counts[1] <= 3
+
+
+async def test_create_request_writes_in_one_transaction(client, engine, user, stocks, queries):
+    """ 자문 요청 생성은 추천 수와 관계없이 같은 수의 쿼리와 한 번의 커밋으로 기록되는지 확인합니다. """
+    commits = []
+
+    def on_commit(conn):
+        commits.append(conn)
+
+    event.listen(engine.sync_engine, "commit", on_commit)
+    try:
+        await create_requests(client, user, 1)
+        counts = []
+        for portfolio_type in ("aggressive", "conservative"):
+            queries.clear()
+            commits.clear()
+            response = await client.post("/api/v1/request", json={"portfolio_type": portfolio_type}, headers=headers_for(user))
+            assert response.status_code == 200
+            counts.append(len(queries))
+            assert len(commits) == 1
+    finally:
+        event.remove(engine.sync_engine, "commit", on_commit)
+
+    assert counts[0] == counts[1]
+    created = response.json()
+    detail = (await client.get(f"/api/v1/requests/{created['id']}", headers=headers_for(user))).json()
+    assert sorted(rec["id"] for rec in detail["recommendations"]) == sorted(rec["id"] for rec in created["recommendations"])
+    assert len(created["recommendations"]) == 3
+
+
+async def test_create_request_audit_skips_write_behind(client, engine, session_factory, user, stocks, monkeypatch):
+    """ write-behind 버퍼가 실행 중이어도 자문 요청의 감사 로그는 요청과 같은 커밋으로 기록되는지 확인합니다. """
+    buffer = WriteBehindBuffer("audit_logs", AuditLog.__table__, engine, flush_interval_ms=60000)
+    monkeypatch.setattr(audit, "audit_sink", buffer)
+    await buffer.start()
+    try:
+        response = await client.post("/api/v1/request", json={"portfolio_type": "balanced"}, headers=headers_for(user))
+        assert response.status_code == 200
+    finally:
+        await buffer.stop()
+
+    async with session_factory() as db:
+        logs = (await db.execute(select(AuditLog))).scalars().all()
+    assert [(log.action, log.user_id) for log in logs] == [("advisory_request", user.id)]
+    assert buffer.stats()["enqueued"] == 0
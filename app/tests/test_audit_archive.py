@@ -0,0 +1,110 @@
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import create_engine, func, insert, select
+
+from app.core.database import Base
+from app.core.settings import settings
+from app.models.audit import AuditLog
+from app.models.user import UserRole
+from app.tests.conftest import auth_headers
+from app.utils.audit_archive import archive_path, archived_months, partition_clause, read_archive, run_retention
+from app.utils.ids import new_id
+
+TABLE = AuditLog.__table__
+NOW = datetime(2026, 10, 16, 12, 0, 0)
+
+
+@pytest.fixture
+def archive_dir(tmp_path):
+    return str(tmp_path / "archive")
+
+
+@pytest.fixture
+def sync_engine(tmp_path):
+    """ 테스트 데이터베이스 파일을 사용하는 동기 엔진 (API 테스트의 engine 픽스처와 같은 파일) """
+    sync_engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    Base.metadata.create_all(sync_engine)
+    yield sync_engine
+    sync_engine.dispose()
+
+
+@pytest.fixture
+def audit_rows(sync_engine):
+    """ 2026년 6월 ~ 10월에 걸친 감사 로그 (월별 action 이 다름) """
+    rows = [
+        {
+            "id": new_id(),
+            "user_id": None,
+            "action": f"action-{month}",
+            "details": {"n": i},
+            "created_at": datetime(2026, month, 1 + i, 9, 0, 0),
+        }
+        for month in range(6, 11)
+        for i in range(3)
+    ]
+    with sync_engine.begin() as conn:
+        conn.execute(insert(TABLE), rows)
+    return rows
+
+
+def test_partition_clause_covers_months_and_maxvalue():
+    """ 월 파티션 정의가 다음 달 1일 경계로 생성되는지 확인합니다. """
+    clause = partition_clause(date(2026, 11, 1), date(2027, 1, 1))
+
+    assert "PARTITION BY RANGE (TO_DAYS(created_at))" in clause
+    assert "PARTITION p202611 VALUES LESS THAN (TO_DAYS('2026-12-01'))" in clause
+    assert "PARTITION p202612 VALUES LESS THAN (TO_DAYS('2027-01-01'))" in clause
+    assert "PARTITION p202701 VALUES LESS THAN (TO_DAYS('2027-02-01'))" in clause
+    assert clause.rstrip().endswith("PARTITION pmax VALUES LESS THAN MAXVALUE\n)")
+
+
+def test_retention_archives_expired_months(sync_engine, audit_rows, archive_dir):
+    """ 보관 기간이 지난 달을 파일로 옮기고 DB 에서 지우는지 확인합니다. """
+    archived = run_retention(sync_engine, NOW, retention_months=3, archive_dir=archive_dir, chunk_size=2)
+
+    assert [(entry["month"], entry["rows"]) for entry in archived] == [("2026-06", 3), ("2026-07", 3)]
+    assert archived_months(archive_dir) == ["2026-06", "2026-07"]
+    with sync_engine.connect() as conn:
+        assert conn.execute(select(func.min(TABLE.c.created_at))).scalar() == datetime(2026, 8, 1, 9, 0, 0)
+        assert conn.execute(select(func.count()).select_from(TABLE)).scalar() == 9
+
+    rows = list(read_archive(archive_dir, date(2026, 6, 1)))
+    expected = [row for row in audit_rows if row["created_at"].month == 6]
+    assert [(row["id"], row["action"], row["details"], row["created_at"]) for row in rows] == [
+        (row["id"], row["action"], row["details"], row["created_at"]) for row in expected
+    ]
+
+    # 다시 실행해도 보관할 달이 없습니다.
+    assert run_retention(sync_engine, NOW, retention_months=3, archive_dir=archive_dir) == []
+
+
+def test_read_archive_filters_and_limits(sync_engine, audit_rows, archive_dir):
+    """ 보관 파일 조회 시 action 필터와 limit 이 적용되는지 확인합니다. """
+    run_retention(sync_engine, NOW, retention_months=4, archive_dir=archive_dir)
+
+    assert archive_path(archive_dir, date(2026, 6, 1)).exists()
+    assert len(list(read_archive(archive_dir, date(2026, 6, 1), limit=2))) == 2
+    assert list(read_archive(archive_dir, date(2026, 6, 1), action="action-7")) == []
+    with pytest.raises(FileNotFoundError):
+        list(read_archive(archive_dir, date(2026, 7, 1)))
+
+
+@pytest.mark.anyio
+async def test_admin_reads_archived_month(client, session_factory, user, sync_engine, audit_rows, archive_dir, monkeypatch):
+    """ 관리자 API 로 보관된 달의 감사 로그를 조회하는지 확인합니다. """
+    run_retention(sync_engine, NOW, retention_months=3, archive_dir=archive_dir)
+    monkeypatch.setattr(settings, "AUDIT_ARCHIVE_DIR", archive_dir)
+    async with session_factory() as db:
+        admin = await db.get(type(user), user.id)
+        admin.role = UserRole.ADMIN
+        await db.commit()
+
+    months = await client.get("/api/v1/audit-logs/archive", headers=auth_headers(user))
+    logs = await client.get("/api/v1/audit-logs/archive/2026-07", params={"limit": 2}, headers=auth_headers(user))
+    missing = await client.get("/api/v1/audit-logs/archive/2026-09", headers=auth_headers(user))
+
+    assert months.json() == ["2026-06", "2026-07"]
+    assert logs.status_code == 200
+    assert [log["action"] for log in logs.json()] == ["action-7", "action-7"]
+    assert missing.status_code == 404
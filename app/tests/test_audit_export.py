@@ -0,0 +1,87 @@
+import csv
+import io
+import json
+from datetime import datetime
+
+import pytest
+
+from app.core.settings import settings
+from app.models.audit import AuditLog
+from app.models.user import UserRole
+from app.tests.conftest import auth_headers
+from app.utils.audit_export import EXPORT_COLUMNS, ExportFormat, export_query, stream_export
+from app.utils.ids import new_id
+
+
+@pytest.fixture
+async def audit_logs(session_factory, user):
+    """ 2026년 10월 1일 ~ 5일의 감사 로그와, 감사 로그를 내보낼 관리자 """
+    async with session_factory() as db:
+        admin = await db.get(type(user), user.id)
+        admin.role = UserRole.ADMIN
+        logs = [
+            AuditLog(
+                id=new_id(),
+                user_id=user.id if day % 2 else None,
+                action="deposit" if day % 2 else "login",
+                details={"amount": day * 1000, "memo": "쉼표, \"따옴표\""},
+                ip_address="127.0.0.1",
+                created_at=datetime(2026, 10, day, 9, 0, 0),
+            )
+            for day in range(1, 6)
+        ]
+        db.add_all(logs)
+        await db.commit()
+    return logs
+
+
+@pytest.mark.anyio
+async def test_stream_export_reads_in_chunks(engine, audit_logs):
+    """ 서버 측 커서에서 chunk_size 행씩 읽어 청크 단위로 내보내는지 확인합니다. """
+    chunks = [chunk async for chunk in stream_export(engine, export_query(), ExportFormat.NDJSON, chunk_size=2)]
+
+    assert [chunk.count("\n") for chunk in chunks] == [2, 2, 1]
+    rows = [json.loads(line) for chunk in chunks for line in chunk.splitlines()]
+    assert [row["id"] for row in rows] == [log.id for log in audit_logs]
+    assert rows[0]["details"] == {"amount": 1000, "memo": "쉼표, \"따옴표\""}
+    assert rows[0]["created_at"] == "2026-10-01T09:00:00"
+
+
+@pytest.mark.anyio
+async def test_export_ndjson_with_filters(client, user, audit_logs, monkeypatch):
+    """ 사용자, 액션, 기간 필터를 적용해 NDJSON 으로 내보내는지 확인합니다. """
+    monkeypatch.setattr(settings, "AUDIT_EXPORT_CHUNK_SIZE", 1)
+    response = await client.get(
+        "/api/v1/audit-logs/export",
+        params={"user_id": user.id, "action": "deposit", "start": "2026-10-02T00:00:00", "end": "2026-10-05T09:00:00"},
+        headers=auth_headers(user),
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert response.headers["content-disposition"].startswith("attachment;")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["id"] for row in rows] == [audit_logs[2].id]
+
+
+@pytest.mark.anyio
+async def test_export_csv(client, user, audit_logs):
+    """ CSV 로 내보낼 때 헤더와 JSON 상세 정보가 올바르게 인코딩되는지 확인합니다. """
+    response = await client.get("/api/v1/audit-logs/export", params={"format": "csv"}, headers=auth_headers(user))
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.reader(io.StringIO(response.text)))
+    assert rows[0] == EXPORT_COLUMNS
+    assert [row[0] for row in rows[1:6]] == [log.id for log in audit_logs]
+    # 내보내기 요청 자체도 감사 로그로 남습니다.
+    assert rows[6][2] == "export_audit_logs"
+    assert json.loads(rows[1][3]) == {"amount": 1000, "memo": "쉼표, \"따옴표\""}
+
+
+@pytest.mark.anyio
+async def test_export_requires_admin(client, user):
+    """ 관리자가 아니면 내보낼 수 없는지 확인합니다. """
+    response = await client.get("/api/v1/audit-logs/export", headers=auth_headers(user))
+
+    assert response.status_code == 403
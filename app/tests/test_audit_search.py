@@ -0,0 +1,92 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.core.settings import settings
+from app.models.audit import AuditLog
+from app.models.user import UserRole
+from app.tests.conftest import auth_headers
+from app.utils.ids import new_id
+
+pytestmark = pytest.mark.anyio
+
+OTHER_USER_ID = "00000000-0000-0000-0000-000000000001"
+
+
+@pytest.fixture
+async def audit_logs(session_factory, user):
+    """ 최근 10일간 두 사용자의 입금/로그인 감사 로그와, 감사 로그를 검색할 관리자 """
+    now = datetime.now().replace(microsecond=0)
+    async with session_factory() as db:
+        admin = await db.get(type(user), user.id)
+        admin.role = UserRole.ADMIN
+        logs = [
+            AuditLog(
+                id=new_id(),
+                user_id=user.id if i % 2 else OTHER_USER_ID,
+                action="deposit" if i % 3 else "login",
+                details={"amount": i * 1000} if i % 3 else {"method": "password"},
+                ip_address="10.0.0.1" if i < 5 else "10.0.0.2",
+                created_at=now - timedelta(days=i),
+            )
+            for i in range(10)
+        ]
+        db.add_all(logs)
+        await db.commit()
+    return logs
+
+
+async def search(client, user, **params) -> list:
+    response = await client.get("/api/v1/audit-logs", params=params, headers=auth_headers(user))
+    assert response.status_code == 200, response.text
+    return [log["id"] for log in response.json()]
+
+
+async def test_search_by_user_action_and_ip(client, user, audit_logs):
+    """ 사용자, 액션, IP 조건을 모두 만족하는 로그를 최신순으로 반환하는지 확인합니다. """
+    ids = await search(client, user, user_id=user.id, action="deposit", ip_address="10.0.0.1")
+
+    assert ids == [audit_logs[1].id]
+    assert await search(client, user, user_id=user.id, ip_address="10.0.0.1") == [audit_logs[1].id, audit_logs[3].id]
+
+
+async def test_search_by_time_window_and_amount(client, user, audit_logs):
+    """ 기간과 details.amount 범위 조건으로 검색하는지 확인합니다. """
+    start = audit_logs[6].created_at.isoformat()
+    end = audit_logs[1].created_at.isoformat()
+
+    # 기간: 6 ~ 2일 전 (종료 시각 미포함), 금액: 4000 ~ 8000 (login 로그에는 amount 가 없음)
+    ids = await search(client, user, start=start, end=end, amount_min=4000, amount_max=8000)
+
+    assert ids == [audit_logs[4].id, audit_logs[5].id]
+
+
+async def test_search_pages_with_cursor(client, user, audit_logs):
+    """ 검색 조건이 커서 페이지네이션에도 유지되는지 확인합니다. """
+    first = await client.get(
+        "/api/v1/audit-logs", params={"action": "deposit", "limit": 3}, headers=auth_headers(user)
+    )
+    second = await client.get(
+        "/api/v1/audit-logs",
+        params={"action": "deposit", "limit": 3, "cursor": first.headers["X-Next-Cursor"]},
+        headers=auth_headers(user),
+    )
+
+    ids = [log["id"] for log in first.json() + second.json()]
+    assert ids == [log.id for log in audit_logs if log.action == "deposit"]
+
+
+async def test_count_is_exact_below_cap(client, user, audit_logs):
+    """ 상한보다 적으면 정확한 건수를 반환하는지 확인합니다. """
+    response = await client.get("/api/v1/audit-logs/count", params={"action": "login"}, headers=auth_headers(user))
+
+    assert response.json() == {"count": 4, "exact": True}
+
+
+async def test_count_stops_at_cap(client, user, audit_logs, monkeypatch):
+    """ 상한을 넘으면 전체를 세지 않고 상한값과 exact=False 를 반환하는지 확인합니다. """
+    monkeypatch.setattr(settings, "AUDIT_COUNT_CAP", 5)
+
+    response = await client.get("/api/v1/audit-logs/count", headers=auth_headers(user))
+
+    assert response.json() == {"count": 5, "exact": False}
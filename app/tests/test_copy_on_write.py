@@ -0,0 +1,59 @@
+import random
+
+import pytest
+
+from app.utils.copy_on_write import CopyOnWriteDict, CopyOnWriteSortedList
+
+
+def test_dict_copies_match_plain_dicts():
+    """ 복사본을 번갈아 바꿔도 각 복사본이 같은 연산을 한 dict 와 내용과 순서가 같은지 확인합니다. (합치기 포함) """
+    rng = random.Random(0)
+    versions = [(CopyOnWriteDict((key, key) for key in range(300)), {key: key for key in range(300)})]
+    for step in range(3000):
+        current, expected = versions[rng.randrange(len(versions))]
+        if step % 7 == 0:
+            versions.append((current.copy(), dict(expected)))
+            continue
+        key = rng.randrange(400)
+        if rng.random() < 0.4 and key in expected:
+            del current[key]
+            del expected[key]
+        else:
+            current[key] = expected[key] = step
+
+    for current, expected in versions:
+        assert list(current.items()) == list(expected.items())
+        assert len(current) == len(expected)
+        assert all((key in current) == (key in expected) for key in range(400))
+    with pytest.raises(KeyError):
+        del CopyOnWriteDict()[1]
+
+
+def test_sorted_list_copies_share_unchanged_chunks():
+    """ 복사본을 번갈아 바꿔도 각 복사본이 정렬된 내용을 유지하고, 바꾸지 않은 조각은 공유하는지 확인합니다. """
+    rng = random.Random(1)
+    values = rng.sample(range(100_000), 5000)
+    original = CopyOnWriteSortedList(values, chunk_size=64)
+    versions = [(original, sorted(values))]
+    for step in range(2000):
+        current, expected = versions[rng.randrange(len(versions))]
+        if step % 50 == 0:
+            versions.append((current.copy(), list(expected)))
+        elif rng.random() < 0.5 and expected:
+            value = rng.choice(expected)
+            current.remove(value)
+            expected.remove(value)
+        else:
+            value = rng.randrange(100_000)
+            current.add(value)
+            expected.append(value)
+            expected.sort()
+
+    for current, expected in versions:
+        assert list(current) == expected and len(current) == len(expected)
+    with pytest.raises(ValueError):
+        original.remove(-1)
+
+    copy = original.copy()
+    copy.add(-1)
+    assert sum(a is b for a, b in zip(original._chunks, copy._chunks)) == len(original._chunks) - 1
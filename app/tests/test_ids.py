@@ -0,0 +1,35 @@
+import uuid
+
+from sqlalchemy import Column, MetaData, Table, create_engine, select
+
+from app.models.types import UUIDKey
+from app.utils.ids import uuid7
+
+
+def test_uuid7_is_time_ordered():
+    """ UUIDv7 이 버전/variant 비트를 갖고 생성 순서대로 정렬되는지 확인합니다. """
+    ids = [uuid7() for _ in range(5000)]
+
+    assert all(value.version == 7 for value in ids)
+    assert all(value.variant == uuid.RFC_4122 for value in ids)
+    assert ids == sorted(ids)
+    assert [value.bytes for value in ids] == sorted(value.bytes for value in ids)
+    assert len(set(ids)) == len(ids)
+
+
+def test_binary_uuid_key_round_trips_strings(tmp_path):
+    """ BINARY(16) 로 저장해도 애플리케이션에서는 UUID 문자열로 보이는지 확인합니다. """
+    engine = create_engine(f"sqlite:///{tmp_path / 'ids.db'}")
+    metadata = MetaData()
+    table = Table("items", metadata, Column("id", UUIDKey(binary=True), primary_key=True))
+    metadata.create_all(engine)
+
+    value = str(uuid7())
+    with engine.begin() as conn:
+        conn.execute(table.insert(), [{"id": value}])
+        stored = conn.exec_driver_sql("SELECT id FROM items").scalar()
+        loaded = conn.execute(select(table.c.id).where(table.c.id == value)).scalar()
+
+    assert stored == uuid.UUID(value).bytes
+    assert loaded == value
+    engine.dispose()
@@ -0,0 +1,71 @@
+import asyncio
+import uuid
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import event, func, select
+
+from app.models.audit import AuditLog
+from app.models.deposit_withdrawal import DepositWithdrawal, DepositWithdrawalType
+from app.models.user import User
+from app.tests.conftest import auth_headers
+from app.utils.ledger import post_transaction
+
+pytestmark = pytest.mark.anyio
+
+
+async def count_rows(session_factory, model) -> int:
+    async with session_factory() as db:
+        return await db.scalar(select(func.count()).select_from(model))
+
+
+async def get_balance(session_factory, user) -> float:
+    async with session_factory() as db:
+        return await db.scalar(select(User.balance).where(User.id == user.id))
+
+
+async def test_deposit_is_single_transaction(client, engine, session_factory, user):
+    """ 입금이 잔고 변경, 거래 내역, 감사 로그를 한 번의 커밋으로 처리하는지 확인합니다. """
+    commits = []
+    event.listen(engine.sync_engine, "commit", lambda conn: commits.append(1))
+
+    response = await client.post(
+        "/api/v1/deposit", json={"type": "deposit", "amount": 50000}, headers=auth_headers(user)
+    )
+
+    assert response.status_code == 200
+    assert response.json()["amount"] == 50000
+    assert len(commits) == 1
+    assert await get_balance(session_factory, user) == 10_050_000
+    assert await count_rows(session_factory, DepositWithdrawal) == 1
+    assert await count_rows(session_factory, AuditLog) == 1
+
+
+async def test_concurrent_withdrawals_never_overdraw(client, session_factory, user):
+    """ 동시에 들어온 출금이 잔고를 넘어 처리되지 않는지 확인합니다. """
+    async def withdraw():
+        return await client.post(
+            "/api/v1/withdraw", json={"type": "withdraw", "amount": 1_000_000}, headers=auth_headers(user)
+        )
+
+    responses = await asyncio.gather(*(withdraw() for _ in range(15)))
+
+    assert sorted(r.status_code for r in responses) == [200] * 10 + [400] * 5
+    assert await get_balance(session_factory, user) == 0
+    assert await count_rows(session_factory, DepositWithdrawal) == 10
+    assert await count_rows(session_factory, AuditLog) == 10
+
+
+async def test_deposit_to_missing_user_is_not_found(session_factory):
+    """ 입금할 사용자 행이 없으면 잔고 부족(400)이 아니라 404 로 실패하고 아무것도 기록하지 않는지 확인합니다. """
+    missing = User(id=str(uuid.uuid4()), email="gone@example.com", hashed_password="not-used", balance=0.0)
+    async with session_factory() as db:
+        with pytest.raises(HTTPException) as deposit_error:
+            await post_transaction(db, missing, DepositWithdrawalType.DEPOSIT, 50000)
+        await db.rollback()
+        with pytest.raises(HTTPException) as withdrawal_error:
+            await post_transaction(db, missing, DepositWithdrawalType.WITHDRAWAL, 50000)
+
+    assert deposit_error.value.status_code == 404
+    assert withdrawal_error.value.status_code == 400
+    assert await count_rows(session_factory, DepositWithdrawal) == 0
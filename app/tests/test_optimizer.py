@@ -0,0 +1,226 @@
+import asyncio
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+from sqlalchemy import select
+
+from app.core.settings import PortfolioOptimizer, settings
+from app.models.stock import Stock, StockPrice
+from app.models.user import PortfolioType
+from app.utils.advisory_batch import allocate
+from app.utils.ids import new_id
+from app.utils.optimizer import (
+    PortfolioOptimizerStore, build_risk_model, mean_variance_weights, portfolio_optimizer, risk_parity_weights
+)
+from app.utils.portfolio import (
+    BALANCE_RATIOS, calculate_portfolio, portfolio_from_snapshot, recommend_portfolio, select_stocks
+)
+from app.utils.universe import stock_universe
+
+pytestmark = pytest.mark.anyio
+
+COV = np.array([
+    [0.040, 0.006, 0.010],
+    [0.006, 0.090, 0.012],
+    [0.010, 0.012, 0.025],
+])
+
+
+def never() -> float:
+    return float("inf")
+
+
+class HistorySession:
+    """ 종가 이력 조회만 흉내 내는 세션 (gate 가 열릴 때까지 조회가 끝나지 않음) """
+
+    def __init__(self, gate: asyncio.Event = None):
+        self.gate = gate
+        self.queries = 0
+
+    async def execute(self, statement):
+        self.queries += 1
+        if self.gate is not None:
+            await self.gate.wait()
+        return self
+
+    def all(self) -> list:
+        return []
+
+
+def test_mean_variance_matches_closed_form():
+    """ 해가 모두 양수일 때 예산 제약만 있는 닫힌 해와 같은지 확인합니다. """
+    mean, risk_aversion = np.array([0.10, 0.14, 0.07]), 5.0
+    inverse = np.linalg.inv(COV)
+    ones = np.ones(3)
+    shift = (ones @ inverse @ mean - risk_aversion) / (ones @ inverse @ ones)
+    expected = inverse @ (mean - shift) / risk_aversion
+    assert (expected > 0).all()
+
+    weights, converged = mean_variance_weights(mean, COV, risk_aversion, deadline=float("inf"))
+
+    assert converged
+    np.testing.assert_allclose(weights, expected, atol=1e-6)
+
+
+def test_mean_variance_is_long_only():
+    """ 기대수익률이 낮은 종목은 음수 대신 0 비중이 되는지 확인합니다. """
+    weights, converged = mean_variance_weights(np.array([0.30, 0.02, 0.05]), COV, 2.0, deadline=float("inf"))
+
+    assert converged
+    assert weights.min() >= 0 and weights[1] == 0
+    assert weights.sum() == pytest.approx(1)
+
+
+def test_risk_parity_equalizes_contributions():
+    """ 위험 기여도가 같고, 상관이 없으면 변동성 역수 비중인지 확인합니다. """
+    weights, converged = risk_parity_weights(COV.copy(), deadline=float("inf"))
+    contributions = weights * (COV @ weights)
+
+    assert converged
+    np.testing.assert_allclose(contributions / contributions.sum(), 1 / 3, atol=1e-7)
+
+    diagonal = np.diag([0.04, 0.09, 0.01])
+    weights, _ = risk_parity_weights(diagonal, deadline=float("inf"))
+    np.testing.assert_allclose(weights, (1 / np.array([0.2, 0.3, 0.1])) / (1 / np.array([0.2, 0.3, 0.1])).sum())
+
+
+def test_solvers_stop_at_deadline_with_valid_weights():
+    """ 시간 한도를 넘기면 수렴하지 않았어도 합 1, 음수 없는 비중을 반환하는지 확인합니다. """
+    for weights, converged in (
+        mean_variance_weights(np.array([0.10, 0.14, 0.07]), COV, 5.0, deadline=0.0, clock=never),
+        risk_parity_weights(COV.copy(), deadline=0.0, clock=never),
+    ):
+        assert not converged
+        assert weights.min() >= 0
+        assert weights.sum() == pytest.approx(1)
+
+
+def test_risk_model_uses_common_trading_days():
+    """ 모든 종목의 종가가 있는 연속 거래일의 수익률만 사용하는지 확인합니다. """
+    start = date(2026, 1, 1)
+    rows = [("a", start + timedelta(days=day), 100.0 * 1.01 ** day) for day in range(6)]
+    rows += [("b", start + timedelta(days=day), 50.0 * (1.02 if day % 2 else 1.0)) for day in range(6) if day != 3]
+
+    model = build_risk_model(["a", "b"], rows, min_observations=2)
+
+    # 6 거래일 -> 5 개 수익률, b 가 없는 날의 앞뒤 2 개 제외
+    assert model.observations == 3
+    assert model.mean[0] == pytest.approx(np.log(1.01) * 252)
+    assert build_risk_model(["a", "b"], rows, min_observations=4) is None
+
+
+async def seed_history(db, days: int = 120) -> list:
+    seed = Stock.get_seed_data()
+    for stock in seed:
+        stock.id = new_id()
+    db.add_all(seed)
+    rng = np.random.default_rng(0)
+    today = date.today()
+    for stock in seed:
+        volatility = rng.uniform(0.005, 0.03)
+        closes = stock.current_price * np.exp(np.cumsum(rng.normal(0.0003, volatility, days)))
+        db.add_all(
+            StockPrice(stock_id=stock.id, trade_date=today - timedelta(days=days - day), close_price=float(close))
+            for day, close in enumerate(closes)
+        )
+    await db.commit()
+    return seed
+
+
+async def test_optimizer_weights_feed_whole_share_allocation(session_factory, monkeypatch):
+    """ 유형별 방식의 비중으로 수량을 나누고, 이력은 스냅샷 버전별로 한 번만 읽는지 확인합니다. """
+    monkeypatch.setattr(settings, "PORTFOLIO_OPTIMIZERS", {
+        "conservative": PortfolioOptimizer.RISK_PARITY, "balanced": PortfolioOptimizer.MEAN_VARIANCE,
+    })
+    balance = 30_000_000
+    async with session_factory() as db:
+        await seed_history(db)
+        snapshot = await stock_universe.get(db)
+        loads = portfolio_optimizer.history_loads
+
+        for portfolio_type in (PortfolioType.CONSERVATIVE, PortfolioType.BALANCED):
+            stocks = select_stocks(snapshot, portfolio_type)
+            weights = await portfolio_optimizer.weights(db, snapshot.version, portfolio_type, stocks)
+            assert weights is not None and sum(weights) == pytest.approx(1)
+
+            available = balance * BALANCE_RATIOS[portfolio_type]
+            expected = [
+                (stock.id, int(available * weight / stock.current_price))
+                for stock, weight in zip(stocks, weights) if int(available * weight / stock.current_price) > 0
+            ]
+            result = await calculate_portfolio(db, balance, portfolio_type)
+            assert [(rec["stock_id"], rec["quantity"]) for rec in result] == expected
+            assert await recommend_portfolio(db, balance, portfolio_type) == result
+
+            # 일괄 생성의 수량 계산도 같은 비중을 사용합니다.
+            prices = np.array([stock.current_price for stock in stocks])
+            row = allocate(prices, np.array([float(balance)]), BALANCE_RATIOS[portfolio_type], np.array(weights))[0]
+            assert [(stock.id, quantity) for stock, quantity in zip(stocks, row.tolist()) if quantity > 0] == expected
+
+        risk_parity = await calculate_portfolio(db, balance, PortfolioType.CONSERVATIVE)
+        assert risk_parity != portfolio_from_snapshot(snapshot, balance, PortfolioType.CONSERVATIVE)
+        assert portfolio_optimizer.history_loads == loads + 2
+
+        # 종가 이력을 바꾸면 스냅샷 버전이 올라 이력을 다시 읽습니다.
+        version = snapshot.version
+        stock_id = select_stocks(snapshot, PortfolioType.CONSERVATIVE)[0].id
+        price = await db.scalar(select(StockPrice).where(
+            StockPrice.stock_id == stock_id, StockPrice.trade_date == date.today() - timedelta(days=1)
+        ))
+        price.close_price = price.close_price * 0.5
+        await db.commit()
+        assert (await stock_universe.get(db)).version == version + 1
+        assert await calculate_portfolio(db, balance, PortfolioType.CONSERVATIVE) != risk_parity
+        assert portfolio_optimizer.history_loads == loads + 3
+
+
+async def test_optimizer_without_history_uses_price_weights(session_factory, monkeypatch):
+    """ 종가 이력이 모자라면 기존 가격 비례 계산과 같은 결과인지 확인합니다. """
+    monkeypatch.setattr(settings, "PORTFOLIO_OPTIMIZERS", {"aggressive": PortfolioOptimizer.MEAN_VARIANCE})
+    async with session_factory() as db:
+        await seed_history(db, days=10)
+        snapshot = await stock_universe.get(db)
+        fallbacks = portfolio_optimizer.fallbacks
+
+        result = await calculate_portfolio(db, 20_000_000, PortfolioType.AGGRESSIVE)
+
+    assert result == portfolio_from_snapshot(snapshot, 20_000_000, PortfolioType.AGGRESSIVE)
+    assert portfolio_optimizer.fallbacks == fallbacks + 1
+
+
+async def test_history_loads_are_single_flight_per_key():
+    """ 같은 키의 동시 조회는 한 번만 읽고, 다른 키의 조회는 앞선 조회를 기다리지 않는지 확인합니다. """
+    store = PortfolioOptimizerStore(budget_ms=20, lookback_days=365, min_observations=2)
+    gate = asyncio.Event()
+    slow, joined, other = HistorySession(gate), HistorySession(), HistorySession()
+
+    first = asyncio.create_task(store.risk_model(slow, 1, ["a", "b"]))
+    second = asyncio.create_task(store.risk_model(joined, 1, ["a", "b"]))
+    await asyncio.sleep(0)
+    assert await asyncio.wait_for(store.risk_model(other, 1, ["c", "d"]), timeout=1) is None
+    assert not first.done()
+
+    gate.set()
+    assert await first is None and await second is None
+    assert (slow.queries, joined.queries, other.queries) == (1, 0, 1)
+    assert store.history_loads == 2
+
+
+async def test_weights_follow_the_stocks_they_were_solved_for(session_factory, monkeypatch):
+    """ 같은 버전이라도 증권 목록이 다르면 그 목록의 비중을 계산하고, 비중은 고른 목록에만 적용하는지 확인합니다. """
+    monkeypatch.setattr(settings, "PORTFOLIO_OPTIMIZERS", {"conservative": PortfolioOptimizer.RISK_PARITY})
+    async with session_factory() as db:
+        await seed_history(db)
+        snapshot = await stock_universe.get(db)
+        stocks = select_stocks(snapshot, PortfolioType.CONSERVATIVE)
+        others = [record for record in snapshot.by_id.values() if record not in stocks][:2]
+
+        weights = await portfolio_optimizer.weights(db, snapshot.version, PortfolioType.CONSERVATIVE, stocks)
+        shorter = await portfolio_optimizer.weights(db, snapshot.version, PortfolioType.CONSERVATIVE, others)
+
+    assert len(weights) == len(stocks) and len(shorter) == len(others)
+    result = portfolio_from_snapshot(snapshot, 30_000_000, PortfolioType.CONSERVATIVE, stocks=others, weights=shorter)
+    assert {rec["stock_id"] for rec in result} <= {record.id for record in others}
+    with pytest.raises(ValueError):
+        portfolio_from_snapshot(snapshot, 30_000_000, PortfolioType.CONSERVATIVE, weights=weights)
@@ -0,0 +1,64 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.models.deposit_withdrawal import DepositWithdrawal, DepositWithdrawalStatus, DepositWithdrawalType
+from app.tests.conftest import auth_headers
+from app.utils.ids import new_id
+from app.utils.pagination import NEXT_CURSOR_HEADER
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def transactions(session_factory, user):
+    """ 생성 일시가 겹치는 거래 내역 23건을 생성하는 픽스처 """
+    started = datetime(2026, 1, 1, 9, 0, 0)
+    rows = [
+        DepositWithdrawal(
+            id=new_id(),
+            user_id=user.id,
+            type=DepositWithdrawalType.DEPOSIT,
+            amount=1000 * (i + 1),
+            status=DepositWithdrawalStatus.COMPLETED,
+            # 5건씩 같은 생성 일시를 갖도록 해 id 로 순서를 정하는지 확인합니다.
+            created_at=started + timedelta(seconds=i // 5),
+        )
+        for i in range(23)
+    ]
+    async with session_factory() as db:
+        db.add_all(rows)
+        await db.commit()
+    return sorted(rows, key=lambda row: (row.created_at, row.id), reverse=True)
+
+
+async def test_cursor_pages_cover_all_rows_in_order(client, user, transactions):
+    """ 커서를 따라가면 모든 행을 중복/누락 없이 최신순으로 조회하는지 확인합니다. """
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": 10, **({"cursor": cursor} if cursor else {})}
+        response = await client.get("/api/v1/transactions", params=params, headers=auth_headers(user))
+        assert response.status_code == 200
+        seen.extend(row["id"] for row in response.json())
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if cursor is None:
+            break
+
+    assert seen == [row.id for row in transactions]
+
+
+async def test_offset_pagination_still_supported(client, user, transactions):
+    """ 기존 skip/limit 파라미터가 그대로 동작하는지 확인합니다. """
+    response = await client.get("/api/v1/transactions", params={"skip": 20, "limit": 10}, headers=auth_headers(user))
+
+    assert response.status_code == 200
+    assert [row["id"] for row in response.json()] == [row.id for row in transactions[20:]]
+    assert NEXT_CURSOR_HEADER not in response.headers
+
+
+async def test_invalid_cursor_is_rejected(client, user):
+    """ 잘못된 커서는 400 으로 거절하는지 확인합니다. """
+    response = await client.get("/api/v1/transactions", params={"cursor": "not-a-cursor"}, headers=auth_headers(user))
+
+    assert response.status_code == 400
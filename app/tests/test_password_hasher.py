@@ -0,0 +1,136 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from fastapi import HTTPException
+
+from app.utils import security
+from app.utils.security import PasswordHasher
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def hasher():
+    hasher = PasswordHasher(workers=1, max_queue=1)
+    yield hasher
+    hasher.shutdown()
+
+
+async def test_hash_and_verify_in_pool(hasher):
+    """ 스레드 풀에서 해시한 비밀번호를 검증할 수 있는지 확인합니다. """
+    hashed = await hasher.hash("secret-password")
+
+    assert await hasher.verify("secret-password", hashed)
+    assert not await hasher.verify("wrong-password", hashed)
+    assert hasher.stats()["completed"] == 3
+
+
+async def test_event_loop_keeps_running_during_verify(hasher, monkeypatch):
+    """ 검증이 실행되는 동안에도 이벤트 루프가 다른 작업을 처리하는지 확인합니다. """
+    monkeypatch.setattr(security, "verify_password", lambda plain, hashed: time.sleep(0.2) or True)
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    task = asyncio.create_task(ticker())
+    assert await hasher.verify("password", "hash")
+    task.cancel()
+
+    assert ticks >= 5
+
+
+async def test_rejects_when_queue_is_full(hasher, monkeypatch):
+    """ 실행 중 + 대기 중 작업이 한도에 도달하면 기다리지 않고 503 을 반환하는지 확인합니다. """
+    release = threading.Event()
+    monkeypatch.setattr(security, "verify_password", lambda plain, hashed: release.wait(5))
+
+    running = asyncio.create_task(hasher.verify("a", "hash"))
+    queued = asyncio.create_task(hasher.verify("b", "hash"))
+    await asyncio.sleep(0.05)
+
+    with pytest.raises(HTTPException) as exc_info:
+        await hasher.verify("c", "hash")
+    stats = hasher.stats()
+
+    release.set()
+    await asyncio.gather(running, queued)
+    assert exc_info.value.status_code == 503
+    assert exc_info.value.headers["Retry-After"] == "1"
+    assert (stats["in_flight"], stats["queued"], stats["rejected"]) == (1, 1, 1)
+    assert hasher.stats()["queued"] == 0
+
+
+async def test_cancelled_requests_still_count_running_jobs(hasher, monkeypatch):
+    """ 기다리던 요청이 취소되어도 스레드 풀에서 실행 중/대기 중인 작업은 끝날 때까지 한도에 포함되는지 확인합니다. """
+    release = threading.Event()
+    monkeypatch.setattr(security, "verify_password", lambda plain, hashed: release.wait(5))
+
+    running = asyncio.create_task(hasher.verify("a", "hash"))
+    queued = asyncio.create_task(hasher.verify("b", "hash"))
+    await asyncio.sleep(0.05)
+    running.cancel()
+    await asyncio.gather(running, return_exceptions=True)
+
+    # 실행 중인 bcrypt 작업은 요청이 취소되어도 계속 실행되므로 여전히 대기열이 가득 찬 상태입니다.
+    assert (hasher.stats()["in_flight"], hasher.stats()["queued"]) == (1, 1)
+    with pytest.raises(HTTPException):
+        await hasher.verify("c", "hash")
+
+    # 시작 전에 취소된 작업은 바로 빠집니다.
+    queued.cancel()
+    await asyncio.gather(queued, return_exceptions=True)
+    assert hasher.stats()["queued"] == 0
+
+    release.set()
+    for _ in range(100):
+        if hasher.stats()["in_flight"] == 0:
+            break
+        await asyncio.sleep(0.01)
+    assert hasher.stats()["in_flight"] == 0
+    assert hasher.stats()["completed"] == 1
+
+
+def test_calibrate_picks_largest_rounds_within_target(monkeypatch):
+    """ 목표 시간을 넘지 않는 가장 큰 rounds 를 고르고, 최소/최대 범위를 지키는지 확인합니다. """
+    monkeypatch.setattr(security, "measure_bcrypt_seconds", lambda rounds: 0.02)  # rounds 10 에서 20ms
+
+    assert security.calibrate_bcrypt_rounds(250, 10, 16) == 13  # 160ms
+    assert security.calibrate_bcrypt_rounds(250, 10, 12) == 12
+    assert security.calibrate_bcrypt_rounds(5, 10, 16) == 10
+
+
+@pytest.fixture
+def weak_policy():
+    """ 테스트 동안 빠른 rounds 정책을 사용합니다. """
+    saved = security.pwd_context.to_dict()
+    security.configure_password_policy(5)
+    yield
+    security.pwd_context.load(saved)
+
+
+async def test_login_rehashes_hash_outside_policy(client, session_factory, user, weak_policy, monkeypatch):
+    """ 정책보다 약한 해시는 로그인에 성공할 때 현재 rounds 로 다시 해시되는지 확인합니다. """
+    monkeypatch.setattr(security.password_hasher, "rehashed", 0)
+    old_hash = security.CryptContext(schemes=["bcrypt"], bcrypt__rounds=4).hash("secret-password")
+    async with session_factory() as db:
+        login_user = await db.get(type(user), user.id)
+        login_user.hashed_password = old_hash
+        await db.commit()
+
+    first = await client.post("/api/v1/login", data={"username": user.email, "password": "secret-password"})
+    async with session_factory() as db:
+        rehashed = (await db.get(type(user), user.id)).hashed_password
+    second = await client.post("/api/v1/login", data={"username": user.email, "password": "secret-password"})
+    async with session_factory() as db:
+        unchanged = (await db.get(type(user), user.id)).hashed_password
+
+    assert first.status_code == 200 and second.status_code == 200
+    assert old_hash.startswith("$2b$04$") and rehashed.startswith("$2b$05$")
+    assert unchanged == rehashed
+    assert security.password_hasher.stats()["rehashed"] == 1
@@ -0,0 +1,56 @@
+import asyncio
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.database import pool_options
+from app.core.pool import attach_metrics, check_idle_connections, pool_stats
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def instrumented_engine(tmp_path):
+    url = make_url(f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}")
+    options = {**pool_options(url), "pool_size": 2, "max_overflow": 1}
+    engine = create_async_engine(url, **options)
+    attach_metrics(engine, "primary")
+    yield engine
+    await engine.dispose()
+
+
+async def test_pool_metrics_track_checkouts_and_overflow(instrumented_engine):
+    """ 체크아웃 수, 동시 사용 커넥션 수, overflow 가 기록되는지 확인합니다. """
+    async def query():
+        async with instrumented_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(*(query() for _ in range(3)))
+
+    [stats] = pool_stats([instrumented_engine])
+    assert stats["name"] == "primary"
+    assert stats["checkouts"] == 3
+    assert stats["peak_checked_out"] == 3
+    assert stats["peak_overflow"] == 1
+    assert stats["checked_out"] == 0
+    assert sum(stats["wait_histogram"].values()) == 3
+
+
+async def test_liveness_check_pings_each_idle_connection(instrumented_engine):
+    """ 백그라운드 점검이 유휴 커넥션마다 한 번씩 ping 하는지 확인합니다. """
+    async def query():
+        async with instrumented_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(*(query() for _ in range(2)))
+    idle = instrumented_engine.pool.checkedin()
+
+    failed = await check_idle_connections(instrumented_engine)
+
+    [stats] = pool_stats([instrumented_engine])
+    assert failed == 0
+    assert stats["liveness_checks"] == idle == 2
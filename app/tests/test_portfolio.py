@@ -0,0 +1,107 @@
+import dataclasses
+import random
+
+import pytest
+from sqlalchemy import select
+
+from app.models.stock import Stock
+from app.models.user import PortfolioType
+from app.scripts.bench_portfolio import BenchStock, legacy_select, random_stocks
+from app.utils.ids import new_id
+from app.utils.portfolio import PRICE_TIERS, calculate_portfolio
+from app.utils.universe import RankingIndex
+
+pytestmark = pytest.mark.anyio
+
+# 포트폴리오 유형별 투자 비율 (calculate_portfolio 와 같은 값)
+BALANCE_RATIOS = {PortfolioType.AGGRESSIVE: 0.95, PortfolioType.BALANCED: 0.7, PortfolioType.CONSERVATIVE: 0.5}
+
+
+@pytest.mark.parametrize("n", [0, 1, 4, 10, 100, 3000])
+@pytest.mark.parametrize("portfolio_type", list(PortfolioType))
+def test_select_matches_legacy(n, portfolio_type):
+    """ 순위 색인 선택이 기존 방식과 같은 증권을 같은 순서로 고르는지 확인합니다. (가중치 동률 포함) """
+    stocks = random_stocks(n, seed=n)
+    index = RankingIndex(stocks)
+    tiers = PRICE_TIERS[portfolio_type]
+
+    assert index.select(tiers) == [s.id for s in legacy_select(stocks, tiers)]
+
+
+def test_select_skips_inactive_and_breaks_ties_by_position():
+    """ 비활성 증권은 고르지 않고, 가중치가 같으면 앞선 증권을 먼저 고르는지 확인합니다. """
+    stocks = [
+        BenchStock("a", 50000, 1e12, 10, 0.0),
+        BenchStock("b", 50000, 1e12, 10, 0.0),
+        BenchStock("c", 50000, 5e12, 10, 0.0, is_active=False),
+        BenchStock("d", 50000, 1e12, 10, 0.0),
+    ]
+    index = RankingIndex(stocks)
+
+    assert index.select([{"max_price": 100000, "count": 2}]) == ["a", "b"]
+
+
+def test_ranking_index_updates_match_legacy():
+    """ 가격/가중치 변경과 비활성화를 하나씩 반영한 순위 색인이 기존 방식으로 새로 고른 결과와 같은지 확인합니다. """
+    rng = random.Random(0)
+    stocks = random_stocks(2000, seed=1)
+    index = RankingIndex(stocks)
+
+    for step in range(300):
+        i = rng.randrange(len(stocks))
+        stocks[i] = dataclasses.replace(
+            stocks[i],
+            current_price=round(10 ** rng.uniform(3, 6.3), -1),
+            volume=rng.choice([stocks[i].volume, 1_000_000]),
+            is_active=step % 10 != 0,
+        )
+        index.upsert(stocks[i])
+
+        if step % 50 == 0:
+            active = [stock for stock in stocks if stock.is_active]
+            for tiers in PRICE_TIERS.values():
+                assert index.select(tiers) == [stock.id for stock in legacy_select(active, tiers)]
+
+
+def test_ranking_index_copy_and_deleted_orders():
+    """ 복사본을 바꿔도 원래 색인은 그대로이고, 삭제한 증권의 동률 순서는 지우는지 확인합니다. """
+    stocks = [dataclasses.replace(stock, market_cap=1.0, volume=1) for stock in random_stocks(3, seed=2)]
+    index = RankingIndex(stocks)
+    copy = index.copy()
+
+    copy.remove(stocks[0].id)
+    copy.delete(stocks[1].id)
+    assert index.top(float("inf"), 3) == [stock.id for stock in stocks]
+    assert copy.top(float("inf"), 3) == [stocks[2].id]
+
+    # 비활성화 후 다시 추가된 증권은 원래 순서, 삭제 후 다시 추가된 증권은 맨 뒤 순서를 받습니다.
+    copy.upsert(stocks[1])
+    copy.upsert(stocks[0])
+    assert copy.top(float("inf"), 3) == [stocks[0].id, stocks[2].id, stocks[1].id]
+    assert len(copy._orders) == 3
+
+
+async def test_calculate_portfolio_with_seed_stocks(session_factory):
+    """ 시드 증권으로 계산한 추천이 기존 선택 방식과 같은 증권을 같은 순서로 고르는지 확인합니다. """
+    balance = 10_000_000
+    async with session_factory() as db:
+        seed = Stock.get_seed_data()
+        for stock in seed:
+            stock.id = new_id()
+        db.add_all(seed)
+        await db.commit()
+        stocks = (await db.execute(select(Stock).where(Stock.is_active == True))).scalars().all()
+
+        for portfolio_type, balance_ratio in BALANCE_RATIOS.items():
+            expected = legacy_select(stocks, PRICE_TIERS[portfolio_type])
+            total_price = sum(stock.current_price for stock in expected)
+            quantities = [
+                (stock.id, int(balance * balance_ratio * (stock.current_price / total_price) / stock.current_price))
+                for stock in expected
+            ]
+
+            recommendations = await calculate_portfolio(db, balance, portfolio_type)
+
+            assert [(rec["stock_id"], rec["quantity"]) for rec in recommendations] == [
+                (stock_id, quantity) for stock_id, quantity in quantities if quantity > 0
+            ]
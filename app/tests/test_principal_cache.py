@@ -0,0 +1,136 @@
+import pytest
+from sqlalchemy import event
+
+from app.core.principal_cache import Principal, PrincipalCache, PrincipalInvalidationSync, principal_cache
+from app.core.rate_limit import LocalSortedSetStore
+from app.tests.conftest import auth_headers
+from app.utils.constant.globals import UserRole
+
+pytestmark = pytest.mark.anyio
+
+
+class FakeClock:
+    """ 테스트에서 시간을 직접 진행시키는 시계 """
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def principal(user_id: str = "u1", role: UserRole = UserRole.USER) -> Principal:
+    return Principal(id=user_id, role=role, is_active=True)
+
+
+def test_entries_expire_at_ttl_or_token_exp():
+    """ 항목이 TTL 과 토큰 만료 시각 중 빠른 시각에 만료되는지 확인합니다. """
+    clock = FakeClock()
+    cache = PrincipalCache(max_entries=10, ttl_seconds=30, clock=clock)
+
+    cache.put("long", principal(), clock.now + 3600, cache.epoch, 0.002)
+    cache.put("short", principal(), clock.now + 10, cache.epoch, 0.002)
+    assert cache.get("long") and cache.get("short")
+
+    clock.now += 11
+    assert cache.get("short") is None
+    clock.now += 20
+    assert cache.get("long") is None
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (2, 2, 0)
+    assert stats["saved_ms_total"] == pytest.approx(4.0)
+
+
+def test_lru_eviction_and_stale_put():
+    """ 가장 오래 사용하지 않은 토큰부터 버리고, 조회 중 무효화되면 저장하지 않는지 확인합니다. """
+    cache = PrincipalCache(max_entries=2, ttl_seconds=30)
+    cache.put("a", principal("u1"), None, cache.epoch, 0)
+    cache.put("b", principal("u2"), None, cache.epoch, 0)
+    cache.get("a")
+    cache.put("c", principal("u3"), None, cache.epoch, 0)
+    assert [cache.get(token) is not None for token in ("a", "b", "c")] == [True, False, True]
+
+    epoch = cache.epoch
+    cache.invalidate_user("u1")
+    cache.put("a", principal("u1"), None, epoch, 0)
+    assert cache.get("a") is None
+
+
+async def test_invalidation_shared_between_workers():
+    """ 한 워커의 무효화가 공유 저장소를 통해 다른 워커의 캐시에도 반영되는지 확인합니다. """
+    clock = FakeClock()
+    store = LocalSortedSetStore(clock=clock)
+    worker_a, worker_b = (PrincipalCache(max_entries=10, ttl_seconds=30, clock=clock) for _ in range(2))
+    sync_a, sync_b = (PrincipalInvalidationSync(cache, store, clock=clock) for cache in (worker_a, worker_b))
+    worker_b.put("token", principal("u1"), None, worker_b.epoch, 0)
+
+    worker_a.invalidate_user("u1")
+    clock.now += 1
+    assert await sync_a.publish() == 1
+    assert await sync_b.pull() == 1
+
+    assert worker_b.get("token") is None
+    assert await sync_a.publish() == 0
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    """ 비어 있는 전역 Principal 캐시 """
+    principal_cache.clear()
+    for name in ("hits", "misses", "lookup_count", "lookup_seconds_total", "saved_seconds_total"):
+        monkeypatch.setattr(principal_cache, name, 0)
+    yield principal_cache
+    principal_cache.clear()
+
+
+@pytest.fixture
+def user_queries(engine):
+    """ users 테이블 조회 횟수 """
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if "FROM users" in statement:
+            statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    yield statements
+    event.remove(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+
+async def set_user(session_factory, user, **values):
+    async with session_factory() as db:
+        db_user = await db.get(type(user), user.id)
+        for name, value in values.items():
+            setattr(db_user, name, value)
+        await db.commit()
+
+
+async def test_admin_check_skips_db_until_role_changes(client, session_factory, user, cache, user_queries):
+    """ 캐시에 적중하면 users 를 조회하지 않고, 역할이 바뀌면 바로 반영되는지 확인합니다. """
+    await set_user(session_factory, user, role=UserRole.ADMIN)
+    headers = auth_headers(user)
+    user_queries.clear()
+
+    first = await client.get("/api/v1/password-hasher", headers=headers)
+    second = await client.get("/api/v1/password-hasher", headers=headers)
+    assert first.status_code == second.status_code == 200
+    assert len(user_queries) == 1
+
+    await set_user(session_factory, user, role=UserRole.USER)
+    assert (await client.get("/api/v1/password-hasher", headers=headers)).status_code == 403
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 2)
+    assert stats["hit_ratio"] == pytest.approx(1 / 3)
+
+
+async def test_deactivated_user_rejected(client, session_factory, user, cache):
+    """ 캐시에 올라간 사용자를 비활성화하면 다음 요청이 거절되는지 확인합니다. """
+    headers = auth_headers(user)
+    assert (await client.get("/api/v1/transactions", headers=headers)).status_code == 200
+
+    await set_user(session_factory, user, is_active=False)
+
+    response = await client.get("/api/v1/transactions", headers=headers)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Inactive user"
@@ -0,0 +1,78 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import func, select
+
+from app.models.audit import AuditLog
+from app.models.deposit_withdrawal import DepositWithdrawal
+from app.models.login_attempt import LoginAttempt
+from app.models.stock import AdvisoryRecommendation, AdvisoryRequest, Stock, UserStock
+from app.utils.audit_search import AuditLogFilter
+from app.utils.pagination import Keyset, paginate
+
+pytestmark = pytest.mark.anyio
+
+USER_ID = "00000000-0000-0000-0000-000000000000"
+
+AUDIT_LOG_KEYSET = Keyset(AuditLog.created_at, AuditLog.id, descending=True)
+AUDIT_LOG_CURSOR = AUDIT_LOG_KEYSET.next_cursor([SimpleNamespace(created_at=datetime(2026, 1, 1), id=USER_ID)], 1)
+
+# 엔드포인트의 조회 쿼리와 같은 형태의 쿼리
+HOT_QUERIES = {
+    "transactions": (
+        select(DepositWithdrawal)
+        .where(DepositWithdrawal.user_id == USER_ID)
+        .order_by(DepositWithdrawal.created_at.desc())
+        .limit(10)
+    ),
+    "advisory_requests": (
+        select(AdvisoryRequest)
+        .where(AdvisoryRequest.user_id == USER_ID)
+        .order_by(AdvisoryRequest.created_at.desc())
+        .limit(10)
+    ),
+    "advisory_recommendations": (
+        select(AdvisoryRecommendation)
+        .where(AdvisoryRecommendation.advisory_request_id == USER_ID)
+    ),
+    "audit_logs": select(AuditLog).order_by(AuditLog.created_at.desc()).limit(100),
+    "audit_logs_keyset": paginate(select(AuditLog), AUDIT_LOG_KEYSET, AUDIT_LOG_CURSOR, 0, 100),
+    **{
+        f"audit_logs_by_{name}": paginate(
+            select(AuditLog).where(*AuditLogFilter(**{name: value}).conditions()),
+            AUDIT_LOG_KEYSET, AUDIT_LOG_CURSOR, 0, 100
+        )
+        for name, value in (("user_id", USER_ID), ("action", "deposit"), ("ip_address", "127.0.0.1"))
+    },
+    "audit_logs_by_amount": select(AuditLog).where(*AuditLogFilter(amount_min=1000000).conditions()).limit(100),
+    "login_attempts": (
+        select(LoginAttempt).where(
+            LoginAttempt.ip_address == "127.0.0.1",
+            LoginAttempt.is_successful == False,
+            LoginAttempt.last_attempt_at >= func.now() - timedelta(minutes=30)
+        )
+    ),
+    "holdings": select(UserStock).where(UserStock.user_id == USER_ID),
+    "active_stocks": select(Stock).where(Stock.is_active == True),
+}
+
+
+def explain(conn, statement) -> list:
+    """ SQLite EXPLAIN QUERY PLAN 결과의 detail 컬럼을 반환합니다. """
+    compiled = statement.compile(dialect=conn.dialect)
+    # 실행 계획에는 파라미터 값이 필요 없으므로 NULL 을 넘깁니다.
+    args = (None,) * len(compiled.positiontup)
+    rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled.string}", args).all()
+    return [row[-1] for row in rows]
+
+
+@pytest.mark.parametrize("name", HOT_QUERIES)
+async def test_hot_query_uses_index(engine, name):
+    """ 주요 조회 쿼리가 전체 테이블 스캔이나 임시 정렬 없이 인덱스를 사용하는지 확인합니다. """
+    async with engine.connect() as conn:
+        plan = await conn.run_sync(explain, HOT_QUERIES[name])
+
+    for detail in plan:
+        assert not (detail.startswith("SCAN") and "USING" not in detail), plan
+        assert "TEMP B-TREE" not in detail, plan
@@ -0,0 +1,111 @@
+import pytest
+from sqlalchemy import select
+
+from app.core.rate_limit import InMemoryRateLimitBackend, LocalSortedSetStore, StoreRateLimitBackend
+from app.core.settings import settings
+from app.models.login_attempt import LoginAttempt
+from app.utils import login_attempts
+from app.utils.security import get_password_hash
+
+pytestmark = pytest.mark.anyio
+
+PASSWORD = "correct-password"
+
+
+class FakeClock:
+    """ 테스트에서 시간을 직접 진행시키는 시계 """
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def memory_backend(clock):
+    return InMemoryRateLimitBackend(clock=clock)
+
+
+def store_backend(clock):
+    return StoreRateLimitBackend(LocalSortedSetStore(clock=clock), clock=clock)
+
+
+@pytest.mark.parametrize("make_backend", [memory_backend, store_backend], ids=["memory", "store"])
+async def test_sliding_window(make_backend):
+    """ 윈도우 안의 이벤트만 세고, 오래된 이벤트는 하나씩 빠지는지 확인합니다. """
+    clock = FakeClock()
+    backend = make_backend(clock)
+
+    assert await backend.hit("k", 60) == 1
+    clock.now += 30
+    assert await backend.hit("k", 60) == 2
+    assert await backend.count("other", 60) == 0
+
+    clock.now += 31  # 첫 이벤트만 윈도우 밖
+    assert await backend.count("k", 60) == 1
+    assert await backend.hit("k", 60) == 2
+
+    await backend.reset("k")
+    assert await backend.count("k", 60) == 0
+
+
+async def test_memory_backend_bounds_keys():
+    """ 키 수가 max_keys 를 넘으면 가장 오래 사용하지 않은 키를 버리는지 확인합니다. """
+    backend = InMemoryRateLimitBackend(max_keys=2)
+
+    await backend.hit("a", 60)
+    await backend.hit("b", 60)
+    await backend.hit("a", 60)
+    await backend.hit("c", 60)
+
+    assert [await backend.count(key, 60) for key in ("a", "b", "c")] == [2, 0, 1]
+
+
+@pytest.fixture
+async def login_user(session_factory, user, monkeypatch):
+    """ 비밀번호로 로그인할 수 있는 사용자와 비어 있는 요청 제한 카운터 """
+    async with session_factory() as db:
+        login_user = await db.get(type(user), user.id)
+        login_user.hashed_password = get_password_hash(PASSWORD)
+        await db.commit()
+    monkeypatch.setattr(login_attempts.login_throttle, "backend", InMemoryRateLimitBackend())
+    return login_user
+
+
+async def login(client, email: str, password: str):
+    return await client.post("/api/v1/login", data={"username": email, "password": password})
+
+
+async def test_account_locked_after_max_failures(client, session_factory, login_user):
+    """ 같은 IP 에서 한 계정의 실패가 한도에 도달하면 올바른 비밀번호도 거절하는지 확인합니다. """
+    for _ in range(settings.MAX_LOGIN_ATTEMPTS):
+        assert (await login(client, login_user.email, "wrong")).status_code == 401
+
+    response = await login(client, login_user.email, PASSWORD)
+
+    assert response.status_code == 429
+    assert "Retry-After" in response.headers
+    async with session_factory() as db:
+        attempts = (await db.execute(select(LoginAttempt).order_by(LoginAttempt.attempt_count))).scalars().all()
+    assert [attempt.attempt_count for attempt in attempts] == list(range(1, settings.MAX_LOGIN_ATTEMPTS + 1))
+    assert not any(attempt.is_successful for attempt in attempts)
+
+
+async def test_success_resets_account_failures(client, login_user):
+    """ 로그인에 성공하면 해당 계정의 실패 횟수가 초기화되는지 확인합니다. """
+    for _ in range(settings.MAX_LOGIN_ATTEMPTS - 1):
+        await login(client, login_user.email, "wrong")
+
+    assert (await login(client, login_user.email, PASSWORD)).status_code == 200
+    for _ in range(settings.MAX_LOGIN_ATTEMPTS - 1):
+        assert (await login(client, login_user.email, "wrong")).status_code == 401
+    assert (await login(client, login_user.email, PASSWORD)).status_code == 200
+
+
+async def test_ip_blocked_across_accounts(client, login_user, monkeypatch):
+    """ 한 IP 에서 여러 계정을 번갈아 시도해도 IP 한도에서 막히는지 확인합니다. """
+    monkeypatch.setattr(settings, "LOGIN_IP_MAX_ATTEMPTS", 3)
+    for i in range(3):
+        assert (await login(client, f"unknown-{i}@example.com", "wrong")).status_code == 401
+
+    assert (await login(client, login_user.email, PASSWORD)).status_code == 429
@@ -0,0 +1,101 @@
+import asyncio
+
+import pytest
+
+from app.models.stock import Stock
+from app.models.user import PortfolioType
+from app.utils.ids import new_id
+from app.utils.portfolio import calculate_portfolio, recommend_portfolio
+from app.utils.recommendation_cache import RecommendationCache, recommendation_cache
+
+pytestmark = pytest.mark.anyio
+
+
+class FakeClock:
+    """ 테스트에서 시간을 직접 진행시키는 시계 """
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def constant(value):
+    async def compute():
+        return value
+    return compute
+
+
+async def test_lru_and_ttl():
+    """ 오래 사용하지 않은 항목부터 지우고, TTL 이 지난 항목은 다시 계산하는지 확인합니다. """
+    clock = FakeClock()
+    cache = RecommendationCache(max_entries=2, ttl_seconds=30, clock=clock)
+    await cache.get_or_compute("a", constant([{"n": 1}]))
+    await cache.get_or_compute("b", constant([{"n": 2}]))
+    assert await cache.get_or_compute("a", constant([{"n": 0}])) == [{"n": 1}]
+    await cache.get_or_compute("c", constant([{"n": 3}]))
+
+    assert await cache.get_or_compute("b", constant([{"n": 20}])) == [{"n": 20}]
+    clock.now += 31
+    assert await cache.get_or_compute("c", constant([{"n": 30}])) == [{"n": 30}]
+    assert cache.stats()["evictions"] == 2
+
+
+async def test_concurrent_misses_compute_once():
+    """ 같은 키의 동시 요청은 한 번만 계산하고, 결과는 요청마다 새 목록인지 확인합니다. """
+    cache = RecommendationCache(max_entries=10, ttl_seconds=30)
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return [{"stock_id": "a", "quantity": 1}]
+
+    results = await asyncio.gather(*(cache.get_or_compute("key", compute) for _ in range(5)))
+
+    assert len(calls) == 1
+    assert all(result == [{"stock_id": "a", "quantity": 1}] for result in results)
+    results[0][0]["quantity"] = 99
+    assert (await cache.get_or_compute("key", compute))[0]["quantity"] == 1
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["coalesced"]) == (1, 1, 4)
+
+
+async def test_failed_computation_is_shared_and_not_cached():
+    """ 계산이 실패하면 기다리던 요청도 같은 오류를 받고, 결과를 저장하지 않는지 확인합니다. """
+    cache = RecommendationCache(max_entries=10, ttl_seconds=30)
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    results = await asyncio.gather(*(cache.get_or_compute("key", fail) for _ in range(3)), return_exceptions=True)
+
+    assert all(isinstance(result, ValueError) for result in results)
+    assert await cache.get_or_compute("key", constant([{"n": 1}])) == [{"n": 1}]
+
+
+async def test_recommendation_keyed_by_universe_version(session_factory):
+    """ 증권이 바뀌면 스냅샷 버전이 바뀌어 다시 계산하고, 결과는 calculate_portfolio 와 같은지 확인합니다. """
+    before = recommendation_cache.stats()
+    async with session_factory() as db:
+        seed = Stock.get_seed_data()
+        for stock in seed:
+            stock.id = new_id()
+        db.add_all(seed)
+        await db.commit()
+
+        first = await recommend_portfolio(db, 10_000_000.4, PortfolioType.BALANCED)
+        assert first == await calculate_portfolio(db, 10_000_000, PortfolioType.BALANCED)
+        assert await recommend_portfolio(db, 10_000_000, PortfolioType.BALANCED) == first
+        assert recommendation_cache.stats()["hits"] == before["hits"] + 1
+
+        stock = await db.get(Stock, first[0]["stock_id"])
+        stock.current_price = stock.current_price * 0.5
+        await db.commit()
+
+        second = await recommend_portfolio(db, 10_000_000, PortfolioType.BALANCED)
+        assert second == await calculate_portfolio(db, 10_000_000, PortfolioType.BALANCED)
+    assert second != first
+    assert recommendation_cache.stats()["misses"] == before["misses"] + 2
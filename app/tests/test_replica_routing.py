@@ -0,0 +1,152 @@
+import time
+import uuid
+
+import httpx
+import pytest
+from fastapi import FastAPI, Request
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.database import (
+    LAST_WRITE_HEADER, Base, ReadYourWritesTracker, RoutingSession, client_wrote_recently, get_db,
+    read_your_writes_middleware, recent_writes
+)
+from app.models.stock import Stock
+from app.models.user import User
+
+pytestmark = pytest.mark.anyio
+
+
+def make_stock(name: str) -> Stock:
+    return Stock(
+        id="00000000-0000-0000-0000-000000000001",
+        code="005930",
+        name=name,
+        current_price=75000.0,
+        market_cap=1.0,
+        volume=1,
+        high_price=1.0,
+        low_price=1.0,
+        open_price=1.0,
+        prev_close=1.0,
+        change_rate=0.0,
+        change_amount=0.0,
+    )
+
+
+@pytest.fixture
+async def routing_factory(tmp_path):
+    """ primary 와 replica 를 별도의 SQLite 파일로 구성하는 픽스처 """
+    engines = []
+    for name in ("primary", "replica"):
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / name}.db")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with AsyncSession(engine) as db:
+            db.add(make_stock(name))
+            await db.commit()
+        engines.append(engine)
+
+    primary, replica = engines
+    yield async_sessionmaker(
+        class_=AsyncSession,
+        sync_session_class=RoutingSession,
+        primary=primary,
+        replicas=[replica],
+        expire_on_commit=False,
+    )
+    for engine in engines:
+        await engine.dispose()
+
+
+async def read_stock_name(db: AsyncSession) -> str:
+    result = await db.execute(select(Stock.name))
+    return result.scalar_one()
+
+
+async def test_read_only_session_reads_from_replica(routing_factory):
+    """ 읽기 전용 세션의 SELECT 가 복제본으로 가는지 확인합니다. """
+    async with routing_factory() as db:
+        db.info["read_only"] = True
+        assert await read_stock_name(db) == "replica"
+
+    async with routing_factory() as db:
+        assert await read_stock_name(db) == "primary"
+
+
+async def test_writes_go_to_primary_and_stick(routing_factory):
+    """ 쓰기는 primary 로 가고, 쓴 사용자의 이후 읽기도 primary 로 가는지 확인합니다. """
+    user_id = str(uuid.uuid4())
+    async with routing_factory() as db:
+        db.info["read_only"] = True
+        db.info["user_id"] = user_id
+        db.add(User(id=user_id, email=f"{user_id}@example.com", hashed_password="x"))
+        await db.flush()
+        # flush 이후의 읽기는 같은 세션 안에서 primary 를 사용합니다.
+        assert await read_stock_name(db) == "primary"
+        await db.commit()
+
+    assert recent_writes.wrote_recently(user_id)
+
+    async with routing_factory() as db:
+        db.info["read_only"] = True
+        await db.execute(update(Stock).values(name="updated"))
+        await db.commit()
+        assert await read_stock_name(db) == "updated"
+
+
+def test_read_your_writes_window_expires():
+    """ 쓰기 후 지정한 시간이 지나면 복제본 읽기로 돌아가는지 확인합니다. """
+    tracker = ReadYourWritesTracker(window_seconds=0)
+    tracker.mark("user")
+    assert not tracker.wrote_recently("user")
+
+    tracker = ReadYourWritesTracker(window_seconds=60)
+    tracker.mark("user")
+    assert tracker.wrote_recently("user")
+    assert not tracker.wrote_recently("other")
+
+
+async def test_write_time_travels_with_the_client(routing_factory):
+    """ 커밋한 쓰기 시각이 응답 쿠키/헤더로 나가고, 그 값을 보낸 요청은 어느 워커에서든 primary 에서 읽는지 확인합니다. """
+    app = FastAPI()
+    app.middleware("http")(read_your_writes_middleware)
+
+    @app.post("/write")
+    async def write(request: Request):
+        async with routing_factory() as db:
+            db.info["request_state"] = request.state
+            db.add(User(id=str(uuid.uuid4()), email=f"{uuid.uuid4()}@example.com", hashed_password="x"))
+            await db.commit()
+        return {}
+
+    @app.get("/read")
+    async def read(request: Request):
+        return {"recent": client_wrote_recently(request)}
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        assert (await client.get("/read")).json() == {"recent": False}
+        response = await client.post("/write")
+        assert LAST_WRITE_HEADER in response.headers
+        # 쿠키로 돌아온 값 (다른 워커라도 메모리 상태와 관계없이 판단)
+        assert (await client.get("/read")).json() == {"recent": True}
+        client.cookies.clear()
+        headers = {LAST_WRITE_HEADER: response.headers[LAST_WRITE_HEADER]}
+        assert (await client.get("/read", headers=headers)).json() == {"recent": True}
+        assert (await client.get("/read", headers={LAST_WRITE_HEADER: str(time.time() - 3600)})).json() == {"recent": False}
+        assert (await client.get("/read", headers={LAST_WRITE_HEADER: "not-a-time"})).json() == {"recent": False}
+
+
+@pytest.mark.parametrize("wrote", [False, True])
+async def test_get_db_reads_from_primary_after_client_write(wrote):
+    """ 최근 쓰기 시각을 보낸 GET 요청의 세션은 읽기 전용으로 표시하지 않는지 확인합니다. """
+    headers = [(LAST_WRITE_HEADER.lower().encode(), str(time.time()).encode())] if wrote else []
+    request = Request({"type": "http", "method": "GET", "headers": headers, "path": "/", "query_string": b""})
+
+    sessions = get_db(request)
+    db = await sessions.__anext__()
+    try:
+        assert db.info["read_only"] is not wrote
+        assert db.info["request_state"] is request.state
+    finally:
+        await sessions.aclose()
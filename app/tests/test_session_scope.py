@@ -0,0 +1,50 @@
+import pytest
+from sqlalchemy import event
+
+from app.tests.conftest import auth_headers
+
+pytestmark = pytest.mark.anyio
+
+
+def count_checkouts(engine) -> list:
+    checkouts = []
+    event.listen(engine.sync_engine, "checkout", lambda *args: checkouts.append(1))
+    return checkouts
+
+
+def count_user_selects(engine) -> list:
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and "FROM users" in statement:
+            statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    return statements
+
+
+async def test_authenticated_request_uses_single_connection(client, engine, user):
+    """ 인증 의존성과 엔드포인트가 하나의 커넥션을 공유하는지 확인합니다. """
+    checkouts = count_checkouts(engine)
+
+    response = await client.get("/api/v1/balance", headers=auth_headers(user))
+
+    assert response.status_code == 200
+    assert len(checkouts) == 1
+
+
+async def test_deposit_loads_user_once(client, engine, user):
+    """ 입금 처리 시 사용자 조회가 인증 단계의 한 번뿐인지 확인합니다. """
+    user_selects = count_user_selects(engine)
+
+    response = await client.post(
+        "/api/v1/deposit",
+        json={"type": "deposit", "amount": 10000},
+        headers=auth_headers(user),
+    )
+
+    assert response.status_code == 200
+    assert len(user_selects) == 1
+
+    balance = await client.get("/api/v1/balance", headers=auth_headers(user))
+    assert balance.json()["balance"] == user.balance + 10000
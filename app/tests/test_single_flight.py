@@ -0,0 +1,57 @@
+import asyncio
+
+import pytest
+
+from app.utils.single_flight import SingleFlight
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_concurrent_calls_share_result_and_errors():
+    """ 같은 키의 동시 호출은 한 번만 계산하고, 결과와 예외를 함께 받는지 확인합니다. """
+    flight = SingleFlight()
+    gate = asyncio.Event()
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await gate.wait()
+        return "value"
+
+    tasks = [asyncio.create_task(flight.do("key", compute)) for _ in range(3)]
+    await asyncio.sleep(0)
+    assert len(flight) == 1
+    gate.set()
+
+    assert [await task for task in tasks] == [("value", False), ("value", True), ("value", True)]
+    assert len(calls) == 1 and len(flight) == 0
+
+    async def fail():
+        await asyncio.sleep(0)
+        raise ValueError("boom")
+
+    results = await asyncio.gather(flight.do("key", fail), flight.do("key", fail), return_exceptions=True)
+    assert [type(result) for result in results] == [ValueError, ValueError]
+
+
+async def test_waiter_retries_when_leader_is_cancelled():
+    """ 먼저 계산하던 요청이 취소되면 기다리던 요청이 다시 계산하는지 확인합니다. """
+    flight = SingleFlight()
+    gate = asyncio.Event()
+
+    async def slow():
+        await gate.wait()
+        return "slow"
+
+    async def fast():
+        return "fast"
+
+    leader = asyncio.create_task(flight.do("key", slow))
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(flight.do("key", fast))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    assert await waiter == ("fast", False)
+    assert leader.cancelled()
+    assert len(flight) == 0
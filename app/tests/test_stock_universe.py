@@ -0,0 +1,131 @@
+import pytest
+from sqlalchemy import event, select, update
+
+from app.models.data_version import DataVersion
+from app.models.stock import Stock, UserStock
+from app.utils.constant.globals import UserRole
+from app.utils.ids import new_id
+from app.utils.security import access_token_claims, create_access_token
+from app.utils.universe import STOCKS_VERSION, StockUniverseStore, stock_universe
+
+pytestmark = pytest.mark.anyio
+
+
+class FakeClock:
+    """ 테스트에서 시간을 직접 진행시키는 시계 """
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_stock(code: str, price: float, **values) -> Stock:
+    return Stock(
+        id=new_id(), code=code, name=f"증권 {code}", current_price=price, market_cap=1e12, volume=1_000_000,
+        high_price=price, low_price=price, open_price=price, prev_close=price, change_rate=0.0, change_amount=0.0,
+        **values
+    )
+
+
+@pytest.fixture
+def stock_queries(engine):
+    """ stocks 테이블 조회 """
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if "FROM stocks" in statement:
+            statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    yield statements
+    event.remove(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+
+async def stocks_version(session_factory) -> int:
+    async with session_factory() as db:
+        return await db.scalar(select(DataVersion.version).where(DataVersion.name == STOCKS_VERSION))
+
+
+async def test_snapshot_reused_until_version_changes(session_factory, stock_queries):
+    """ 버전이 그대로면 스냅샷을 다시 읽지 않고, 다른 세션이 증권을 바꾸면 확인 주기 안에 다시 만드는지 확인합니다. """
+    clock = FakeClock()
+    store = StockUniverseStore(check_seconds=1.0, clock=clock)
+    async with session_factory() as db:
+        db.add_all([make_stock("000001", 50000), make_stock("000002", 70000), make_stock("000003", 1000, is_active=False)])
+        await db.commit()
+
+        snapshot = await store.get(db)
+        assert [record.code for record in snapshot.by_id.values()] == ["000001", "000002"]
+        clock.now += 5
+        assert await store.get(db) is snapshot
+        assert len(stock_queries) == 1
+
+    # 다른 워커(관리자 도구)의 일괄 변경
+    async with session_factory() as db:
+        await db.execute(update(Stock).where(Stock.code == "000001").values(current_price=55000))
+        await db.commit()
+    assert await stocks_version(session_factory) == 2
+
+    async with session_factory() as db:
+        assert await store.get(db) is snapshot
+        clock.now += 1
+        rebuilt = await store.get(db)
+    assert rebuilt.version == 2
+    assert [record.current_price for record in rebuilt.by_id.values()] == [55000, 70000]
+    assert store.stats()["rebuilds"] == 2
+
+
+async def test_admin_update_applied_to_worker_snapshot(client, session_factory, user):
+    """ 관리자가 증권을 바꾸면 이 워커의 스냅샷과 순위 색인에 바로 반영되는지 확인합니다. """
+    stock = make_stock("000001", 50000)
+    async with session_factory() as db:
+        db.add(stock)
+        await db.commit()
+        before = await stock_universe.get(db)
+        assert before.by_id[stock.id].current_price == 50000
+
+    rebuilds = stock_universe.stats()["rebuilds"]
+
+    token = create_access_token(data={**access_token_claims(user), "role": UserRole.ADMIN.value})
+    headers = {"Authorization": f"Bearer {token}"}
+    response = await client.put(f"/api/v1/stocks/{stock.id}", json={"current_price": 600000}, headers=headers)
+    assert response.status_code == 200
+
+    async with session_factory() as db:
+        snapshot = await stock_universe.get(db)
+    assert snapshot.by_id[stock.id].current_price == 600000
+    assert snapshot.ranking.top(100000, 1) == []
+    assert snapshot.ranking.top(float("inf"), 1) == [stock.id]
+    assert snapshot.version == await stocks_version(session_factory)
+    # 이 워커의 변경은 바뀐 종목만 다시 읽어 반영합니다.
+    assert stock_universe.stats()["rebuilds"] == rebuilds
+    assert stock_universe.stats()["incremental_updates"] >= 1
+    # 이전 스냅샷을 들고 있던 요청에는 그 버전의 내용이 그대로 보입니다.
+    assert snapshot is not before and before.version == snapshot.version - 1
+    assert before.by_id[stock.id].current_price == 50000
+    assert before.ranking.top(100000, 1) == [stock.id]
+
+
+async def test_balance_reads_prices_from_snapshot(client, session_factory, user, stock_queries):
+    """ 잔고 조회는 스냅샷의 현재가를 쓰고, 비활성 증권만 DB 에서 읽는지 확인합니다. """
+    active, inactive = make_stock("000001", 50000), make_stock("000002", 3000, is_active=False)
+    async with session_factory() as db:
+        db.add_all([active, inactive])
+        await db.flush()
+        db.add_all([
+            UserStock(id=new_id(), user_id=user.id, stock_id=active.id, quantity=3, average_price=40000),
+            UserStock(id=new_id(), user_id=user.id, stock_id=inactive.id, quantity=10, average_price=2000),
+        ])
+        await db.commit()
+        await stock_universe.get(db)
+    stock_queries.clear()
+
+    headers = {"Authorization": f"Bearer {create_access_token(data=access_token_claims(user))}"}
+    response = await client.get("/api/v1/balance", headers=headers)
+
+    assert response.status_code == 200
+    values = {stock["stock_id"]: stock["total_value"] for stock in response.json()["stocks"]}
+    assert values == {active.id: 150000, inactive.id: 30000}
+    assert len(stock_queries) == 1
@@ -0,0 +1,131 @@
+import time
+import uuid
+
+import pytest
+from jose import jwt
+from sqlalchemy import event, func, select
+
+from app.core.principal_cache import Principal
+from app.core.revocation import BloomFilter, TokenRevocationList
+from app.core.settings import settings
+from app.models.revoked_token import RevokedToken
+from app.utils.constant.globals import UserRole
+from app.utils.security import access_token_claims, create_access_token, create_refresh_token
+
+pytestmark = pytest.mark.anyio
+
+
+def test_bloom_filter_has_no_false_negatives():
+    """ 추가한 키는 항상 포함되고, 추가하지 않은 키의 오탐률은 목표 수준인지 확인합니다. """
+    bloom = BloomFilter(1000, 0.001)
+    keys = [f"jti:{uuid.uuid4().hex}" for _ in range(1000)]
+    for key in keys:
+        bloom.add(key)
+
+    assert all(key in bloom for key in keys)
+    false_positives = sum(f"jti:{uuid.uuid4().hex}" in bloom for _ in range(20000))
+    assert false_positives / 20000 < 0.005
+
+
+@pytest.fixture
+def user_queries(engine):
+    """ users 테이블 조회 """
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if "FROM users" in statement:
+            statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    yield statements
+    event.remove(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+
+async def set_user(session_factory, user, **values):
+    async with session_factory() as db:
+        db_user = await db.get(type(user), user.id)
+        for name, value in values.items():
+            setattr(db_user, name, value)
+        await db.commit()
+
+
+def claims_headers(user, **overrides) -> dict:
+    """ 역할/활성 상태 클레임을 담은 액세스 토큰 헤더 """
+    claims = {**access_token_claims(user), **overrides}
+    return {"Authorization": f"Bearer {create_access_token(data=claims)}"}
+
+
+async def test_admin_check_uses_claims_without_db(client, user, user_queries):
+    """ 클레임을 담은 토큰은 관리자 확인에 users 테이블을 조회하지 않는지 확인합니다. """
+    headers = claims_headers(user, role=UserRole.ADMIN.value)
+
+    assert (await client.get("/api/v1/password-hasher", headers=headers)).status_code == 200
+    assert (await client.get("/api/v1/token-revocations", headers=headers)).status_code == 200
+    assert user_queries == []
+    assert (await client.get("/api/v1/password-hasher", headers=claims_headers(user))).status_code == 403
+
+
+async def test_role_change_overrides_old_claims(client, session_factory, user, user_queries):
+    """ 역할이 바뀌면 이전에 발급된 토큰의 클레임 대신 DB 의 역할을 사용하는지 확인합니다. """
+    await set_user(session_factory, user, role=UserRole.ADMIN)
+    user.role = UserRole.ADMIN
+    headers = claims_headers(user)
+    assert (await client.get("/api/v1/password-hasher", headers=headers)).status_code == 200
+
+    await set_user(session_factory, user, role=UserRole.USER)
+    user_queries.clear()
+
+    assert (await client.get("/api/v1/password-hasher", headers=headers)).status_code == 403
+    assert len(user_queries) == 1
+    async with session_factory() as db:
+        revocations = await db.scalar(select(func.count()).select_from(RevokedToken).where(RevokedToken.user_id == user.id))
+    assert revocations == 2
+
+
+async def test_logout_revokes_only_current_token(client, user):
+    """ 로그아웃한 토큰만 거절되고, 같은 사용자의 다른 토큰은 계속 사용할 수 있는지 확인합니다. """
+    headers, other = claims_headers(user), claims_headers(user)
+    assert (await client.get("/api/v1/transactions", headers=headers)).status_code == 200
+
+    assert (await client.post("/api/v1/logout", headers=headers)).status_code == 204
+
+    assert (await client.get("/api/v1/transactions", headers=headers)).status_code == 401
+    assert (await client.get("/api/v1/transactions", headers=other)).status_code == 200
+
+
+async def test_logout_revokes_the_session_refresh_token(client, user):
+    """ 로그아웃하면 함께 발급된 리프레시 토큰도 거절되고, 다른 세션과 jti 없는 토큰은 영향이 없는지 확인합니다. """
+    refresh_token, session_id = create_refresh_token(data={"sub": user.id})
+    other_refresh, _ = create_refresh_token(data={"sub": user.id})
+
+    refreshed = await client.post("/api/v1/refresh", params={"refresh_token": refresh_token})
+    assert refreshed.status_code == 200
+    access_token = refreshed.json()["access_token"]
+    assert jwt.get_unverified_claims(access_token)["sid"] == session_id
+
+    headers = {"Authorization": f"Bearer {access_token}"}
+    assert (await client.post("/api/v1/logout", headers=headers)).status_code == 204
+
+    assert (await client.post("/api/v1/refresh", params={"refresh_token": refresh_token})).status_code == 401
+    assert (await client.post("/api/v1/refresh", params={"refresh_token": other_refresh})).status_code == 200
+    legacy = jwt.encode(
+        {"sub": user.id, "exp": time.time() + 60}, settings.REFRESH_SECRET_KEY, algorithm=settings.ALGORITHM
+    )
+    assert (await client.post("/api/v1/refresh", params={"refresh_token": legacy})).status_code == 401
+
+
+async def test_refresh_loads_other_workers_revocations(engine, session_factory, user):
+    """ 다른 워커가 기록한 폐기 행이 새로 고침 후 필터에 반영되고, 만료된 행은 지워지는지 확인합니다. """
+    revocations = TokenRevocationList(capacity=100, fp_rate=0.01, sync_seconds=5)
+    principal = Principal(id=user.id, role=UserRole.USER, is_active=True, token_id="revoked-jti", issued_at=time.time())
+    async with session_factory() as db:
+        await TokenRevocationList(100, 0.01, 5).revoke_token(db, principal, time.time() + 60, "logout")
+        expired = TokenRevocationList(100, 0.01, 5, clock=lambda: time.time() - 3600)
+        db.add(expired.revocation_for_user(user.id, "principal_changed"))
+        await db.commit()
+
+        assert not await revocations.is_token_revoked(db, principal)
+        assert await revocations.refresh(engine) == 1
+        assert await revocations.is_token_revoked(db, principal)
+        assert (await db.scalar(select(func.count()).select_from(RevokedToken))) == 1
+    assert revocations.stats()["filter_hits"] == 1
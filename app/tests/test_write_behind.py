@@ -0,0 +1,98 @@
+import asyncio
+
+import pytest
+from sqlalchemy import func, select
+
+from app.core.settings import WriteBehindOverflow
+from app.core.write_behind import WriteBehindBuffer
+from app.models.audit import AuditLog
+from app.models.deposit_withdrawal import DepositWithdrawal
+from app.tests.conftest import auth_headers
+from app.utils import audit
+from app.utils.ids import new_id
+
+pytestmark = pytest.mark.anyio
+
+
+def record(action: str = "deposit") -> dict:
+    return {"id": new_id(), "user_id": None, "action": action, "details": {"amount": 1000}}
+
+
+async def count_audit_logs(engine) -> int:
+    async with engine.connect() as conn:
+        return await conn.scalar(select(func.count()).select_from(AuditLog.__table__))
+
+
+@pytest.fixture
+async def sink(engine):
+    """ 테스트 데이터베이스에 기록하는 감사 로그 버퍼 """
+    buffer = WriteBehindBuffer("audit_logs", AuditLog.__table__, engine, batch_size=10, flush_interval_ms=50)
+    await buffer.start()
+    yield buffer
+    await buffer.stop()
+
+
+async def test_records_are_written_in_batches(engine, sink):
+    """ batch_size 단위로 묶어서 INSERT 하는지 확인합니다. """
+    for _ in range(25):
+        await sink.put(record())
+    await sink.flush()
+
+    assert await count_audit_logs(engine) == 25
+    assert sink.stats()["written"] == 25
+    assert sink.stats()["batches"] == 3
+
+
+async def test_partial_batch_is_flushed_after_interval(engine, sink):
+    """ 배치가 차지 않아도 flush 주기가 지나면 기록하는지 확인합니다. """
+    await sink.put(record())
+    await asyncio.sleep(0.2)
+
+    assert await count_audit_logs(engine) == 1
+
+
+async def test_stop_drains_queue(engine):
+    """ 종료 시 큐에 남은 레코드를 모두 기록하는지 확인합니다. """
+    buffer = WriteBehindBuffer("audit_logs", AuditLog.__table__, engine, batch_size=1000, flush_interval_ms=60000)
+    await buffer.start()
+    for _ in range(50):
+        await buffer.put(record())
+    await buffer.stop()
+
+    assert await count_audit_logs(engine) == 50
+    assert not buffer.running
+
+
+async def test_drop_policy_discards_when_full(engine):
+    """ DROP 정책은 큐가 가득 차면 대기하지 않고 레코드를 버리는지 확인합니다. """
+    buffer = WriteBehindBuffer(
+        "audit_logs", AuditLog.__table__, engine,
+        max_queue=5, flush_interval_ms=60000, batch_size=1000, overflow=WriteBehindOverflow.DROP
+    )
+    await buffer.start()
+    results = [await buffer.put(record()) for _ in range(8)]
+    await buffer.stop()
+
+    assert results == [True] * 5 + [False] * 3
+    assert buffer.stats()["dropped"] == 3
+    assert await count_audit_logs(engine) == 5
+
+
+async def test_deposit_audit_goes_through_sink(client, engine, session_factory, user, monkeypatch):
+    """ 버퍼가 실행 중이면 입금의 감사 로그를 버퍼가 기록하는지 확인합니다. """
+    buffer = WriteBehindBuffer("audit_logs", AuditLog.__table__, engine, flush_interval_ms=10)
+    monkeypatch.setattr(audit, "audit_sink", buffer)
+    await buffer.start()
+    try:
+        response = await client.post(
+            "/api/v1/deposit", json={"type": "deposit", "amount": 50000}, headers=auth_headers(user)
+        )
+        assert response.status_code == 200
+        await buffer.flush()
+    finally:
+        await buffer.stop()
+
+    async with session_factory() as db:
+        assert await db.scalar(select(func.count()).select_from(DepositWithdrawal)) == 1
+        logs = (await db.execute(select(AuditLog))).scalars().all()
+    assert [(log.action, log.user_id, log.details) for log in logs] == [("deposit", user.id, {"amount": 50000})]
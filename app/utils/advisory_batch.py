@@ -0,0 +1,169 @@
+import asyncio
+import logging
+import time
+from concurrent.futures import Executor
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.settings import settings
+from app.models.stock import AdvisoryRecommendation, AdvisoryRequest
+from app.models.user import PortfolioType, User
+from app.utils.ids import new_id
+from app.utils.optimizer import portfolio_optimizer
+from app.utils.portfolio import BALANCE_RATIOS, MIN_INVESTMENT, select_stocks
+from app.utils.universe import StockRecord, stock_universe
+
+logger = logging.getLogger(__name__)
+
+
+def allocate(
+        prices: np.ndarray,
+        balances: np.ndarray,
+        balance_ratio: float,
+        weights: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    사용자별 추천 수량을 한 번에 계산합니다. (portfolio_from_snapshot 과 같은 연산 순서와 결과)
+    프로세스 풀에서 실행할 수 있도록 모듈 최상위 함수로 둡니다.
+
+    Args:
+        prices: 선택한 증권의 현재가 (종목 수)
+        balances: 사용자 잔고 (사용자 수)
+        balance_ratio: 투자에 사용하는 잔고 비율
+        weights: 종목별 투자 비중 (portfolio_optimizer.weights, 없으면 가격 비례)
+
+    Returns:
+        np.ndarray: (사용자 수, 종목 수) 수량 행렬, 유효하지 않은 포트폴리오의 행은 0
+    """
+    if weights is None:
+        # 가격 합은 파이썬 sum 과 같은 순서로 더합니다.
+        weights = prices / sum(prices.tolist())
+    available = balances * balance_ratio
+    investments = available[:, None] * weights[None, :]
+    quantities = np.trunc(investments / prices).astype(np.int64)
+
+    # validate_portfolio 와 같은 조건: 1주 이상인 종목이 있고, 합계가 잔고 이하이며, 종목마다 최소 투자 금액 이상
+    totals = quantities * prices
+    held = quantities > 0
+    valid = (
+        held.any(axis=1)
+        & (np.where(held, totals, 0.0).sum(axis=1) <= balances)
+        & (~held | (totals >= MIN_INVESTMENT)).all(axis=1)
+    )
+    quantities[~valid] = 0
+    return quantities
+
+
+def _chunks(items: Sequence, size: int) -> Iterable[Sequence]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _rows(
+        stocks: Sequence[StockRecord],
+        portfolio_type: PortfolioType,
+        user_ids: Sequence[str],
+        quantities: np.ndarray
+) -> Tuple[List[Dict], List[Dict]]:
+    """수량 행렬에서 자문 요청/추천 행을 만듭니다. (수량이 모두 0 인 사용자는 건너뜀)"""
+    requests, recommendations = [], []
+    for user_id, row in zip(user_ids, quantities.tolist()):
+        if not any(row):
+            continue
+        request_id = new_id()
+        requests.append({
+            "id": request_id,
+            "user_id": user_id,
+            "portfolio_type": portfolio_type,
+            "status": "completed",
+        })
+        for stock, quantity in zip(stocks, row):
+            if quantity > 0:
+                recommendations.append({
+                    "id": new_id(),
+                    "advisory_request_id": request_id,
+                    "stock_id": stock.id,
+                    "quantity": quantity,
+                    "price_at_time": stock.current_price,
+                    "total_investment": quantity * stock.current_price,
+                    "market_cap": stock.market_cap,
+                    "change_rate": stock.change_rate,
+                    "volume": stock.volume,
+                })
+    return requests, recommendations
+
+
+async def run_advisory_batch(
+        db: AsyncSession,
+        portfolio_types: Optional[Iterable[PortfolioType]] = None,
+        chunk_size: int = settings.ADVISORY_BATCH_CHUNK_SIZE,
+        executor: Optional[Executor] = None
+) -> Dict:
+    """
+    포트폴리오 유형이 있는 활성 사용자 전체의 자문 요청과 추천을 한 번에 생성합니다.
+
+    증권 스냅샷은 한 번만 읽고, 증권 선택과 투자 비중 계산은 유형별로 한 번만 합니다. 수량은 chunk_size 명씩
+    allocate 로 한 번에 계산하고(executor 가 있으면 나눠서 병렬 실행), 자문 요청과 추천 행을
+    묶음마다 bulk INSERT 후 커밋합니다. 유효한 포트폴리오가 나오지 않는 사용자는 건너뜁니다.
+    수량 계산은 이벤트 루프를 막지 않도록 executor 가 없어도 기본 스레드 풀에서 묶음 하나씩 실행하고,
+    사용자는 ID 순으로 나눠 같은 데이터면 묶음 구성이 항상 같습니다.
+
+    Args:
+        db: 데이터베이스 세션
+        portfolio_types: 대상 포트폴리오 유형 (없으면 전체)
+        chunk_size: 한 번에 계산하고 INSERT 하는 사용자 수
+        executor: 수량 계산을 실행할 executor (예: ProcessPoolExecutor, 없으면 기본 스레드 풀)
+
+    Returns:
+        Dict: 대상/생성/건너뜀 사용자 수, 추천 행 수, 소요 시간
+    """
+    started = time.perf_counter()
+    types = list(portfolio_types) if portfolio_types is not None else list(PortfolioType)
+    snapshot = await stock_universe.get(db)
+    users = (await db.execute(
+        select(User.id, User.balance, User.portfolio_type)
+        .where(User.is_active == True, User.portfolio_type.in_(types))
+        .order_by(User.id)
+    )).all()
+
+    loop = asyncio.get_running_loop()
+    summary = {"users": len(users), "requests": 0, "recommendations": 0, "skipped": 0, "universe_version": snapshot.version}
+    for portfolio_type in types:
+        members = [user for user in users if user.portfolio_type == portfolio_type]
+        stocks = select_stocks(snapshot, portfolio_type)
+        if not members:
+            continue
+        if not stocks:
+            summary["skipped"] += len(members)
+            continue
+
+        prices = np.array([stock.current_price for stock in stocks], dtype=np.float64)
+        ratio = BALANCE_RATIOS[portfolio_type]
+        weights = await portfolio_optimizer.weights(db, snapshot.version, portfolio_type, stocks)
+        if weights is not None:
+            weights = np.array(weights, dtype=np.float64)
+        chunks = list(_chunks(members, chunk_size))
+        balances = [np.array([user.balance or 0.0 for user in chunk], dtype=np.float64) for chunk in chunks]
+        if executor is not None:
+            # 모든 묶음을 먼저 제출해 나눠 계산하고, INSERT 는 묶음 순서대로 합니다.
+            jobs = [loop.run_in_executor(executor, allocate, prices, chunk_balances, ratio, weights) for chunk_balances in balances]
+        for index, chunk in enumerate(chunks):
+            if executor is not None:
+                quantities = await jobs[index]
+            else:
+                quantities = await loop.run_in_executor(None, allocate, prices, balances[index], ratio, weights)
+            requests, recommendations = _rows(stocks, portfolio_type, [user.id for user in chunk], quantities)
+            if requests:
+                await db.execute(insert(AdvisoryRequest), requests)
+                await db.execute(insert(AdvisoryRecommendation), recommendations)
+                await db.commit()
+            summary["requests"] += len(requests)
+            summary["recommendations"] += len(recommendations)
+            summary["skipped"] += len(chunk) - len(requests)
+
+    summary["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    logger.info("advisory batch: %s", summary)
+    return summary
@@ -1,20 +1,53 @@
+from datetime import datetime
 from typing import Optional, Dict, Any
 from fastapi import Request
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import engine
+from app.core.settings import settings
+from app.core.write_behind import WriteBehindBuffer
 from app.models.audit import AuditLog
 from app.schemas.audit import AuditLogCreate
-import uuid
+from app.utils.ids import new_id
 
+# 감사 로그 write-behind 버퍼 (애플리케이션 lifespan 에서 시작/종료)
+audit_sink = WriteBehindBuffer(
+    "audit_logs",
+    AuditLog.__table__,
+    engine,
+    batch_size=settings.AUDIT_BATCH_SIZE,
+    flush_interval_ms=settings.AUDIT_FLUSH_INTERVAL_MS,
+    max_queue=settings.AUDIT_QUEUE_SIZE,
+    overflow=settings.AUDIT_OVERFLOW_POLICY,
+)
 
-def create_audit_log(
-        db: Session,
+
+def is_sync_action(action: str) -> bool:
+    """
+    감사 로그를 요청 처리 중에 바로 기록해야 하는지 확인합니다.
+    write-behind 가 꺼져 있거나 버퍼가 실행 중이 아니거나(스크립트, 테스트)
+    AUDIT_SYNC_ACTIONS 에 포함된 액션이면 바로 기록합니다.
+    """
+    return (
+        not settings.AUDIT_WRITE_BEHIND
+        or not audit_sink.running
+        or action in settings.AUDIT_SYNC_ACTIONS
+    )
+
+
+async def create_audit_log(
+        db: AsyncSession,
         action: str,
         user_id: Optional[str] = None,
         details: Optional[Dict[str, Any]] = None,
-        request: Optional[Request] = None
+        request: Optional[Request] = None,
+        commit: bool = True
 ) -> AuditLog:
     """
     감사 로그를 생성합니다.
+
+    write-behind 버퍼가 실행 중이면 레코드를 큐에 넣고 바로 반환하며,
+    백그라운드 작업이 다른 감사 로그와 함께 배치로 INSERT 합니다.
+    이 경우 commit 인자와 관계없이 호출한 쪽의 트랜잭션과는 별도로 기록됩니다.
     
     Args:
         db: 데이터베이스 세션
@@ -22,6 +55,7 @@ def create_audit_log(
         user_id: 사용자 ID (선택사항)
         details: 추가 상세 정보 (선택사항)
         request: FastAPI Request 객체 (선택사항)
+        commit: False 이면 세션에 추가만 하고 호출한 쪽의 트랜잭션과 함께 커밋합니다.
     
     Returns:
         생성된 AuditLog 객체
@@ -33,8 +67,21 @@ def create_audit_log(
         ip_address = request.client.host
         user_agent = request.headers.get("user-agent")
 
+    if not is_sync_action(action):
+        record = {
+            "id": new_id(),
+            "user_id": user_id,
+            "action": action,
+            "details": details,
+            "ip_address": ip_address,
+            "user_agent": user_agent,
+            "created_at": datetime.now(),
+        }
+        await audit_sink.put(record)
+        return AuditLog(**record)
+
     audit_log = AuditLog(
-        id=str(uuid.uuid4()),
+        id=new_id(),
         user_id=user_id,
         action=action,
         details=details,
@@ -43,18 +90,20 @@ def create_audit_log(
     )
 
     db.add(audit_log)
-    db.commit()
-    db.refresh(audit_log)
+    if commit:
+        await db.commit()
+        await db.refresh(audit_log)
 
     return audit_log
 
 
-def log_user_action(
-        db: Session,
+async def log_user_action(
+        db: AsyncSession,
         action: str,
         user_id: str,
         details: Optional[Dict[str, Any]] = None,
-        request: Optional[Request] = None
+        request: Optional[Request] = None,
+        commit: bool = True
 ) -> None:
     """
     사용자 행동을 로깅합니다.
@@ -65,12 +114,13 @@ def log_user_action(
         user_id: 사용자 ID
         details: 추가 상세 정보 (선택사항)
         request: FastAPI Request 객체 (선택사항)
+        commit: False 이면 호출한 쪽의 트랜잭션과 함께 커밋합니다.
     """
-    create_audit_log(db, action, user_id, details, request)
+    await create_audit_log(db, action, user_id, details, request, commit=commit)
 
 
-def log_system_action(
-        db: Session,
+async def log_system_action(
+        db: AsyncSession,
         action: str,
         details: Optional[Dict[str, Any]] = None,
         request: Optional[Request] = None
@@ -84,4 +134,4 @@ def log_system_action(
         details: 추가 상세 정보 (선택사항)
         request: FastAPI Request 객체 (선택사항)
     """
-    create_audit_log(db, action, None, details, request)
+    await create_audit_log(db, action, None, details, request)
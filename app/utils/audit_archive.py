@@ -0,0 +1,301 @@
+import gzip
+import json
+import logging
+import os
+import re
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from sqlalchemy import func, select, text
+from sqlalchemy.engine import Connection, Engine
+
+from app.models.audit import AuditLog
+
+logger = logging.getLogger(__name__)
+
+TABLE = AuditLog.__table__
+
+# 보관 파일에 저장하는 컬럼 (생성 컬럼은 details 에서 다시 계산할 수 있으므로 제외)
+STORED_COLUMNS = [column for column in TABLE.c if column.computed is None]
+
+# 월 파티션 이름 (p202610 = 2026년 10월) 과 최댓값 파티션 이름
+PARTITION_NAME = re.compile(r"^p(\d{4})(\d{2})$")
+MAX_PARTITION = "pmax"
+
+# 보관 파일 이름 (audit_logs-2026-10.ndjson.gz)
+ARCHIVE_NAME = re.compile(r"^audit_logs-(\d{4})-(\d{2})\.ndjson\.gz$")
+
+
+def month_start(value: datetime) -> date:
+    """해당 시각이 속한 달의 1일을 반환합니다."""
+    return date(value.year, value.month, 1)
+
+
+def add_months(month: date, months: int) -> date:
+    """month(1일)에서 months 개월 뒤(음수면 앞)의 1일을 반환합니다."""
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def retention_horizon(now: datetime, retention_months: int) -> datetime:
+    """
+    DB 에 보관하는 가장 오래된 시각을 반환합니다.
+    이번 달을 포함해 retention_months 개월을 보관하므로, 이보다 이전 달은 보관 대상입니다.
+    """
+    horizon = add_months(month_start(now), -(retention_months - 1))
+    return datetime(horizon.year, horizon.month, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"p{month.year:04d}{month.month:02d}"
+
+
+def partition_definition(month: date) -> str:
+    """month 한 달의 행을 담는 RANGE 파티션 정의를 반환합니다."""
+    return f"PARTITION {partition_name(month)} VALUES LESS THAN (TO_DAYS('{add_months(month, 1).isoformat()}'))"
+
+
+def partition_clause(first: date, last: date) -> str:
+    """
+    first 부터 last 달까지의 월 파티션과 최댓값 파티션으로 구성된 PARTITION BY 절을 반환합니다.
+    first 이전 행은 첫 파티션에 들어갑니다.
+    """
+    definitions = []
+    month = first
+    while month <= last:
+        definitions.append(partition_definition(month))
+        month = add_months(month, 1)
+    definitions.append(f"PARTITION {MAX_PARTITION} VALUES LESS THAN MAXVALUE")
+    return "PARTITION BY RANGE (TO_DAYS(created_at)) (\n    " + ",\n    ".join(definitions) + "\n)"
+
+
+def is_partitioned(conn: Connection) -> bool:
+    return conn.dialect.name == "mysql" and bool(list_partitions(conn))
+
+
+def list_partitions(conn: Connection) -> List[str]:
+    """audit_logs 의 파티션 이름 목록을 순서대로 반환합니다. (MySQL 전용)"""
+    rows = conn.execute(
+        text(
+            "SELECT partition_name FROM information_schema.partitions "
+            "WHERE table_schema = DATABASE() AND table_name = :table AND partition_name IS NOT NULL "
+            "ORDER BY partition_ordinal_position"
+        ),
+        {"table": TABLE.name},
+    ).scalars().all()
+    return list(rows)
+
+
+def ensure_partitions(conn: Connection, through: date) -> List[str]:
+    """
+    through 달까지의 월 파티션이 있도록 최댓값 파티션을 나눕니다.
+    최댓값 파티션이 비어 있으면 데이터 이동 없이 메타데이터만 바뀝니다.
+
+    Returns:
+        List[str]: 새로 만든 파티션 이름 목록
+    """
+    existing = [name for name in list_partitions(conn) if PARTITION_NAME.match(name)]
+    if not existing:
+        return []
+    year, month = PARTITION_NAME.match(existing[-1]).groups()
+    next_month = add_months(date(int(year), int(month), 1), 1)
+
+    definitions, created = [], []
+    while next_month <= through:
+        definitions.append(partition_definition(next_month))
+        created.append(partition_name(next_month))
+        next_month = add_months(next_month, 1)
+    if definitions:
+        definitions.append(f"PARTITION {MAX_PARTITION} VALUES LESS THAN MAXVALUE")
+        conn.execute(text(
+            f"ALTER TABLE {TABLE.name} REORGANIZE PARTITION {MAX_PARTITION} INTO ({', '.join(definitions)})"
+        ))
+    return created
+
+
+def expired_months(conn: Connection, horizon: datetime) -> List[date]:
+    """horizon 이전에 행이 남아 있는 달 목록을 오래된 순서로 반환합니다."""
+    if is_partitioned(conn):
+        months = []
+        for name in list_partitions(conn):
+            match = PARTITION_NAME.match(name)
+            if match:
+                month = date(int(match.group(1)), int(match.group(2)), 1)
+                if month < horizon.date():
+                    months.append(month)
+        return months
+
+    oldest = conn.execute(select(func.min(TABLE.c.created_at))).scalar()
+    if oldest is None or oldest >= horizon:
+        return []
+    months, month = [], month_start(oldest)
+    while month < horizon.date():
+        months.append(month)
+        month = add_months(month, 1)
+    return months
+
+
+def archive_path(archive_dir: str, month: date) -> Path:
+    return Path(archive_dir) / f"audit_logs-{month.year:04d}-{month.month:02d}.ndjson.gz"
+
+
+def _month_range(month: date):
+    start = datetime(month.year, month.month, 1)
+    end_month = add_months(month, 1)
+    end = datetime(end_month.year, end_month.month, 1)
+    return TABLE.c.created_at >= start, TABLE.c.created_at < end
+
+
+def _in_month(conn: Connection, statement, month: date):
+    # 파티션 테이블은 파티션을 직접 지정해 그 파티션의 모든 행(= DROP PARTITION 으로 지워질 행)을 대상으로 합니다.
+    if is_partitioned(conn):
+        return statement.with_hint(TABLE, f"PARTITION ({partition_name(month)})", "mysql")
+    return statement.where(*_month_range(month))
+
+
+def count_month(conn: Connection, month: date) -> int:
+    return conn.execute(_in_month(conn, select(func.count()).select_from(TABLE), month)).scalar()
+
+
+def row_to_json(row: Dict[str, Any]) -> str:
+    """감사 로그 행을 NDJSON 한 줄(개행 제외)로 변환합니다."""
+    return json.dumps(
+        {key: value.isoformat() if isinstance(value, datetime) else value for key, value in row.items()},
+        ensure_ascii=False,
+    )
+
+
+def export_month(conn: Connection, month: date, archive_dir: str, chunk_size: int) -> int:
+    """
+    한 달치 감사 로그를 gzip 압축 NDJSON 파일로 내보냅니다.
+    서버 측 커서로 chunk_size 행씩 읽어 메모리 사용량을 일정하게 유지하고,
+    임시 파일에 모두 쓴 뒤 이름을 바꿔 반쯤 쓰인 보관 파일이 남지 않게 합니다.
+
+    Returns:
+        int: 내보낸 행 수
+    """
+    path = archive_path(archive_dir, month)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+
+    statement = _in_month(conn, select(*STORED_COLUMNS), month).order_by(TABLE.c.created_at, TABLE.c.id)
+    result = conn.execution_options(stream_results=True, yield_per=chunk_size).execute(statement)
+
+    exported = 0
+    with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+        for chunk in result.mappings().partitions():
+            f.writelines(row_to_json(row) + "\n" for row in chunk)
+            exported += len(chunk)
+    os.replace(tmp_path, path)
+    return exported
+
+
+def drop_month(conn: Connection, month: date) -> None:
+    """보관이 끝난 달을 DB 에서 지웁니다. 파티션 테이블이면 파티션을 통째로 제거합니다."""
+    if is_partitioned(conn):
+        conn.execute(text(f"ALTER TABLE {TABLE.name} DROP PARTITION {partition_name(month)}"))
+    else:
+        conn.execute(TABLE.delete().where(*_month_range(month)))
+
+
+def run_retention(
+        engine: Engine,
+        now: datetime,
+        retention_months: int,
+        archive_dir: str,
+        chunk_size: int = 10000,
+        months_ahead: int = 3
+) -> List[Dict]:
+    """
+    보관 기간이 지난 달의 감사 로그를 파일로 옮기고 DB 에서 지웁니다.
+    파티션 테이블이면 미래 파티션도 미리 만들어 둡니다.
+
+    Args:
+        engine: 동기 엔진
+        now: 기준 시각
+        retention_months: DB 에 보관하는 개월 수 (이번 달 포함)
+        archive_dir: 보관 디렉토리
+        chunk_size: 한 번에 읽는 행 수
+        months_ahead: 미리 만들어 둘 미래 파티션 개월 수
+
+    Returns:
+        List[Dict]: 보관한 달과 행 수 목록
+    """
+    horizon = retention_horizon(now, retention_months)
+    archived = []
+
+    with engine.connect() as conn:
+        months = expired_months(conn, horizon)
+        conn.rollback()
+
+    for month in months:
+        with engine.connect() as conn:
+            exported = export_month(conn, month, archive_dir, chunk_size)
+            conn.rollback()
+        with engine.begin() as conn:
+            # 내보낸 뒤 들어온 행이 있으면 지우지 않고 다음 실행에서 다시 내보냅니다.
+            remaining = count_month(conn, month)
+            if remaining != exported:
+                logger.warning("audit_logs %s changed during export (%d != %d), skipping drop", month, remaining, exported)
+                continue
+            drop_month(conn, month)
+        archived.append({"month": month.isoformat()[:7], "rows": exported, "path": str(archive_path(archive_dir, month))})
+        logger.info("archived audit_logs %s (%d rows)", month, exported)
+
+    with engine.begin() as conn:
+        if is_partitioned(conn):
+            ensure_partitions(conn, add_months(month_start(now), months_ahead))
+
+    return archived
+
+
+def archived_months(archive_dir: str) -> List[str]:
+    """보관 파일이 있는 달 목록(YYYY-MM)을 반환합니다."""
+    directory = Path(archive_dir)
+    if not directory.is_dir():
+        return []
+    months = []
+    for path in directory.iterdir():
+        match = ARCHIVE_NAME.match(path.name)
+        if match:
+            months.append(f"{match.group(1)}-{match.group(2)}")
+    return sorted(months)
+
+
+def read_archive(
+        archive_dir: str,
+        month: date,
+        action: Optional[str] = None,
+        user_id: Optional[str] = None,
+        limit: Optional[int] = None
+) -> Iterator[Dict]:
+    """
+    보관된 한 달치 감사 로그를 파일에서 순서대로 읽습니다.
+
+    Args:
+        archive_dir: 보관 디렉토리
+        month: 조회할 달 (1일)
+        action: 액션 필터 (선택사항)
+        user_id: 사용자 ID 필터 (선택사항)
+        limit: 반환할 최대 레코드 수 (선택사항)
+
+    Yields:
+        Dict: 감사 로그 레코드 (created_at 은 datetime)
+
+    Raises:
+        FileNotFoundError: 해당 달의 보관 파일이 없는 경우
+    """
+    returned = 0
+    with gzip.open(archive_path(archive_dir, month), "rt", encoding="utf-8") as f:
+        for line in f:
+            if limit is not None and returned >= limit:
+                return
+            row = json.loads(line)
+            if action is not None and row["action"] != action:
+                continue
+            if user_id is not None and row["user_id"] != user_id:
+                continue
+            row["created_at"] = datetime.fromisoformat(row["created_at"])
+            returned += 1
+            yield row
@@ -0,0 +1,94 @@
+import csv
+import io
+import json
+from datetime import datetime
+from enum import Enum
+from typing import AsyncIterator, Optional
+
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.models.audit import AuditLog
+from app.utils.audit_archive import row_to_json
+from app.utils.audit_search import AuditLogFilter
+
+TABLE = AuditLog.__table__
+
+# 내보내기 컬럼 순서 (CSV 헤더)
+EXPORT_COLUMNS = ["id", "user_id", "action", "details", "ip_address", "user_agent", "created_at"]
+
+
+class ExportFormat(str, Enum):
+    """감사 로그 내보내기 형식"""
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv; charset=utf-8",
+}
+
+
+def export_query(filters: Optional[AuditLogFilter] = None) -> Select:
+    """
+    내보낼 감사 로그 조회 쿼리를 생성합니다.
+    ORM 객체를 만들지 않도록 테이블 컬럼을 직접 조회하고, 오래된 순으로 정렬합니다.
+
+    Args:
+        filters: 감사 로그 검색 조건 (선택사항)
+
+    Returns:
+        Select: 감사 로그 조회 쿼리
+    """
+    statement = select(*(TABLE.c[name] for name in EXPORT_COLUMNS))
+    if filters is not None:
+        statement = statement.where(*filters.conditions())
+    return statement.order_by(TABLE.c.created_at, TABLE.c.id)
+
+
+def _csv_lines(rows, header: bool = False) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(EXPORT_COLUMNS)
+    for row in rows:
+        writer.writerow([
+            json.dumps(row["details"], ensure_ascii=False) if name == "details" and row["details"] is not None
+            else row[name].isoformat() if isinstance(row[name], datetime)
+            else row[name]
+            for name in EXPORT_COLUMNS
+        ])
+    return buffer.getvalue()
+
+
+async def stream_export(
+        bind: AsyncEngine,
+        statement: Select,
+        export_format: ExportFormat,
+        chunk_size: int = 1000
+) -> AsyncIterator[str]:
+    """
+    감사 로그를 서버 측 커서로 chunk_size 행씩 읽어 NDJSON 또는 CSV 텍스트로 내보냅니다.
+    한 번에 한 청크만 메모리에 두므로 내보내는 행 수와 관계없이 메모리 사용량이 일정합니다.
+    요청 세션은 응답 전송 전에 닫히므로 별도의 커넥션을 열어 사용합니다.
+
+    Args:
+        bind: 조회할 엔진
+        statement: export_query 로 만든 조회 쿼리
+        export_format: 내보내기 형식
+        chunk_size: 한 번에 읽는 행 수
+
+    Yields:
+        str: 청크 하나를 변환한 텍스트
+    """
+    if export_format == ExportFormat.CSV:
+        yield _csv_lines([], header=True)
+
+    async with bind.connect() as conn:
+        result = await conn.stream(statement.execution_options(yield_per=chunk_size))
+        async for chunk in result.mappings().partitions():
+            if export_format == ExportFormat.CSV:
+                yield _csv_lines(chunk)
+            else:
+                yield "".join(row_to_json(row) + "\n" for row in chunk)
@@ -0,0 +1,91 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import Select, func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.audit import AuditLog
+
+TABLE = AuditLog.__table__
+
+
+@dataclass
+class AuditLogFilter:
+    """
+    감사 로그 검색 조건 (FastAPI 쿼리 파라미터로 사용)
+
+    모든 조건은 선택사항이며, 주어진 조건을 모두 만족하는 로그를 찾습니다.
+    user_id, action, ip_address 는 (컬럼, created_at, id) 인덱스로 최신순 정렬까지 처리하고,
+    금액 범위는 details.amount 생성 컬럼의 인덱스를 사용합니다.
+    """
+    user_id: Optional[str] = None
+    action: Optional[str] = None
+    ip_address: Optional[str] = None
+    start: Optional[datetime] = None  # 시작 시각 (포함)
+    end: Optional[datetime] = None  # 종료 시각 (미포함)
+    amount_min: Optional[float] = None  # details.amount 최솟값 (포함)
+    amount_max: Optional[float] = None  # details.amount 최댓값 (포함)
+
+    def conditions(self) -> list:
+        """
+        검색 조건을 WHERE 절 조건 목록으로 변환합니다.
+        ORM(select(AuditLog))과 Core(select(테이블 컬럼)) 쿼리에 모두 사용할 수 있습니다.
+        """
+        conditions = []
+        if self.user_id is not None:
+            conditions.append(TABLE.c.user_id == self.user_id)
+        if self.action is not None:
+            conditions.append(TABLE.c.action == self.action)
+        if self.ip_address is not None:
+            conditions.append(TABLE.c.ip_address == self.ip_address)
+        if self.start is not None:
+            conditions.append(TABLE.c.created_at >= self.start)
+        if self.end is not None:
+            conditions.append(TABLE.c.created_at < self.end)
+        if self.amount_min is not None:
+            conditions.append(TABLE.c.details_amount >= self.amount_min)
+        if self.amount_max is not None:
+            conditions.append(TABLE.c.details_amount <= self.amount_max)
+        return conditions
+
+
+async def _table_row_estimate(db: AsyncSession) -> Optional[int]:
+    # InnoDB 통계의 행 수 추정치 (파티션 테이블은 파티션 합계), 통계가 없으면 None
+    result = await db.execute(
+        text(
+            "SELECT table_rows FROM information_schema.tables "
+            "WHERE table_schema = DATABASE() AND table_name = :table"
+        ),
+        {"table": TABLE.name},
+    )
+    return result.scalar()
+
+
+async def approximate_count(db: AsyncSession, statement: Select, unfiltered: bool, cap: int) -> dict:
+    """
+    감사 로그 수를 빠르게 셉니다.
+
+    조건이 없으면 MySQL 테이블 통계의 추정치를 사용하고, 그 밖에는 최대 cap + 1 행까지만
+    세어 수백만 행 전체를 COUNT(*) 하지 않습니다. cap 을 넘으면 cap 을 반환합니다.
+
+    Args:
+        db: 데이터베이스 세션
+        statement: 검색 조건이 적용된 감사 로그 조회 쿼리
+        unfiltered: 검색 조건이 없는지 여부
+        cap: 정확히 셀 최대 행 수
+
+    Returns:
+        dict: count(행 수), exact(정확한 값인지 여부)
+    """
+    if unfiltered and db.bind.dialect.name == "mysql":
+        estimate = await _table_row_estimate(db)
+        if estimate is not None and estimate > cap:
+            return {"count": estimate, "exact": False}
+
+    limited = statement.with_only_columns(TABLE.c.id).order_by(None).limit(cap + 1).subquery()
+    count = (await db.execute(select(func.count()).select_from(limited))).scalar()
+    if count > cap:
+        return {"count": cap, "exact": False}
+    return {"count": count, "exact": True}
+
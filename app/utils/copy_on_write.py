@@ -0,0 +1,175 @@
+import math
+from bisect import bisect_left, insort
+from collections.abc import MutableMapping
+from typing import Any, Dict, Hashable, Iterable, Iterator, List, Tuple
+
+# CopyOnWriteDict 에서 기준 내용의 키를 지웠음을 나타내는 값
+_DELETED = object()
+
+
+class CopyOnWriteDict(MutableMapping):
+    """
+    복사본끼리 내용을 공유하는 dict
+
+    기준 내용(base)은 만든 뒤 바꾸지 않고 복사본과 공유하며, 그 뒤에 바뀐 키만 따로 둡니다.
+    - copy 는 바뀐 키 수에 비례합니다. 바뀐 키가 기준 내용 수의 제곱근 정도를 넘으면 한 번 합쳐 새 기준으로 만듭니다.
+    - 순서는 dict 와 같습니다. (기존 키를 바꾸면 제자리, 새 키와 지운 뒤 다시 넣은 키는 뒤)
+    """
+
+    def __init__(self, items: Iterable[Tuple[Hashable, Any]] = ()):
+        self._base: Dict = dict(items)
+        self._replaced: Dict = {}  # 기준 내용의 키 -> 바뀐 값 (지웠으면 _DELETED)
+        self._added: Dict = {}  # 기준 내용 뒤에 오는 키 (새 키, 지운 뒤 다시 넣은 키)
+        self._len = len(self._base)
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __getitem__(self, key):
+        if key in self._added:
+            return self._added[key]
+        value = self._replaced.get(key, self._base.get(key, _DELETED)) if self._replaced else self._base[key]
+        if value is _DELETED:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key) -> bool:
+        if key in self._added:
+            return True
+        if self._replaced and key in self._replaced:
+            return self._replaced[key] is not _DELETED
+        return key in self._base
+
+    def __iter__(self) -> Iterator:
+        if self._replaced:
+            replaced = self._replaced
+            for key in self._base:
+                if replaced.get(key) is not _DELETED:
+                    yield key
+        else:
+            yield from self._base
+        yield from self._added
+
+    def values(self):
+        # 바뀐 키가 없으면 기준 내용의 view 를 그대로 사용합니다. (기준 내용은 바꾸지 않으므로 안전)
+        return self._base.values() if not self._replaced and not self._added else super().values()
+
+    def items(self):
+        return self._base.items() if not self._replaced and not self._added else super().items()
+
+    def __setitem__(self, key, value) -> None:
+        if key in self._added:
+            self._added[key] = value
+        elif key in self._base and self._replaced.get(key) is not _DELETED:
+            self._replaced[key] = value
+        else:
+            self._added[key] = value
+            self._len += 1
+
+    def __delitem__(self, key) -> None:
+        if key in self._added:
+            del self._added[key]
+        elif key in self._base and self._replaced.get(key) is not _DELETED:
+            self._replaced[key] = _DELETED
+        else:
+            raise KeyError(key)
+        self._len -= 1
+
+    def _compact(self) -> None:
+        base, replaced = {}, self._replaced
+        for key, value in self._base.items():
+            value = replaced.get(key, value)
+            if value is not _DELETED:
+                base[key] = value
+        base.update(self._added)
+        self._base, self._replaced, self._added = base, {}, {}
+
+    def copy(self) -> "CopyOnWriteDict":
+        """같은 내용의 새 dict 를 반환합니다. (기준 내용은 공유하므로 한쪽을 바꿔도 다른 쪽은 그대로)"""
+        if len(self._replaced) + len(self._added) > max(64, 2 * math.isqrt(len(self._base))):
+            self._compact()
+        other = CopyOnWriteDict.__new__(CopyOnWriteDict)
+        other._base = self._base
+        other._replaced = dict(self._replaced)
+        other._added = dict(self._added)
+        other._len = self._len
+        return other
+
+
+class CopyOnWriteSortedList:
+    """
+    복사본끼리 조각(chunk)을 공유하는 정렬 목록
+
+    값을 정렬된 조각 여러 개로 나눠 두고, copy 는 조각 목록만 복사합니다. 공유 중인 조각은 바꾸기 전에
+    그 조각만 복사하므로(copy-on-write) 복사는 O(n / chunk_size), 추가/삭제는 O(chunk_size + log n) 입니다.
+    """
+
+    def __init__(self, values: Iterable = (), chunk_size: int = 512):
+        self._chunk_size = chunk_size
+        values = sorted(values)
+        self._chunks: List[list] = [values[start:start + chunk_size] for start in range(0, len(values), chunk_size)]
+        self._maxes: List = [chunk[-1] for chunk in self._chunks]
+        # 조각을 바꿀 수 있는 목록의 토큰 (copy 하면 양쪽 모두 새 토큰을 받아 공유 조각을 바꾸지 않음)
+        self._token = object()
+        self._owners: List[object] = [self._token] * len(self._chunks)
+        self._len = len(values)
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __iter__(self) -> Iterator:
+        for chunk in self._chunks:
+            yield from chunk
+
+    def copy(self) -> "CopyOnWriteSortedList":
+        """같은 내용의 새 목록을 반환합니다. (조각은 공유하고, 어느 쪽이든 바꿀 때 그 조각만 복사)"""
+        other = CopyOnWriteSortedList.__new__(CopyOnWriteSortedList)
+        other._chunk_size = self._chunk_size
+        other._chunks = list(self._chunks)
+        other._maxes = list(self._maxes)
+        other._token = object()
+        other._owners = list(self._owners)
+        other._len = self._len
+        self._token = object()
+        return other
+
+    def _writable(self, position: int) -> list:
+        if self._owners[position] is not self._token:
+            self._chunks[position] = list(self._chunks[position])
+            self._owners[position] = self._token
+        return self._chunks[position]
+
+    def add(self, value) -> None:
+        if not self._chunks:
+            self._chunks.append([value])
+            self._maxes.append(value)
+            self._owners.append(self._token)
+            self._len = 1
+            return
+        position = min(bisect_left(self._maxes, value), len(self._chunks) - 1)
+        chunk = self._writable(position)
+        insort(chunk, value)
+        self._maxes[position] = chunk[-1]
+        self._len += 1
+        if len(chunk) > 2 * self._chunk_size:
+            half = len(chunk) // 2
+            self._chunks[position:position + 1] = [chunk[:half], chunk[half:]]
+            self._maxes[position:position + 1] = [chunk[half - 1], chunk[-1]]
+            self._owners[position:position + 1] = [self._token, self._token]
+
+    def remove(self, value) -> None:
+        """값을 하나 뺍니다. 없으면 ValueError 를 발생시킵니다."""
+        position = bisect_left(self._maxes, value)
+        if position < len(self._chunks):
+            chunk = self._chunks[position]
+            index = bisect_left(chunk, value)
+            if index < len(chunk) and chunk[index] == value:
+                chunk = self._writable(position)
+                del chunk[index]
+                self._len -= 1
+                if chunk:
+                    self._maxes[position] = chunk[-1]
+                else:
+                    del self._chunks[position], self._maxes[position], self._owners[position]
+                return
+        raise ValueError(f"{value!r} not in list")
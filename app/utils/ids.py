@@ -0,0 +1,56 @@
+import os
+import threading
+import time
+import uuid
+
+from app.core.settings import PrimaryKeyFormat, settings
+
+_lock = threading.Lock()
+_last_ms = 0
+_counter = 0
+
+
+def uuid7() -> uuid.UUID:
+    """
+    RFC 9562 UUIDv7 을 생성합니다.
+
+    상위 48비트는 밀리초 단위 Unix 시간이므로 생성 순서대로 정렬됩니다.
+    같은 밀리초 안에서는 12비트 카운터(rand_a)를 증가시켜 한 프로세스 안의
+    단조 증가를 보장하고, 나머지 62비트는 무작위 값으로 채웁니다.
+
+    Returns:
+        uuid.UUID: 버전 7 UUID
+    """
+    global _last_ms, _counter
+    with _lock:
+        now_ms = time.time_ns() // 1_000_000
+        if now_ms > _last_ms:
+            _last_ms = now_ms
+            _counter = int.from_bytes(os.urandom(2), "big") & 0x7FF
+        else:
+            _counter += 1
+            if _counter > 0xFFF:
+                # 카운터가 넘치면 다음 밀리초로 넘어간 것처럼 처리합니다.
+                _last_ms += 1
+                _counter = 0
+        timestamp_ms, counter = _last_ms, _counter
+
+    rand_b = int.from_bytes(os.urandom(8), "big") & ((1 << 62) - 1)
+    value = (timestamp_ms & ((1 << 48) - 1)) << 80
+    value |= 0x7 << 76
+    value |= counter << 64
+    value |= 0b10 << 62
+    value |= rand_b
+    return uuid.UUID(int=value)
+
+
+def new_id() -> str:
+    """
+    설정된 기본 키 형식에 맞는 새 ID 를 문자열로 반환합니다.
+
+    Returns:
+        str: UUID 문자열 (PRIMARY_KEY_FORMAT 이 uuid7_binary 이면 UUIDv7)
+    """
+    if settings.PRIMARY_KEY_FORMAT == PrimaryKeyFormat.UUID7_BINARY:
+        return str(uuid7())
+    return str(uuid.uuid4())
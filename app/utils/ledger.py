@@ -0,0 +1,91 @@
+from datetime import datetime
+from typing import Optional
+
+from fastapi import HTTPException, Request, status
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.deposit_withdrawal import DepositWithdrawal, DepositWithdrawalStatus, DepositWithdrawalType
+from app.models.user import User
+from app.utils.audit import is_sync_action, log_user_action
+from app.utils.ids import new_id
+
+# 거래 유형별 감사 로그 액션
+AUDIT_ACTIONS = {
+    DepositWithdrawalType.DEPOSIT: "deposit",
+    DepositWithdrawalType.WITHDRAWAL: "withdraw",
+}
+
+
+async def post_transaction(
+        db: AsyncSession,
+        user: User,
+        transaction_type: DepositWithdrawalType,
+        amount: float,
+        request: Optional[Request] = None
+) -> DepositWithdrawal:
+    """
+    입출금을 하나의 트랜잭션으로 처리합니다.
+
+    잔고는 Python 에서 읽고 고쳐 쓰지 않고 조건부 UPDATE 한 번으로 변경합니다.
+    출금은 `balance >= amount` 조건을 UPDATE 에 포함하므로 동시에 들어온 출금이
+    잔고를 음수로 만들 수 없습니다. 거래 내역은 같은 트랜잭션에서 INSERT 하고
+    한 번만 커밋하며, 값을 모두 애플리케이션에서 정하므로 커밋 후 다시 조회(refresh)하지 않습니다.
+    감사 로그는 동기 기록 대상 액션이면 같은 트랜잭션에서, 그렇지 않으면 커밋이
+    성공한 뒤 write-behind 버퍼로 기록합니다.
+
+    Args:
+        db: 데이터베이스 세션
+        user: 인증된 사용자
+        transaction_type: 입금 또는 출금
+        amount: 거래 금액
+        request: FastAPI Request 객체 (선택사항)
+
+    Returns:
+        DepositWithdrawal: 완료된 거래 내역
+
+    Raises:
+        HTTPException: 출금 금액이 잔고보다 큰 경우 (400), 입금할 사용자가 없는 경우 (404)
+    """
+    statement = update(User).where(User.id == user.id)
+    if transaction_type == DepositWithdrawalType.WITHDRAWAL:
+        statement = statement.where(User.balance >= amount).values(balance=User.balance - amount)
+    else:
+        statement = statement.values(balance=User.balance + amount)
+
+    result = await db.execute(statement.execution_options(synchronize_session=False))
+    if result.rowcount != 1:
+        # 입금 UPDATE 에는 잔고 조건이 없으므로 바뀐 행이 없으면 사용자가 없는 것입니다.
+        if transaction_type == DepositWithdrawalType.WITHDRAWAL:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="잔고가 부족합니다."
+            )
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="사용자를 찾을 수 없습니다."
+        )
+
+    transaction = DepositWithdrawal(
+        id=new_id(),
+        user_id=user.id,
+        type=transaction_type,
+        amount=amount,
+        status=DepositWithdrawalStatus.COMPLETED,
+        ip_address=request.client.host if request else None,
+        created_at=datetime.now()
+    )
+    db.add(transaction)
+
+    action = AUDIT_ACTIONS[transaction_type]
+    in_transaction = is_sync_action(action)
+    if in_transaction:
+        await log_user_action(db, action, user.id, {"amount": amount}, request, commit=False)
+    await db.commit()
+    if not in_transaction:
+        await log_user_action(db, action, user.id, {"amount": amount}, request)
+
+    # 세션에 올라간 사용자 잔고는 더 이상 DB 값과 같지 않으므로 만료시킵니다.
+    db.expire(user, ["balance"])
+
+    return transaction
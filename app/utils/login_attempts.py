@@ -0,0 +1,141 @@
+from datetime import datetime
+from typing import Optional
+
+from fastapi import HTTPException, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import engine
+from app.core.rate_limit import RateLimitBackend, create_rate_limit_backend
+from app.core.settings import settings
+from app.core.write_behind import WriteBehindBuffer
+from app.models.login_attempt import LoginAttempt
+from app.models.user import User
+from app.utils.ids import new_id
+
+# 로그인 시도 기록 write-behind 버퍼 (감사 용도, 애플리케이션 lifespan 에서 시작/종료)
+login_attempt_sink = WriteBehindBuffer(
+    "login_attempts",
+    LoginAttempt.__table__,
+    engine,
+    batch_size=settings.AUDIT_BATCH_SIZE,
+    flush_interval_ms=settings.AUDIT_FLUSH_INTERVAL_MS,
+    max_queue=settings.AUDIT_QUEUE_SIZE,
+    overflow=settings.AUDIT_OVERFLOW_POLICY,
+)
+
+
+class LoginThrottle:
+    """
+    로그인 실패 횟수 제한
+
+    LOGIN_TIMEOUT_MINUTES 슬라이딩 윈도우 안의 실패 횟수를 두 가지 키로 셉니다.
+    - 계정 + IP: 같은 IP 에서 한 계정의 비밀번호를 반복해서 시도하는 경우 (MAX_LOGIN_ATTEMPTS)
+    - IP: 한 IP 에서 여러 계정을 번갈아 시도하는 credential stuffing (LOGIN_IP_MAX_ATTEMPTS)
+    계정이 없는 이메일도 똑같이 세므로 응답으로 계정 존재 여부를 알 수 없습니다.
+    로그인에 성공하면 해당 계정 + IP 카운터만 초기화합니다.
+    """
+
+    def __init__(self, backend: RateLimitBackend):
+        self.backend = backend
+
+    @property
+    def window(self) -> float:
+        return settings.LOGIN_TIMEOUT_MINUTES * 60
+
+    @staticmethod
+    def _account_key(username: str, ip_address: str) -> str:
+        return f"login:account:{username.strip().lower()}:{ip_address}"
+
+    @staticmethod
+    def _ip_key(ip_address: str) -> str:
+        return f"login:ip:{ip_address}"
+
+    async def is_blocked(self, username: str, ip_address: str) -> bool:
+        """계정 + IP 또는 IP 의 최근 실패 횟수가 한도에 도달했는지 확인합니다."""
+        if await self.backend.count(self._ip_key(ip_address), self.window) >= settings.LOGIN_IP_MAX_ATTEMPTS:
+            return True
+        account_failures = await self.backend.count(self._account_key(username, ip_address), self.window)
+        return account_failures >= settings.MAX_LOGIN_ATTEMPTS
+
+    async def record_failure(self, username: str, ip_address: str) -> int:
+        """
+        로그인 실패를 기록합니다.
+
+        Returns:
+            int: 윈도우 안의 계정 + IP 실패 횟수 (이번 실패 포함)
+        """
+        await self.backend.hit(self._ip_key(ip_address), self.window)
+        return await self.backend.hit(self._account_key(username, ip_address), self.window)
+
+    async def record_success(self, username: str, ip_address: str) -> None:
+        await self.backend.reset(self._account_key(username, ip_address))
+
+
+login_throttle = LoginThrottle(create_rate_limit_backend())
+
+
+def client_ip(request: Request) -> str:
+    return request.client.host if request.client else "unknown"
+
+
+async def check_login_attempts(request: Request, username: str) -> None:
+    """
+    로그인 시도 횟수를 확인하고 제한을 적용합니다.
+    DB 를 조회하지 않고 요청 제한 카운터만 확인합니다.
+
+    Raises:
+        HTTPException: 실패 횟수가 한도에 도달한 경우 (429)
+    """
+    if await login_throttle.is_blocked(username, client_ip(request)):
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=f"로그인 시도 횟수가 너무 많습니다. {settings.LOGIN_TIMEOUT_MINUTES}분 후에 다시 시도해주세요.",
+            headers={"Retry-After": str(settings.LOGIN_TIMEOUT_MINUTES * 60)},
+        )
+
+
+async def record_login_attempt(
+        db: AsyncSession,
+        request: Request,
+        username: str,
+        user: Optional[User],
+        is_successful: bool
+) -> None:
+    """
+    로그인 시도를 요청 제한 카운터에 반영하고, 감사용 login_attempts 기록을 남깁니다.
+    write-behind 버퍼가 실행 중이면 기록은 백그라운드에서 배치로 INSERT 되므로
+    로그인 요청은 DB 쓰기를 기다리지 않습니다.
+
+    Args:
+        db: 데이터베이스 세션 (버퍼가 실행 중이 아닐 때만 사용)
+        request: FastAPI Request 객체
+        username: 로그인에 사용한 이메일
+        user: 로그인한 사용자 (계정이 없으면 None)
+        is_successful: 로그인 성공 여부
+    """
+    ip_address = client_ip(request)
+    if is_successful:
+        await login_throttle.record_success(username, ip_address)
+        attempt_count = 1
+    else:
+        attempt_count = await login_throttle.record_failure(username, ip_address)
+
+    now = datetime.now()
+    record = {
+        "id": new_id(),
+        "is_active": True,
+        "user_id": user.id if user else None,
+        "ip_address": ip_address,
+        "user_agent": (request.headers.get("user-agent") or "")[:255],
+        "is_successful": is_successful,
+        "attempt_count": attempt_count,
+        "last_attempt_at": now,
+        "created_at": now,
+        "updated_at": now,
+    }
+    if settings.AUDIT_WRITE_BEHIND and login_attempt_sink.running:
+        await login_attempt_sink.put(record)
+        return
+
+    db.add(LoginAttempt(**record))
+    await db.commit()
@@ -0,0 +1,316 @@
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.settings import PortfolioOptimizer, settings
+from app.models.stock import StockPrice
+from app.models.user import PortfolioType
+from app.utils.single_flight import SingleFlight
+from app.utils.universe import StockRecord
+
+logger = logging.getLogger(__name__)
+
+# 연율화에 사용하는 연간 거래일 수
+TRADING_DAYS = 252
+
+# 표본 공분산을 대각 행렬 쪽으로 줄이는 비율 (관측치가 적을 때 역행렬/최적화가 불안정해지지 않도록)
+SHRINKAGE = 0.1
+
+# 포트폴리오 유형별 평균-분산 위험회피계수 (클수록 분산을 줄이는 쪽으로 비중을 정함)
+RISK_AVERSION = {
+    PortfolioType.AGGRESSIVE: 2.0,
+    PortfolioType.BALANCED: 5.0,
+    PortfolioType.CONSERVATIVE: 10.0,
+}
+
+# 이보다 작은 비중은 0 으로 두고 나머지를 다시 나눕니다.
+# (정수 주식 배분에서 1주 남짓만 담겨 최소 투자 금액 검증에 걸리는 종목을 만들지 않도록)
+MIN_WEIGHT = 0.05
+
+
+@dataclass(frozen=True)
+class RiskModel:
+    """선택한 증권의 연율화 기대수익률과 공분산 (stock_ids 순서)"""
+    stock_ids: Tuple[str, ...]
+    mean: np.ndarray
+    cov: np.ndarray
+    observations: int
+
+
+def build_risk_model(
+        stock_ids: Sequence[str],
+        rows: Sequence[Tuple[str, date, float]],
+        min_observations: int
+) -> Optional[RiskModel]:
+    """
+    일별 종가 행에서 로그 수익률의 평균과 공분산을 계산합니다.
+    모든 종목의 종가가 있는 연속된 두 거래일의 수익률만 사용합니다.
+
+    Args:
+        stock_ids: 증권 ID 목록 (결과의 열 순서)
+        rows: (증권 ID, 거래일, 종가) 목록
+        min_observations: 필요한 최소 수익률 수
+
+    Returns:
+        Optional[RiskModel]: 관측치가 모자라거나 분산이 0 인 종목이 있으면 None
+    """
+    if not rows:
+        return None
+    columns = {stock_id: index for index, stock_id in enumerate(stock_ids)}
+    days, day_index = np.unique(np.array([row[1] for row in rows], dtype="datetime64[D]"), return_inverse=True)
+    closes = np.full((len(days), len(stock_ids)), np.nan)
+    closes[day_index, [columns[row[0]] for row in rows]] = [row[2] for row in rows]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = np.diff(np.log(closes), axis=0)
+    returns = returns[np.isfinite(returns).all(axis=1)]
+    if len(returns) < max(min_observations, 2):
+        return None
+
+    sample = np.atleast_2d(np.cov(returns, rowvar=False)) * TRADING_DAYS
+    cov = (1 - SHRINKAGE) * sample + SHRINKAGE * np.diag(np.diag(sample))
+    if not (np.diag(cov) > 0).all():
+        return None
+    return RiskModel(tuple(stock_ids), returns.mean(axis=0) * TRADING_DAYS, cov, len(returns))
+
+
+def project_simplex(values: np.ndarray) -> np.ndarray:
+    """values 를 합이 1 이고 음수가 없는 비중 중 가장 가까운 값으로 사영합니다."""
+    ordered = np.sort(values)[::-1]
+    excess = np.cumsum(ordered) - 1
+    ranks = np.arange(1, len(values) + 1)
+    last = ranks[ordered - excess / ranks > 0][-1]
+    return np.maximum(values - excess[last - 1] / last, 0.0)
+
+
+def mean_variance_weights(
+        mean: np.ndarray,
+        cov: np.ndarray,
+        risk_aversion: float,
+        deadline: float,
+        clock: Callable[[], float] = time.perf_counter,
+        tolerance: float = 1e-9
+) -> Tuple[np.ndarray, bool]:
+    """
+    공매도 없이 mean·w - risk_aversion / 2 · w'Σw 를 최대화하는 비중을 사영 경사법으로 구합니다.
+
+    Args:
+        mean: 기대수익률
+        cov: 공분산
+        risk_aversion: 위험회피계수
+        deadline: clock 기준 계산 마감 시각
+        clock: 시각 함수
+        tolerance: 수렴 판정 (반복 간 비중 변화의 L1 합)
+
+    Returns:
+        (비중, 수렴 여부): 마감 시각을 넘기면 그때까지의 비중 (항상 합 1, 음수 없음)
+    """
+    weights = np.full(len(mean), 1.0 / len(mean))
+    step = 1.0 / (risk_aversion * np.linalg.eigvalsh(cov)[-1])
+    while True:
+        updated = project_simplex(weights + step * (mean - risk_aversion * (cov @ weights)))
+        if np.abs(updated - weights).sum() < tolerance:
+            return updated, True
+        weights = updated
+        if clock() >= deadline:
+            return weights, False
+
+
+def risk_parity_weights(
+        cov: np.ndarray,
+        deadline: float,
+        clock: Callable[[], float] = time.perf_counter,
+        tolerance: float = 1e-8
+) -> Tuple[np.ndarray, bool]:
+    """
+    종목별 위험 기여도(w_i · (Σw)_i / w'Σw)가 같은 비중을 순환 좌표 하강법으로 구합니다.
+
+    Args:
+        cov: 공분산
+        deadline: clock 기준 계산 마감 시각
+        clock: 시각 함수
+        tolerance: 수렴 판정 (위험 기여도와 1/n 의 최대 차이)
+
+    Returns:
+        (비중, 수렴 여부): 마감 시각을 넘기면 그때까지의 비중 (항상 합 1, 음수 없음)
+    """
+    size = len(cov)
+    budget = 1.0 / size
+    variances = np.diag(cov)
+    scaled = 1.0 / np.sqrt(variances)  # 변동성 역수 비중에서 시작
+    while True:
+        # 0.5 y'Σy - budget · Σ log y 를 좌표별로 최소화 (y_i 에 대한 이차 방정식의 양의 근)
+        for i in range(size):
+            rest = cov[i] @ scaled - variances[i] * scaled[i]
+            scaled[i] = (-rest + np.sqrt(rest * rest + 4 * variances[i] * budget)) / (2 * variances[i])
+        weights = scaled / scaled.sum()
+        contributions = weights * (cov @ weights)
+        if np.abs(contributions / contributions.sum() - budget).max() < tolerance:
+            return weights, True
+        if clock() >= deadline:
+            return weights, False
+
+
+class PortfolioOptimizerStore:
+    """
+    포트폴리오 유형별 투자 비중 계산기 (워커 프로세스 단위)
+
+    증권 선택은 가격대별 순위 그대로 두고, 선택한 증권에 잔고를 나누는 비중만 유형별 방식으로 정합니다.
+    - price: 가격에 비례 (기존 방식, None 을 반환해 기존 계산을 그대로 사용)
+    - mean_variance / risk_parity: 일별 종가 이력의 수익률과 공분산으로 계산
+    수익률과 공분산은 (스냅샷 버전, 증권 목록) 별로, 비중은 (스냅샷 버전, 유형, 방식, 증권 목록) 별로 한 번만 계산합니다.
+    같은 키의 이력을 동시에 읽으려는 요청은 먼저 시작한 조회의 결과를 함께 사용하고, 다른 키의 조회는 기다리지 않습니다.
+    종가 이력을 바꾸면 스냅샷 버전이 올라가므로 다음 계산에서 다시 읽습니다.
+    이력이 모자라면 price 방식으로 계산합니다.
+    """
+
+    def __init__(
+            self,
+            budget_ms: float,
+            lookback_days: int,
+            min_observations: int,
+            max_entries: int = 64,
+            clock: Callable[[], float] = time.perf_counter
+    ):
+        self.budget_ms = budget_ms
+        self.lookback_days = lookback_days
+        self.min_observations = min_observations
+        self.max_entries = max_entries
+        self.clock = clock
+        self._models: "OrderedDict[Hashable, Optional[RiskModel]]" = OrderedDict()
+        self._weights: "OrderedDict[Hashable, Optional[Tuple[float, ...]]]" = OrderedDict()
+        self._flight = SingleFlight()
+        self.history_loads = 0
+        self.solves = 0
+        self.timeouts = 0
+        self.fallbacks = 0
+
+    def engine(self, portfolio_type: PortfolioType) -> PortfolioOptimizer:
+        """포트폴리오 유형의 비중 계산 방식 (PORTFOLIO_OPTIMIZERS, 지정하지 않으면 price)"""
+        return PortfolioOptimizer(settings.PORTFOLIO_OPTIMIZERS.get(portfolio_type.value, PortfolioOptimizer.PRICE))
+
+    def _remember(self, entries: OrderedDict, key: Hashable, value) -> None:
+        entries[key] = value
+        entries.move_to_end(key)
+        while len(entries) > self.max_entries:
+            entries.popitem(last=False)
+
+    async def risk_model(self, db: AsyncSession, version: int, stock_ids: Sequence[str]) -> Optional[RiskModel]:
+        """
+        스냅샷 버전의 증권 목록에 대한 수익률/공분산을 반환합니다. (버전별로 이력을 한 번만 읽음)
+
+        Args:
+            db: 데이터베이스 세션
+            version: 활성 증권 스냅샷 버전
+            stock_ids: 증권 ID 목록
+
+        Returns:
+            Optional[RiskModel]: 이력이 모자라면 None
+        """
+        key = (version, tuple(stock_ids))
+        if key in self._models:
+            self._models.move_to_end(key)
+            return self._models[key]
+
+        async def load() -> Optional[RiskModel]:
+            since = date.today() - timedelta(days=self.lookback_days)
+            result = await db.execute(
+                select(StockPrice.stock_id, StockPrice.trade_date, StockPrice.close_price)
+                .where(StockPrice.stock_id.in_(stock_ids), StockPrice.trade_date >= since)
+            )
+            model = build_risk_model(stock_ids, result.all(), self.min_observations)
+            self.history_loads += 1
+            self._remember(self._models, key, model)
+            return model
+
+        model, _ = await self._flight.do(key, load)
+        return model
+
+    async def weights(
+            self,
+            db: AsyncSession,
+            version: int,
+            portfolio_type: PortfolioType,
+            stocks: Sequence[StockRecord]
+    ) -> Optional[List[float]]:
+        """
+        선택한 증권에 잔고를 나누는 비중을 반환합니다.
+
+        Args:
+            db: 데이터베이스 세션
+            version: 활성 증권 스냅샷 버전
+            portfolio_type: 포트폴리오 유형
+            stocks: 선택한 증권 (select_stocks 결과)
+
+        Returns:
+            Optional[List[float]]: stocks 순서의 비중 (합 1), price 방식이면 None
+        """
+        engine = self.engine(portfolio_type)
+        if engine is PortfolioOptimizer.PRICE or len(stocks) < 2:
+            return None
+
+        stock_ids = tuple(stock.id for stock in stocks)
+        key = (version, portfolio_type, engine, stock_ids)
+        if key not in self._weights:
+            model = await self.risk_model(db, version, stock_ids)
+            self._remember(self._weights, key, self._solve(engine, portfolio_type, model))
+        self._weights.move_to_end(key)
+        weights = self._weights[key]
+        return list(weights) if weights is not None else None
+
+    def _solve(
+            self,
+            engine: PortfolioOptimizer,
+            portfolio_type: PortfolioType,
+            model: Optional[RiskModel]
+    ) -> Optional[Tuple[float, ...]]:
+        if model is None:
+            self.fallbacks += 1
+            logger.info("optimizer %s for %s: not enough price history, using price weights", engine.value, portfolio_type.value)
+            return None
+
+        deadline = self.clock() + self.budget_ms / 1000
+        if engine is PortfolioOptimizer.MEAN_VARIANCE:
+            weights, converged = mean_variance_weights(
+                model.mean, model.cov, RISK_AVERSION[portfolio_type], deadline, self.clock
+            )
+        else:
+            weights, converged = risk_parity_weights(model.cov, deadline, self.clock)
+        self.solves += 1
+        if not converged:
+            self.timeouts += 1
+            logger.warning("optimizer %s for %s: budget %sms exceeded", engine.value, portfolio_type.value, self.budget_ms)
+
+        weights = np.where(weights < MIN_WEIGHT, 0.0, weights)
+        return tuple((weights / weights.sum()).tolist())
+
+    def clear(self) -> None:
+        self._models.clear()
+        self._weights.clear()
+
+    def stats(self) -> Dict:
+        """유형별 방식, 캐시 항목 수와 이력 조회/계산/시간 초과/price 대체 횟수를 반환합니다."""
+        return {
+            "engines": {portfolio_type.value: self.engine(portfolio_type).value for portfolio_type in PortfolioType},
+            "budget_ms": self.budget_ms,
+            "lookback_days": self.lookback_days,
+            "models": len(self._models),
+            "weights": len(self._weights),
+            "history_loads": self.history_loads,
+            "solves": self.solves,
+            "timeouts": self.timeouts,
+            "fallbacks": self.fallbacks,
+        }
+
+
+# 워커 프로세스 전역 비중 계산기
+portfolio_optimizer = PortfolioOptimizerStore(
+    settings.OPTIMIZER_BUDGET_MS, settings.OPTIMIZER_LOOKBACK_DAYS, settings.OPTIMIZER_MIN_OBSERVATIONS
+)
@@ -0,0 +1,115 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Sequence
+
+from fastapi import HTTPException, Response, status
+from sqlalchemy import DateTime, Select, and_, or_
+from sqlalchemy.sql.elements import ColumnElement
+
+# 다음 페이지 커서를 담는 응답 헤더
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class Keyset:
+    """
+    키셋(커서) 페이지네이션 정의
+
+    정렬 키 컬럼 목록으로 정렬하고, 커서가 가리키는 마지막 행 다음부터 조회합니다.
+    OFFSET 과 달리 앞 페이지의 행을 건너뛰며 읽지 않으므로 깊은 페이지도
+    첫 페이지와 같은 비용으로 조회합니다. 마지막 컬럼은 유일해야 합니다.
+    """
+
+    def __init__(self, *columns: ColumnElement, descending: bool = False):
+        self.columns = columns
+        self.descending = descending
+
+    def apply(self, statement: Select, cursor: Optional[str]) -> Select:
+        """
+        쿼리에 정렬 조건과 커서 이후 조건을 추가합니다.
+
+        Args:
+            statement: 조회 쿼리
+            cursor: 이전 페이지 응답의 커서 (없으면 첫 페이지)
+
+        Returns:
+            Select: 정렬/커서 조건이 추가된 쿼리
+        """
+        order = [column.desc() if self.descending else column.asc() for column in self.columns]
+        statement = statement.order_by(*order)
+        if cursor is None:
+            return statement
+        return statement.where(self._after(list(self.columns), self.decode(cursor)))
+
+    def _after(self, columns: List[ColumnElement], values: List[Any]):
+        # (a, b) > (x, y) 를 a >= x AND (a > x OR b > y) 로 풀어 씁니다.
+        # 선두 컬럼에 범위 조건이 걸리므로 MySQL/SQLite 모두 인덱스 범위 스캔을 사용합니다.
+        column, value = columns[0], values[0]
+        if len(columns) == 1:
+            return column < value if self.descending else column > value
+        bound = column <= value if self.descending else column >= value
+        strict = column < value if self.descending else column > value
+        return and_(bound, or_(strict, self._after(columns[1:], values[1:])))
+
+    def next_cursor(self, rows: Sequence[Any], limit: int) -> Optional[str]:
+        """
+        조회 결과로 다음 페이지 커서를 만듭니다.
+
+        Args:
+            rows: 조회된 ORM 객체 목록
+            limit: 요청한 페이지 크기
+
+        Returns:
+            Optional[str]: 다음 페이지 커서 (마지막 페이지면 None)
+        """
+        if not rows or len(rows) < limit:
+            return None
+        last = rows[-1]
+        values = [getattr(last, column.key) for column in self.columns]
+        payload = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+        return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+    def decode(self, cursor: str) -> List[Any]:
+        """커서를 정렬 키 값 목록으로 복원합니다."""
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded))
+            if not isinstance(payload, list) or len(payload) != len(self.columns):
+                raise ValueError(cursor)
+            return [
+                datetime.fromisoformat(value) if isinstance(column.type, DateTime) else value
+                for column, value in zip(self.columns, payload)
+            ]
+        except (binascii.Error, UnicodeDecodeError, TypeError, ValueError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="잘못된 커서입니다."
+            )
+
+
+def paginate(statement: Select, keyset: Keyset, cursor: Optional[str], skip: int, limit: int) -> Select:
+    """
+    커서가 있으면 키셋 페이지네이션을, 없으면 기존 OFFSET 페이지네이션을 적용합니다.
+
+    Args:
+        statement: 조회 쿼리
+        keyset: 정렬 키 정의
+        cursor: 이전 페이지 응답의 커서
+        skip: 건너뛸 레코드 수 (커서가 없을 때만 사용, 하위 호환용)
+        limit: 반환할 최대 레코드 수
+
+    Returns:
+        Select: 페이지네이션이 적용된 쿼리
+    """
+    statement = keyset.apply(statement, cursor)
+    if cursor is None and skip:
+        statement = statement.offset(skip)
+    return statement.limit(limit)
+
+
+def set_next_cursor(response: Response, keyset: Keyset, rows: Sequence[Any], limit: int) -> None:
+    """다음 페이지가 있으면 응답 헤더에 커서를 담습니다."""
+    cursor = keyset.next_cursor(rows, limit)
+    if cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
@@ -1,14 +1,53 @@
 import random
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Sequence, Tuple
 
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.stock import Stock
 from app.models.user import PortfolioType
+from app.utils.optimizer import portfolio_optimizer
+from app.utils.recommendation_cache import recommendation_cache
+from app.utils.universe import StockRecord, UniverseSnapshot, stock_universe
+
+# 포트폴리오 유형별 가격대별 최소 주식 수 (앞선 가격대부터 차례로 선택)
+PRICE_TIERS = {
+    PortfolioType.AGGRESSIVE: [
+        {"max_price": 100000, "count": 2},  # 10만원 이하
+        {"max_price": 500000, "count": 2},  # 50만원 이하
+        {"max_price": float('inf'), "count": 1}  # 나머지
+    ],
+    PortfolioType.BALANCED: [
+        {"max_price": 100000, "count": 2},
+        {"max_price": 300000, "count": 1},
+        {"max_price": float('inf'), "count": 1}
+    ],
+    PortfolioType.CONSERVATIVE: [
+        {"max_price": 100000, "count": 2},
+        {"max_price": float('inf'), "count": 1}
+    ],
+}
+
+# 포트폴리오 유형별 투자에 사용하는 잔고 비율
+BALANCE_RATIOS = {
+    PortfolioType.AGGRESSIVE: 0.95,  # 잔고의 95% 사용
+    PortfolioType.BALANCED: 0.7,  # 잔고의 70% 사용
+    PortfolioType.CONSERVATIVE: 0.5,  # 잔고의 50% 사용
+}
+
+# 증권당 최소 투자 금액 (10만원)
+MIN_INVESTMENT = 100000
+
+
+def select_stocks(snapshot: UniverseSnapshot, portfolio_type: PortfolioType) -> List[StockRecord]:
+    """
+    포트폴리오 유형의 가격대별로 시가총액 x 거래량 가중치가 큰 증권을 고릅니다.
+    (앞선 가격대에서 고른 증권은 제외, 가중치가 같으면 조회 순서가 앞선 증권 우선, 가격대별 순위 색인의 앞부분만 읽음)
+    선택은 잔고와 관계없으므로 같은 스냅샷 버전에서는 유형별로 항상 같습니다.
+    """
+    return [snapshot.by_id[stock_id] for stock_id in snapshot.ranking.select(PRICE_TIERS[portfolio_type])]
 
 
-def calculate_portfolio(
-        db: Session,
+async def calculate_portfolio(
+        db: AsyncSession,
         balance: float,
         portfolio_type: PortfolioType,
         min_stocks: int = 3,
@@ -27,39 +66,85 @@ def calculate_portfolio(
     Returns:
         추천 증권 목록 (증권 ID, 수량, 가격 포함)
     """
-    # 사용 가능한 모든 증권 조회
-    available_stocks = db.query(Stock).filter(Stock.is_active == True).all()
+    # 사용 가능한 모든 증권 (워커 메모리의 활성 증권 스냅샷)
+    snapshot = await stock_universe.get(db)
+    # 증권은 한 번만 고르고, 비중은 고른 목록 그대로 계산해 함께 넘깁니다.
+    stocks = select_stocks(snapshot, portfolio_type)
+    weights = await portfolio_optimizer.weights(db, snapshot.version, portfolio_type, stocks)
+    return portfolio_from_snapshot(snapshot, balance, portfolio_type, min_stocks, max_stocks, stocks, weights)
+
+
+async def recommend_portfolio(
+        db: AsyncSession,
+        balance: float,
+        portfolio_type: PortfolioType
+) -> List[Dict[str, any]]:
+    """
+    calculate_portfolio 결과를 (스냅샷 버전, 포트폴리오 유형, 원 단위 잔고) 로 캐시해 반환합니다.
+    같은 키의 동시 요청은 한 번만 계산합니다. 잔고의 원 미만은 버리고 계산합니다.
+    
+    Args:
+        db: 데이터베이스 세션
+        balance: 사용자 잔고
+        portfolio_type: 포트폴리오 유형
+    
+    Returns:
+        추천 증권 목록 (호출마다 새 목록)
+    """
+    snapshot = await stock_universe.get(db)
+    balance_krw = int(balance)
 
-    if not available_stocks:
+    async def compute() -> List[Dict[str, any]]:
+        stocks = select_stocks(snapshot, portfolio_type)
+        weights = await portfolio_optimizer.weights(db, snapshot.version, portfolio_type, stocks)
+        return portfolio_from_snapshot(snapshot, balance_krw, portfolio_type, stocks=stocks, weights=weights)
+
+    return await recommendation_cache.get_or_compute((snapshot.version, portfolio_type, balance_krw), compute)
+
+
+def portfolio_from_snapshot(
+        snapshot: UniverseSnapshot,
+        balance: float,
+        portfolio_type: PortfolioType,
+        min_stocks: int = 3,
+        max_stocks: int = 5,
+        stocks: Optional[Sequence[StockRecord]] = None,
+        weights: Optional[Sequence[float]] = None
+) -> List[Dict[str, any]]:
+    """
+    활성 증권 스냅샷에서 증권 추천을 계산합니다. (같은 스냅샷 버전과 입력이면 결과가 같습니다)
+    
+    Args:
+        snapshot: 활성 증권 스냅샷
+        balance: 사용자 잔고
+        portfolio_type: 포트폴리오 유형
+        min_stocks: 최소 증권 수
+        max_stocks: 최대 증권 수
+        stocks: 이미 고른 증권 (select_stocks 결과, 없으면 snapshot 에서 고름)
+        weights: stocks 순서의 투자 비중 (portfolio_optimizer.weights, 없으면 가격 비례)
+    
+    Returns:
+        추천 증권 목록 (증권 ID, 수량, 가격 포함)
+    """
+    if not len(snapshot):
         return []
 
     # 포트폴리오 유형에 따른 설정
     portfolio_settings = {
         PortfolioType.AGGRESSIVE: {
             "num_stocks": max_stocks,
-            "balance_ratio": 0.95,  # 잔고의 95% 사용
-            "min_stocks_by_price": [  # 가격대별 최소 주식 수
-                {"max_price": 100000, "count": 2},  # 10만원 이하
-                {"max_price": 500000, "count": 2},  # 50만원 이하
-                {"max_price": float('inf'), "count": 1}  # 나머지
-            ]
+            "balance_ratio": BALANCE_RATIOS[PortfolioType.AGGRESSIVE],
+            "min_stocks_by_price": PRICE_TIERS[PortfolioType.AGGRESSIVE]
         },
         PortfolioType.BALANCED: {
             "num_stocks": (min_stocks + max_stocks) // 2,
-            "balance_ratio": 0.7,  # 잔고의 70% 사용
-            "min_stocks_by_price": [
-                {"max_price": 100000, "count": 2},
-                {"max_price": 300000, "count": 1},
-                {"max_price": float('inf'), "count": 1}
-            ]
+            "balance_ratio": BALANCE_RATIOS[PortfolioType.BALANCED],
+            "min_stocks_by_price": PRICE_TIERS[PortfolioType.BALANCED]
         },
         PortfolioType.CONSERVATIVE: {
             "num_stocks": min_stocks,
-            "balance_ratio": 0.5,  # 잔고의 50% 사용
-            "min_stocks_by_price": [
-                {"max_price": 100000, "count": 2},
-                {"max_price": float('inf'), "count": 1}
-            ]
+            "balance_ratio": BALANCE_RATIOS[PortfolioType.CONSERVATIVE],
+            "min_stocks_by_price": PRICE_TIERS[PortfolioType.CONSERVATIVE]
         }
     }
 
@@ -68,48 +153,10 @@ def calculate_portfolio(
     # 사용할 잔고 계산
     available_balance = balance * settings["balance_ratio"]
 
-    # 가격대별로 주식 분류
-    price_categories = {
-        "low": [],    # 10만원 이하
-        "medium": [], # 10만원 초과 50만원 이하
-        "high": []    # 50만원 초과
-    }
-    
-    for stock in available_stocks:
-        if stock.current_price <= 100000:
-            price_categories["low"].append(stock)
-        elif stock.current_price <= 500000:
-            price_categories["medium"].append(stock)
-        else:
-            price_categories["high"].append(stock)
-
-    # 각 가격대별로 주식 선택
-    selected_stocks = []
-    for price_range in settings["min_stocks_by_price"]:
-        max_price = price_range["max_price"]
-        count = price_range["count"]
-        
-        # 해당 가격대의 주식들 선택
-        candidate_stocks = [
-            stock for stock in available_stocks
-            if stock.current_price <= max_price and stock not in selected_stocks
-        ]
-        
-        if candidate_stocks:
-            # 시가총액과 거래량 기준으로 가중치 계산
-            weights = [
-                (stock.market_cap * stock.volume)
-                for stock in candidate_stocks
-            ]
-            
-            # 필요한 수만큼 선택
-            for _ in range(min(count, len(candidate_stocks))):
-                if not weights:
-                    break
-                selected_idx = weights.index(max(weights))
-                selected_stocks.append(candidate_stocks[selected_idx])
-                weights.pop(selected_idx)
-                candidate_stocks.pop(selected_idx)
+    # 가격대별로 시가총액 x 거래량 가중치가 큰 주식 선택 (비중은 비중을 계산한 목록에만 적용)
+    if weights is not None and (stocks is None or len(weights) != len(stocks)):
+        raise ValueError("weights 는 같은 길이의 stocks 와 함께 전달해야 합니다.")
+    selected_stocks = list(stocks) if stocks is not None else select_stocks(snapshot, portfolio_type)
 
     if not selected_stocks:
         return []
@@ -118,9 +165,9 @@ def calculate_portfolio(
     total_price = sum(stock.current_price for stock in selected_stocks)
     recommendations = []
     
-    for stock in selected_stocks:
-        # 각 주식의 가격 비율에 따라 투자금액 할당
-        stock_ratio = stock.current_price / total_price
+    for index, stock in enumerate(selected_stocks):
+        # 각 주식의 투자 비중(기본: 가격 비율)에 따라 투자금액 할당
+        stock_ratio = weights[index] if weights is not None else stock.current_price / total_price
         stock_investment = available_balance * stock_ratio
         
         # 수량 계산 (소수점 제거)
@@ -163,9 +210,8 @@ def validate_portfolio(
         return False, "추천된 포트폴리오가 잔고를 초과합니다."
 
     # 최소 투자 금액 검증
-    min_investment = 100000  # 최소 10만원
     for rec in recommendations:
-        if rec["total_investment"] < min_investment:
-            return False, f"증권당 최소 투자 금액은 {min_investment:,}원입니다."
+        if rec["total_investment"] < MIN_INVESTMENT:
+            return False, f"증권당 최소 투자 금액은 {MIN_INVESTMENT:,}원입니다."
 
     return True, "포트폴리오가 유효합니다."
@@ -0,0 +1,104 @@
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+from app.core.settings import settings
+from app.utils.single_flight import SingleFlight
+
+
+def _copy(value: Tuple[Dict, ...]) -> List[Dict]:
+    # 호출한 쪽이 결과를 바꿔도 캐시 항목에 영향이 없도록 새 목록을 반환합니다.
+    return [dict(item) for item in value]
+
+
+class RecommendationCache:
+    """
+    자문 추천 결과 LRU + TTL 캐시 (워커 프로세스 단위)
+
+    추천 결과는 활성 증권 스냅샷 버전, 포트폴리오 유형, 잔고가 같으면 같으므로 키에 스냅샷 버전을 넣고,
+    증권이 바뀌면 새 버전의 키로 다시 계산합니다. 이전 버전의 항목은 LRU 와 TTL 로 정리됩니다.
+    같은 키를 동시에 계산하려는 요청은 먼저 시작한 계산의 결과를 함께 사용합니다. (single-flight)
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float, clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        # 키 -> (결과, 만료 시각)
+        self._entries: "OrderedDict[Hashable, Tuple[Tuple[Dict, ...], float]]" = OrderedDict()
+        self._flight = SingleFlight()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    def _lookup(self, key: Hashable) -> Optional[Tuple[Dict, ...]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at <= self.clock():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def _store(self, key: Hashable, value: Tuple[Dict, ...]) -> None:
+        self._entries[key] = (value, self.clock() + self.ttl_seconds)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def get_or_compute(self, key: Hashable, compute: Callable[[], Awaitable[List[Dict]]]) -> List[Dict]:
+        """
+        캐시된 결과를 반환하고, 없으면 compute 로 계산해 저장합니다.
+
+        Args:
+            key: 캐시 키
+            compute: 결과를 계산하는 코루틴 함수
+
+        Returns:
+            List[Dict]: 추천 결과 (호출마다 새 목록)
+        """
+        if self.max_entries <= 0:
+            return await compute()
+
+        value = self._lookup(key)
+        if value is not None:
+            self.hits += 1
+            return _copy(value)
+
+        async def compute_and_store() -> Tuple[Dict, ...]:
+            result = tuple(await compute())
+            self._store(key, result)
+            return result
+
+        value, shared = await self._flight.do(key, compute_and_store)
+        if shared:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+        return _copy(value)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict:
+        """항목 수, 적중/미스/합류(single-flight) 수, 적중률과 LRU 제거 수를 반환합니다."""
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_ratio": (self.hits + self.coalesced) / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "inflight": len(self._flight),
+        }
+
+
+# 워커 프로세스 전역 추천 결과 캐시
+recommendation_cache = RecommendationCache(settings.RECOMMENDATION_CACHE_SIZE, settings.RECOMMENDATION_CACHE_TTL_SECONDS)
@@ -1,9 +1,20 @@
+import asyncio
+import math
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Callable, Dict, Optional, Tuple
+from fastapi import HTTPException, status
 from jose import JWTError, jwt
 from passlib.context import CryptContext
+from passlib.hash import bcrypt
 from app.core.settings import settings
+from app.utils.constant.globals import UserRole
 
+# 애플리케이션 전체에서 사용하는 유일한 비밀번호 해시 정책
+# (rounds 는 configure_password_policy 로 설정, 설정 전에는 passlib 기본값)
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
@@ -11,27 +22,266 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    비밀번호를 검증하고, 저장된 해시가 현재 정책(rounds 범위)을 벗어나면 새 해시를 함께 반환합니다.
+
+    Returns:
+        Tuple[bool, Optional[str]]: (검증 결과, 새 해시 또는 None)
+    """
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+def password_hash_rounds() -> int:
+    """현재 정책으로 새로 만드는 해시의 bcrypt rounds 를 반환합니다."""
+    return pwd_context.to_dict().get("bcrypt__default_rounds", bcrypt.default_rounds)
+
+
+def measure_bcrypt_seconds(rounds: int, samples: int = 3) -> float:
+    """rounds 로 해시 한 번에 걸리는 시간(초)을 samples 번 측정해 가장 짧은 값을 반환합니다."""
+    context = CryptContext(schemes=["bcrypt"], bcrypt__rounds=rounds)
+    context.hash("calibration")  # 백엔드 로딩 시간 제외
+    best = math.inf
+    for _ in range(samples):
+        started = time.perf_counter()
+        context.hash("calibration")
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def calibrate_bcrypt_rounds(target_ms: float, min_rounds: int, max_rounds: int) -> int:
+    """
+    이 서버에서 해시/검증 한 번이 target_ms 를 넘지 않는 가장 큰 bcrypt rounds 를 찾습니다.
+    bcrypt 는 rounds 가 1 늘 때마다 작업량이 두 배가 되므로 min_rounds 에서 한 번 측정한 뒤
+    두 배씩 늘려 가며 추정합니다. 결과는 항상 min_rounds 이상 max_rounds 이하입니다.
+
+    Args:
+        target_ms: 목표 검증 시간 (ms)
+        min_rounds: 최소 rounds (보안 하한)
+        max_rounds: 최대 rounds
+
+    Returns:
+        int: 사용할 rounds
+    """
+    seconds = measure_bcrypt_seconds(min_rounds)
+    rounds = min_rounds
+    while rounds < max_rounds and seconds * 2 * 1000 <= target_ms:
+        rounds += 1
+        seconds *= 2
+    return rounds
+
+
+def configure_password_policy(rounds: int) -> None:
+    """
+    새 해시의 rounds 를 설정합니다.
+    rounds 보다 약하거나 rounds + 1 보다 강한 기존 해시는 다음 로그인 때 다시 해시합니다.
+    (재보정 결과가 한 단계 흔들려도 모든 해시를 다시 만들지 않도록 한 단계 여유를 둡니다.)
+    """
+    pwd_context.update(bcrypt__default_rounds=rounds, bcrypt__min_rounds=rounds, bcrypt__max_rounds=rounds + 1)
+
+
+def configure_password_policy_from_settings() -> int:
+    """
+    PASSWORD_HASH_ROUNDS 가 지정되어 있으면 그 값을, 아니면 보정 결과를 정책으로 설정합니다.
+
+    Returns:
+        int: 설정한 rounds
+    """
+    rounds = settings.PASSWORD_HASH_ROUNDS
+    if rounds is None:
+        rounds = calibrate_bcrypt_rounds(
+            settings.PASSWORD_HASH_TARGET_MS, settings.PASSWORD_HASH_MIN_ROUNDS, settings.PASSWORD_HASH_MAX_ROUNDS
+        )
+    configure_password_policy(rounds)
+    return rounds
+
+
+class PasswordHasher:
+    """
+    비밀번호 해시/검증 실행기
+
+    bcrypt 는 의도적으로 수십 ms 동안 CPU 를 사용하므로 이벤트 루프에서 바로 실행하면
+    그동안 같은 워커의 다른 요청이 모두 멈춥니다. 전용 스레드 풀(bcrypt 는 해시 중 GIL 을 놓음)에서
+    최대 workers 개를 동시에 실행하고, 대기 중인 작업이 max_queue 개를 넘으면 기다리지 않고
+    503 으로 거절해 로그인 폭주가 대기열을 끝없이 늘리지 않게 합니다.
+    workers 가 0 이면 이벤트 루프에서 바로 실행합니다. (벤치마크 비교용)
+    """
+
+    def __init__(self, workers: int, max_queue: int):
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._pending = 0  # 실행 중 + 대기 중 (스레드 풀 작업이 끝날 때 줄어듦, _lock 으로 보호)
+        self.completed = 0
+        self.rejected = 0
+        self.rehashed = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        # 작업 종류별 (횟수, 누적 시간, 최대 시간)
+        self._timings: Dict[str, list] = {"hash": [0, 0.0, 0.0], "verify": [0, 0.0, 0.0]}
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password-hasher")
+        return self._executor
+
+    def _timed(self, kind: str, fn: Callable, submitted_at: float, *args):
+        # 대기 시간과 실행 시간을 기록합니다.
+        started = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self.wait_seconds_total += started - submitted_at
+                self.wait_seconds_max = max(self.wait_seconds_max, started - submitted_at)
+                timing = self._timings[kind]
+                timing[0] += 1
+                timing[1] += elapsed
+                timing[2] = max(timing[2], elapsed)
+
+    async def _run(self, kind: str, fn: Callable, *args):
+        if self.workers <= 0:
+            self.completed += 1
+            return self._timed(kind, fn, time.perf_counter(), *args)
+
+        if self._pending >= self.workers + self.max_queue:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도해주세요.",
+                headers={"Retry-After": "1"},
+            )
+
+        with self._lock:
+            self._pending += 1
+        try:
+            job = self._get_executor().submit(self._timed, kind, fn, time.perf_counter(), *args)
+        except BaseException:
+            with self._lock:
+                self._pending -= 1
+            raise
+        # 기다리던 요청이 취소되어도(클라이언트 연결 끊김 등) 스레드 풀의 작업은 계속 실행되므로,
+        # 대기열 수는 요청이 아니라 작업이 끝날 때(또는 시작 전에 취소될 때) 줄입니다.
+        job.add_done_callback(self._finish)
+        return await asyncio.wrap_future(job)
+
+    def _finish(self, job) -> None:
+        with self._lock:
+            self._pending -= 1
+            if not job.cancelled():
+                self.completed += 1
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """
+        비밀번호를 검증합니다.
+
+        Raises:
+            HTTPException: 대기열이 가득 찬 경우 (503)
+        """
+        return await self._run("verify", verify_password, plain_password, hashed_password)
+
+    async def verify_and_update(self, plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """
+        비밀번호를 검증하고, 저장된 해시가 현재 정책을 벗어나면 새 해시를 함께 반환합니다.
+        새 해시는 검증에 성공한 경우에만 만들어집니다.
+
+        Returns:
+            Tuple[bool, Optional[str]]: (검증 결과, 새 해시 또는 None)
+
+        Raises:
+            HTTPException: 대기열이 가득 찬 경우 (503)
+        """
+        valid, new_hash = await self._run("verify", verify_and_update_password, plain_password, hashed_password)
+        if new_hash is not None:
+            self.rehashed += 1
+        return valid, new_hash
+
+    async def hash(self, password: str) -> str:
+        """
+        비밀번호를 해시합니다.
+
+        Raises:
+            HTTPException: 대기열이 가득 찬 경우 (503)
+        """
+        return await self._run("hash", get_password_hash, password)
+
+    def stats(self) -> Dict:
+        """실행 중/대기 중 작업 수, 누적 처리 수, 대기 시간과 작업 종류별 실행 시간을 반환합니다."""
+        with self._lock:
+            stats = {
+                "rounds": password_hash_rounds(),
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "in_flight": min(self._pending, self.workers),
+                "queued": max(0, self._pending - self.workers),
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "rehashed": self.rehashed,
+                "wait_ms_avg": self.wait_seconds_total / self.completed * 1000 if self.completed else 0.0,
+                "wait_ms_max": self.wait_seconds_max * 1000,
+            }
+            for kind, (count, total, longest) in self._timings.items():
+                stats[f"{kind}_count"] = count
+                stats[f"{kind}_ms_avg"] = total / count * 1000 if count else 0.0
+                stats[f"{kind}_ms_max"] = longest * 1000
+            return stats
+
+    def shutdown(self) -> None:
+        """실행 중인 작업을 기다린 뒤 스레드를 정리합니다. (애플리케이션 종료 시)"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+# 워커 프로세스 전역 해시 실행기
+password_hasher = PasswordHasher(settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_QUEUE_SIZE)
+
+
+def access_token_claims(user) -> dict:
+    """
+    액세스 토큰에 담는 사용자 클레임 (sub, role, active)
+    권한 확인은 이 클레임만으로 처리하므로, 바뀐 역할/활성 상태는 토큰을 폐기하거나 만료될 때 반영됩니다.
+    """
+    role = user.role or UserRole.USER
+    return {"sub": user.id, "role": UserRole(role).value, "active": bool(user.is_active)}
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
+    """
+    액세스 토큰을 생성합니다.
+    토큰마다 폐기할 수 있도록 고유 ID(jti)와 발급 시각(iat)을 함께 담습니다.
+    """
     to_encode = data.copy()
+    now = datetime.now(timezone(timedelta(hours=9)))
     if expires_delta:
-        expire = datetime.now(timezone(timedelta(hours=9))) + expires_delta
+        expire = now + expires_delta
     else:
-        expire = datetime.now(timezone(timedelta(hours=9))) + timedelta(minutes=15)
-    to_encode.update({"exp": expire})
+        expire = now + timedelta(minutes=15)
+    to_encode.update({"exp": expire, "iat": now, "jti": uuid.uuid4().hex})
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
 
-def create_refresh_token(data: dict) -> str:
+def create_refresh_token(data: dict) -> Tuple[str, str]:
+    """
+    리프레시 토큰을 생성합니다.
+    로그아웃할 때 폐기할 수 있도록 고유 ID(jti)를 담고, 토큰과 jti 를 함께 반환합니다.
+    이 토큰으로 발급하는 액세스 토큰에는 jti 를 sid 클레임으로 담습니다.
+    """
     to_encode = data.copy()
-    expire = datetime.now(timezone(timedelta(hours=9))) + timedelta(days=7)
-    to_encode.update({"exp": expire})
+    now = datetime.now(timezone(timedelta(hours=9)))
+    token_id = uuid.uuid4().hex
+    to_encode.update({
+        "exp": now + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS), "iat": now, "jti": token_id,
+    })
     encoded_jwt = jwt.encode(to_encode, settings.REFRESH_SECRET_KEY, algorithm=settings.ALGORITHM)
-    return encoded_jwt
+    return encoded_jwt, token_id
 
 
 def verify_token(token: str) -> Optional[dict]:
@@ -0,0 +1,55 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+
+class SingleFlight:
+    """
+    같은 키의 동시 계산을 하나로 합치는 도우미 (single-flight, 워커 프로세스 단위)
+
+    먼저 시작한 요청만 계산하고, 그 사이 같은 키로 들어온 요청은 그 결과(또는 예외)를 함께 받습니다.
+    결과를 캐시에 저장하는 일은 계산하는 쪽(compute)이 맡습니다.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+
+    def __len__(self) -> int:
+        return len(self._inflight)
+
+    async def do(self, key: Hashable, compute: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        같은 키의 계산이 진행 중이면 그 결과를 기다리고, 없으면 compute 로 계산합니다.
+
+        Args:
+            key: 계산 키
+            compute: 결과를 계산하는 코루틴 함수
+
+        Returns:
+            Tuple[Any, bool]: (결과, 다른 요청의 계산 결과를 함께 받았는지 여부)
+        """
+        while True:
+            future = self._inflight.get(key)
+            if future is None:
+                break
+            try:
+                return await asyncio.shield(future), True
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+                # 먼저 계산하던 요청이 취소되었으면 다시 시도합니다.
+
+        future = self._inflight[key] = asyncio.get_running_loop().create_future()
+        try:
+            value = await compute()
+        except Exception as exc:
+            future.set_exception(exc)
+            future.exception()  # 기다리는 요청이 없어도 경고가 남지 않도록 확인 처리
+            raise
+        except BaseException:
+            future.cancel()
+            raise
+        else:
+            future.set_result(value)
+        finally:
+            del self._inflight[key]
+        return value, False
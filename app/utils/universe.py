@@ -0,0 +1,381 @@
+import asyncio
+import time
+from dataclasses import dataclass, fields
+from datetime import datetime
+from types import MappingProxyType
+from typing import Callable, Dict, Iterable, List, Mapping, MutableMapping, Optional, Sequence, Set, Tuple, Union
+
+from sqlalchemy import event, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.settings import settings
+from app.models.data_version import DataVersion
+from app.models.stock import Stock, StockPrice
+from app.utils.copy_on_write import CopyOnWriteDict, CopyOnWriteSortedList
+
+# data_versions 에서 활성 증권 목록의 버전을 나타내는 이름
+STOCKS_VERSION = "stocks"
+
+
+@dataclass(frozen=True)
+class StockRecord:
+    """ 스냅샷에 담는 증권 한 종목 (읽기 전용, 응답 스키마 Stock 과 같은 필드) """
+    id: str
+    code: str
+    name: str
+    current_price: float
+    market_cap: float
+    volume: int
+    high_price: float
+    low_price: float
+    open_price: float
+    prev_close: float
+    change_rate: float
+    change_amount: float
+    is_active: bool
+    created_at: Optional[datetime]
+    updated_at: Optional[datetime]
+
+
+STOCK_RECORD_COLUMNS = [getattr(Stock, field.name) for field in fields(StockRecord)]
+
+
+class RankingIndex:
+    """
+    가격대별 활성 증권을 가중치(시가총액 x 거래량) 내림차순으로 유지하는 색인
+
+    가격 상한마다 정렬된 목록을 두고, 증권 하나가 바뀌면 그 증권이 들어 있는 목록에서만
+    빼고 다시 넣으므로 O(가격대 수 x log n) 에 반영됩니다. 가격대별 상위 k 개는 목록 앞에서 바로 읽습니다.
+    가중치가 같으면 먼저 추가된(조회 순서가 앞선) 증권이 앞에 옵니다.
+    가격 상한별 목록은 그 상한을 처음 조회할 때 만듭니다.
+    목록과 ID 색인은 copy-on-write 구조라 copy 는 전체를 복사하지 않고, 복사본에서 바꾼 부분만 새로 만듭니다.
+    """
+
+    def __init__(self, records: Iterable[StockRecord] = ()):
+        self._entries: MutableMapping[str, Tuple[tuple, float]] = {}  # 증권 ID -> (정렬 키, 가격)
+        self._tiers: Dict[float, CopyOnWriteSortedList] = {}
+        self._orders: MutableMapping[str, int] = {}  # 증권 ID -> 처음 추가된 순서
+        self._next_order = 0
+        for record in records:
+            self.upsert(record)
+        # 처음 만든 내용을 복사본끼리 공유하는 기준으로 둡니다.
+        self._entries = CopyOnWriteDict(self._entries)
+        self._orders = CopyOnWriteDict(self._orders)
+
+    def copy(self) -> "RankingIndex":
+        """
+        같은 내용의 새 색인을 반환합니다. 한쪽을 바꿔도 다른 쪽은 그대로입니다.
+        가격대별 목록은 조각 목록만, ID 색인은 바뀐 항목만 복사하므로 종목 수에 비례하지 않습니다.
+        """
+        index = RankingIndex()
+        index._entries = self._entries.copy()
+        index._tiers = {max_price: tier.copy() for max_price, tier in self._tiers.items()}
+        index._orders = self._orders.copy()
+        index._next_order = self._next_order
+        return index
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _tier(self, max_price: float) -> CopyOnWriteSortedList:
+        tier = self._tiers.get(max_price)
+        if tier is None:
+            tier = self._tiers[max_price] = CopyOnWriteSortedList(
+                key for key, price in self._entries.values() if price <= max_price
+            )
+        return tier
+
+    def delete(self, stock_id: str) -> None:
+        """DB 에서 삭제된 증권을 색인에서 빼고 동률 순서도 지웁니다."""
+        self.remove(stock_id)
+        self._orders.pop(stock_id, None)
+
+    def remove(self, stock_id: str) -> None:
+        """증권을 색인에서 뺍니다. (비활성화된 증권, 다시 추가되면 원래 동률 순서를 사용)"""
+        entry = self._entries.pop(stock_id, None)
+        if entry is None:
+            return
+        key, price = entry
+        for max_price, tier in self._tiers.items():
+            if price <= max_price:
+                tier.remove(key)
+
+    def upsert(self, record: StockRecord) -> None:
+        """증권을 추가하거나 바뀐 가격/가중치로 다시 넣습니다. 비활성 증권은 뺍니다."""
+        self.remove(record.id)
+        if not record.is_active:
+            return
+        # 한 번 추가된 증권은 비활성화 후 다시 추가되어도 동률 순서를 유지합니다.
+        order = self._orders.get(record.id)
+        if order is None:
+            order = self._orders[record.id] = self._next_order
+            self._next_order += 1
+        key = (-(record.market_cap * record.volume), order, record.id)
+        self._entries[record.id] = (key, record.current_price)
+        for max_price, tier in self._tiers.items():
+            if record.current_price <= max_price:
+                tier.add(key)
+
+    def top(self, max_price: float, k: int, exclude: Set[str] = frozenset()) -> List[str]:
+        """
+        가격이 max_price 이하인 증권 중 가중치가 큰 k 개의 ID 를 가중치 내림차순으로 반환합니다.
+
+        Args:
+            max_price: 가격 상한
+            k: 선택할 개수
+            exclude: 제외할 증권 ID
+
+        Returns:
+            List[str]: 선택한 증권 ID (최대 k 개)
+        """
+        chosen: List[str] = []
+        if k <= 0:
+            return chosen
+        for _, _, stock_id in self._tier(max_price):
+            if stock_id not in exclude:
+                chosen.append(stock_id)
+                if len(chosen) == k:
+                    break
+        return chosen
+
+    def select(self, tiers: Sequence[Dict]) -> List[str]:
+        """
+        가격대별로 가중치가 큰 증권을 차례로 고릅니다. (기존 calculate_portfolio 의 선택과 같은 결과)
+        앞선 가격대에서 고른 증권은 다음 가격대의 후보에서 제외합니다.
+
+        Args:
+            tiers: [{"max_price": 가격 상한, "count": 개수}, ...]
+
+        Returns:
+            List[str]: 선택한 증권 ID (선택 순서)
+        """
+        selected: List[str] = []
+        for tier in tiers:
+            selected.extend(self.top(tier["max_price"], tier["count"], set(selected)))
+        return selected
+
+
+class UniverseSnapshot:
+    """
+    특정 버전의 활성 증권 목록
+
+    만든 뒤에는 바꾸지 않으므로 같은 버전이면 항상 같은 내용입니다. (요청 처리 중에 스냅샷을 들고 있어도 안전)
+    이 워커에서 증권이 바뀌면 보관소가 with_changes 로 바뀐 종목만 교체한 새 스냅샷을 만듭니다.
+    by_id 는 조회 순서(새로 추가된 증권은 뒤)를 유지합니다.
+    id 색인과 순위 색인은 이전 스냅샷과 바뀌지 않은 부분을 공유하므로, 새 스냅샷을 만드는 비용은 종목 수가 아니라
+    바뀐 종목 수에 비례합니다.
+    """
+
+    def __init__(
+            self,
+            version: int,
+            records: Union[Iterable[StockRecord], CopyOnWriteDict],
+            ranking: Optional[RankingIndex] = None
+    ):
+        self.version = version
+        # with_changes 는 이전 스냅샷과 공유하는 id 색인(CopyOnWriteDict)을 그대로 넘깁니다.
+        if not isinstance(records, CopyOnWriteDict):
+            records = CopyOnWriteDict((record.id, record) for record in records)
+        self._records: CopyOnWriteDict = records
+        self.by_id: Mapping[str, StockRecord] = MappingProxyType(self._records)
+        self.ranking = ranking if ranking is not None else RankingIndex(self._records.values())
+        self.built_at = self.updated_at = time.time()
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def with_changes(self, version: int, changes: Mapping[str, Optional[StockRecord]]) -> "UniverseSnapshot":
+        """
+        바뀐 증권을 반영한 새 스냅샷을 반환합니다. (이 스냅샷은 그대로)
+        레코드가 None(삭제)이거나 비활성이면 뺍니다. id 색인과 순위 색인은 이 스냅샷과 공유하는 복사본에
+        바뀐 종목만 반영하므로, 바뀐 종목 수 x O(가격대 수 x (조각 크기 + log n)) 에 만들어집니다.
+
+        Args:
+            version: 새 스냅샷 버전
+            changes: 증권 ID -> 바뀐 레코드 (삭제되었으면 None)
+
+        Returns:
+            UniverseSnapshot: 새 스냅샷
+        """
+        records = self._records.copy()
+        ranking = self.ranking.copy()
+        for stock_id, record in changes.items():
+            if record is None:
+                records.pop(stock_id, None)
+                ranking.delete(stock_id)
+            elif not record.is_active:
+                records.pop(stock_id, None)
+                ranking.remove(stock_id)
+            else:
+                records[stock_id] = record
+                ranking.upsert(record)
+        snapshot = UniverseSnapshot(version, records, ranking)
+        snapshot.built_at = self.built_at
+        return snapshot
+
+
+class StockUniverseStore:
+    """
+    워커 프로세스의 활성 증권 스냅샷 보관소
+
+    자문 계산과 잔고 조회는 요청마다 증권 테이블을 읽지 않고 이 스냅샷을 사용합니다.
+    - 이 워커에서 증권을 바꾼 트랜잭션이 커밋되면 다음 조회에서 바뀐 종목만 다시 읽어 반영합니다. (record_change)
+    - check_seconds 마다 data_versions 의 stocks 버전을 확인하고, 이 워커가 모르는 변경
+      (다른 워커, 관리자 도구, bulk 쿼리)이 있으면 스냅샷을 다시 만듭니다.
+    동시에 들어온 요청이 스냅샷을 한 번만 갱신하도록 잠금을 사용합니다.
+    """
+
+    def __init__(self, check_seconds: float, clock: Callable[[], float] = time.monotonic):
+        self.check_seconds = check_seconds
+        self.clock = clock
+        self._snapshot: Optional[UniverseSnapshot] = None
+        self._checked_at = 0.0
+        self._stale = True
+        self._pending: Set[str] = set()  # 아직 반영하지 않은 이 워커의 변경 증권 ID
+        self._pending_versions = 0  # 그 변경으로 올라간 버전 수
+        self._lock = asyncio.Lock()
+        self.checks = 0
+        self.rebuilds = 0
+        self.incremental_updates = 0
+
+    def invalidate(self) -> None:
+        """다음 조회에서 스냅샷을 다시 만들도록 표시합니다."""
+        self._stale = True
+
+    def record_change(self, stock_ids: Iterable[str]) -> None:
+        """이 워커에서 커밋한 증권 변경(버전 1 증가)을 다음 조회에서 반영하도록 기록합니다."""
+        self._pending.update(stock_ids)
+        self._pending_versions += 1
+
+    def _is_fresh(self) -> bool:
+        return (
+            self._snapshot is not None
+            and not self._stale
+            and not self._pending_versions
+            and self.clock() - self._checked_at < self.check_seconds
+        )
+
+    async def get(self, db: AsyncSession) -> UniverseSnapshot:
+        """
+        최신 스냅샷을 반환합니다. 확인 주기가 지났거나 이 워커의 변경이 있으면 DB 버전을 읽고,
+        이 워커의 변경만 있었으면 바뀐 종목만, 그 밖의 변경이 있었으면 전체를 다시 읽습니다.
+
+        Args:
+            db: 데이터베이스 세션
+
+        Returns:
+            UniverseSnapshot: 활성 증권 스냅샷
+        """
+        if self._is_fresh():
+            return self._snapshot
+        async with self._lock:
+            if self._is_fresh():
+                return self._snapshot
+            pending, pending_versions = self._pending, self._pending_versions
+            self._pending, self._pending_versions = set(), 0
+            try:
+                return await self._refresh(db, pending, pending_versions)
+            except BaseException:
+                # 반영하지 못한 변경을 잃지 않도록 다음 조회에서 전체를 다시 읽습니다.
+                self._stale = True
+                raise
+
+    async def _refresh(self, db: AsyncSession, pending: Set[str], pending_versions: int) -> UniverseSnapshot:
+        version = await db.scalar(select(DataVersion.version).where(DataVersion.name == STOCKS_VERSION)) or 0
+        self.checks += 1
+        self._checked_at = self.clock()
+        snapshot = self._snapshot
+        if snapshot is not None and not self._stale and version == snapshot.version + pending_versions:
+            if pending_versions:
+                changes: Dict[str, Optional[StockRecord]] = dict.fromkeys(pending)
+                if pending:
+                    result = await db.execute(select(*STOCK_RECORD_COLUMNS).where(Stock.id.in_(pending)))
+                    changes.update((row.id, StockRecord(*row)) for row in result)
+                # 이전 스냅샷을 들고 있는 요청이 있으므로 바꾸지 않고 새 스냅샷으로 교체합니다.
+                self._snapshot = snapshot.with_changes(version, changes)
+                self.incremental_updates += 1
+            return self._snapshot
+
+        # 다시 만드는 동안 들어온 무효화는 다음 조회에서 반영합니다.
+        self._stale = False
+        result = await db.execute(select(*STOCK_RECORD_COLUMNS).where(Stock.is_active == True))
+        self._snapshot = UniverseSnapshot(version, [StockRecord(*row) for row in result])
+        self.rebuilds += 1
+        return self._snapshot
+
+    def stats(self) -> Dict:
+        """스냅샷 버전, 종목 수, 만든/갱신한 시각과 버전 확인/재생성/부분 갱신 횟수를 반환합니다."""
+        snapshot = self._snapshot
+        return {
+            "version": snapshot.version if snapshot else None,
+            "stocks": len(snapshot) if snapshot else 0,
+            "built_at": snapshot.built_at if snapshot else None,
+            "updated_at": snapshot.updated_at if snapshot else None,
+            "stale": self._stale,
+            "pending": len(self._pending),
+            "check_seconds": self.check_seconds,
+            "checks": self.checks,
+            "rebuilds": self.rebuilds,
+            "incremental_updates": self.incremental_updates,
+        }
+
+
+# 워커 프로세스 전역 활성 증권 스냅샷
+stock_universe = StockUniverseStore(settings.STOCK_UNIVERSE_CHECK_SECONDS)
+
+
+def bump_version(connection, name: str) -> None:
+    """data_versions 의 name 버전을 1 올립니다. (행이 없으면 1 로 만듭니다)"""
+    table = DataVersion.__table__
+    result = connection.execute(update(table).where(table.c.name == name).values(version=table.c.version + 1))
+    if result.rowcount == 0:
+        connection.execute(table.insert().values(name=name, version=1))
+
+
+def _mark_stocks_changed(session: Session) -> None:
+    if not session.info.get("stocks_changed"):
+        session.info["stocks_changed"] = True
+        bump_version(session.connection(), STOCKS_VERSION)
+
+
+# 증권을 바꾸는 모든 세션(관리자 API, 관리자 도구, 시세 반영 스크립트)에서 같은 트랜잭션으로 버전을 올립니다.
+# 일별 종가 이력(stock_prices)도 비중 계산 결과를 바꾸므로 같은 버전을 올립니다.
+@event.listens_for(Session, "after_flush")
+def _track_stock_flush(session, flush_context):
+    stock_ids = []
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, Stock):
+            stock_ids.append(obj.id)
+        elif isinstance(obj, StockPrice):
+            stock_ids.append(obj.stock_id)
+    if stock_ids:
+        session.info.setdefault("stock_ids", set()).update(stock_ids)
+        _mark_stocks_changed(session)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_stock_bulk_write(orm_execute_state):
+    mapper = orm_execute_state.bind_mapper
+    if not orm_execute_state.is_select and mapper is not None and mapper.class_ in (Stock, StockPrice):
+        # bulk 쿼리는 바뀐 증권을 알 수 없으므로 커밋 후 스냅샷을 다시 만듭니다.
+        orm_execute_state.session.info["stocks_bulk"] = True
+        _mark_stocks_changed(orm_execute_state.session)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_stock_changes(session):
+    stock_ids = session.info.pop("stock_ids", ())
+    bulk = session.info.pop("stocks_bulk", False)
+    if not session.info.pop("stocks_changed", False):
+        return
+    if bulk:
+        stock_universe.invalidate()
+    else:
+        stock_universe.record_change(stock_ids)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_stock_changes(session, previous_transaction):
+    for key in ("stocks_changed", "stock_ids", "stocks_bulk"):
+        session.info.pop(key, None)